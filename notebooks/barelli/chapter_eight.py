@@ -1,19 +1,19 @@
-import cv2
-import numpy as np
-
-imagem = cv2.imread("data/raw/nineth_image.png",0)
-imagem = cv2.resize(imagem, (0, 0), fx=0.5, fy=0.5)
+import os
 
 import cv2
 
+from src.preprocessing.limiarizacao import binarizar
+from src.preprocessing.mascara import MascaraBinaria
+
 def converter_para_bmp_binaria(limiar=127):
     """
-    Converte uma imagem para formato BMP binário (preto e branco).
+    Converte uma imagem para um arquivo binário (preto e branco) com 1 bit por pixel.
     
     Parâmetros:
         caminho_entrada (str): Caminho da imagem de entrada.
         caminho_saida (str): Caminho onde a imagem binária será salva.
-        limiar (int): Valor de limiar para binarização (padrão: 127).
+        limiar (int ou str): Valor de limiar para binarização (padrão: 127), ou o nome
+            de um método automático ("otsu", "triangulo").
     """
     # Carrega a imagem em escala de cinza
     imagem_cinza = cv2.imread("data/raw/nineth_image.png", cv2.IMREAD_GRAYSCALE)
@@ -23,16 +23,32 @@ def converter_para_bmp_binaria(limiar=127):
         raise FileNotFoundError("Imagem de entrada não encontrada.")
 
     # Aplica a binarização
-    _, imagem_binaria = cv2.threshold(imagem_cinza, 127, 255, cv2.THRESH_BINARY)
+    imagem_binaria = binarizar(imagem_cinza, limiar)
+
+    # Salva como PBM de 1 bit por pixel (1/8 do tamanho da BMP de 8 bits)
+    MascaraBinaria.de_imagem(imagem_binaria).salvar("data/processed/Caneca-PretaBranca.pbm")
+
 
-    # Salva no formato BMP
-    cv2.imwrite("data/processed/Caneca-PretaBranca.bmp", imagem_binaria)
 
 
+def carregar_mascara():
+    """
+    Lê a máscara gerada por converter_para_bmp_binaria (.pbm de 1 bit).
+
+    Em um checkout novo só existe a BMP de 8 bits em data/processed; nesse caso ela é
+    lida e convertida para a máscara de 1 bit.
+    """
+    if os.path.exists("data/processed/Caneca-PretaBranca.pbm"):
+        return MascaraBinaria.ler("data/processed/Caneca-PretaBranca.pbm")
+
+    imagem_binaria = cv2.imread("data/processed/Caneca-PretaBranca.bmp", cv2.IMREAD_GRAYSCALE)
+    if imagem_binaria is None:
+        raise FileNotFoundError("Máscara não encontrada; execute converter_para_bmp_binaria() antes.")
+    return MascaraBinaria.de_imagem(imagem_binaria)
 
 
 def erosão():
-    imagem = cv2.imread("data/processed/Caneca-PretaBranca.bmp",0)
+    imagem = carregar_mascara().para_imagem()
     elemento_estruturante = cv2.getStructuringElement(
         cv2.MORPH_ELLIPSE, (5,5)
     )
@@ -1,9 +1,12 @@
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-imagem_rgb = cv2.imread("data/raw/nineth_image.jpeg")
-imagem_cinza = cv2.cvtColor(imagem_rgb, cv2.COLOR_BGR2GRAY)
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.histograma import histograma
+from src.preprocessing.limiarizacao import binarizar
+
+# O matplotlib é importado dentro das funções que plotam, para que importar
+# este módulo (ex.: para reutilizar rotacionar) não carregue a biblioteca
 
 def imprimir_pixel(imagem):
     """
@@ -109,7 +112,7 @@ def acessar_informações(imagem):
     # incluindo todos os canais (por isso pode ser maior que altura × largura)
     print("Total de Pixels:", imagem.size)
 
-def converter_para_bmp(imagem):
+def converter_para_bmp(imagem, limiar=127):
     """
     @brief Salva a imagem como BMP colorida e também como bitmap preto e branco.
 
@@ -119,6 +122,8 @@ def converter_para_bmp(imagem):
     são salvas em disco e exibidas com OpenCV.
 
     @param imagem: Imagem colorida (BGR) carregada com OpenCV.
+    @param limiar: Limiar da binarização (padrão 127), ou o nome de um método automático
+                   ("otsu", "triangulo"; ver src.preprocessing.limiarizacao).
     @return Nenhum valor é retornado.
     """
 
@@ -129,7 +134,7 @@ def converter_para_bmp(imagem):
     imagem_cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
 
     # 3. Aplica threshold para obter imagem binária (preto e branco)
-    _, imagem_binaria = cv2.threshold(imagem_cinza, 127, 255, cv2.THRESH_BINARY)
+    imagem_binaria = binarizar(imagem_cinza, limiar)
 
     # 4. Salva a imagem binária como BMP
     cv2.imwrite("data/processed/Caneca-PretoBranco.bmp", imagem_binaria)
@@ -144,9 +149,14 @@ def plotar_manualmente():
     @brief Conta manualmente a quantidade de pixels pretos e brancos em uma imagem binária.
 
     @details
-    A função carrega uma imagem BMP em preto e branco (valores 0 e 255), e percorre
-    os primeiros 499x499 pixels da imagem. Para cada pixel, verifica se ele é branco (255)
-    ou preto (qualquer outro valor, geralmente 0), e acumula os totais.
+    A função carrega uma imagem BMP em preto e branco (valores 0 e 255) e considera
+    todos os pixels da imagem. Cada pixel é branco se vale 255 ou preto caso contrário
+    (qualquer outro valor, geralmente 0).
+
+    Em vez de percorrer a imagem com dois laços `for` (uma iteração do Python por pixel),
+    a contagem é feita com NumPy em uma única operação vetorizada: a comparação
+    `imagem == 255` gera uma máscara booleana e `np.count_nonzero` soma os verdadeiros.
+    Para lotes, ROIs e ocupação por blocos, veja src/preprocessing/estatisticas.py.
 
     A imagem deve estar previamente binarizada (ex: usando cv2.THRESH_BINARY).
 
@@ -154,22 +164,11 @@ def plotar_manualmente():
     """
 
     # Carrega a imagem em tons de cinza (modo 0) para garantir que os valores sejam únicos por pixel
-    imagem = cv2.imread("data/processed/Segunda-Guerra-PretoBranco.bmp", 0)
-
-    # Inicializa contadores
-    total_pixels_preto  = 0
-    total_pixels_branco = 0
+    imagem = ler_imagem("data/processed/Segunda-Guerra-PretoBranco.bmp", 0)
 
-    #
-
-    # Percorre a imagem nas posições (0,0) até (498,498)
-    for x in range(0, 499):
-        for y in range(0, 499):
-            # Se o valor do pixel for 255, é branco
-            if imagem[x, y] == 255:
-                total_pixels_branco += 1
-            else:
-                total_pixels_preto += 1
+    # Conta os pixels brancos (255) de uma vez; o restante é preto
+    total_pixels_branco = np.count_nonzero(imagem == 255)
+    total_pixels_preto  = imagem.size - total_pixels_branco
 
     # Exibe os resultados no terminal
     print("Total de pixels pretos:", total_pixels_preto)
@@ -186,23 +185,19 @@ def plotar_binário():
     intensidade de pixels. Ideal para verificar visualmente a proporção
     de áreas escuras (preto) e claras (branco) em uma imagem limiarizada.
 
-    Este histograma mostra a distribuição de intensidade dos pixels da imagem.
-    - imagem.ravel(): transforma a imagem em vetor 1D
-    - 256: número de bins (de 0 a 255)
-    - [0, 256]: intervalo das intensidades
+    Este histograma mostra a distribuição de intensidade dos pixels da imagem,
+    com 256 faixas (de 0 a 255) calculadas por `histograma()` (src.preprocessing.histograma).
 
     @return Nenhum valor é retornado; apenas exibe o gráfico.
     """
+    import matplotlib.pyplot as plt
 
     # Carrega a imagem em escala de cinza
-    imagem = cv2.imread("data/processed/Segunda-Guerra-PretoBranco.bmp", 0)
+    imagem = ler_imagem("data/processed/Segunda-Guerra-PretoBranco.bmp", 0)
 
     # Plota o histograma usando matplotlib
-    plt.hist(imagem.ravel(), 256, [0, 256])
-    plt.title("Histograma da Imagem Binária")
+    histograma(imagem).plotar("Histograma da Imagem Binária")
     plt.xlabel("Intensidade (0=preto, 255=branco)")
-    plt.ylabel("Quantidade de pixels")
-    plt.grid(True)
     plt.show()
 
 def plotar_cinza(imagem):
@@ -218,21 +213,11 @@ def plotar_cinza(imagem):
     @param imagem: Imagem em tons de cinza (matriz NumPy 2D).
     @return Nenhum valor é retornado; o gráfico é exibido na tela.
     """
+    import matplotlib.pyplot as plt
 
-    # Plota o histograma da imagem: 256 barras de intensidade entre 0 e 255
-    plt.hist(imagem.ravel(), 256, [0, 256])
-
-    # Define o título do gráfico
-    plt.title("Histograma da Imagem Cinza")
-
-    # Rótulo do eixo X: intensidade dos pixels (0 = preto, 255 = branco)
-    plt.xlabel("Intensidade (0 a 255)")
-
-    # Rótulo do eixo Y: quantidade de pixels em cada faixa de intensidade
-    plt.ylabel("Quantidade de pixels")
-
-    # Mostra a grade para facilitar leitura do gráfico
-    plt.grid(True)
+    # Plota o histograma da imagem: 256 barras de intensidade entre 0 e 255, com título,
+    # rótulos dos eixos e grade
+    histograma(imagem).plotar("Histograma da Imagem Cinza")
 
     # Exibe o histograma na tela
     plt.show()
@@ -249,30 +234,14 @@ def plotar_colorido():
 
     @return Nenhum valor é retornado; os gráficos são exibidos na tela.
     """
+    import matplotlib.pyplot as plt
 
     # Carrega a imagem colorida (formato BGR)
-    imagem = cv2.imread("data/processed/Segunda-Guerra-Colorida.bmp")
-
-    # Separa os três canais: azul, verde e vermelho
-    azul, verde, vermelho = cv2.split(imagem)
+    imagem = ler_imagem("data/processed/Segunda-Guerra-Colorida.bmp")
 
-    # Plota o histograma do canal azul
-    plt.hist(azul.ravel(), 256, [0, 256])
-    plt.title("Histograma B")  # B = Blue (Azul)
-
-    # Cria nova figura para o próximo gráfico
-    plt.figure()
-
-    # Plota o histograma do canal verde
-    plt.hist(verde.ravel(), 256, [0, 256])
-    plt.title("Histograma G")  # G = Green (Verde)
-
-    # Cria nova figura para o próximo gráfico
-    plt.figure()
-
-    # Plota o histograma do canal vermelho
-    plt.hist(vermelho.ravel(), 256, [0, 256])
-    plt.title("Histograma R")  # R = Red (Vermelho)
+    # Plota um histograma por canal, cada um em sua figura: "Histograma B" (azul),
+    # "Histograma G" (verde) e "Histograma R" (vermelho)
+    histograma(imagem).plotar("Histograma")
 
     # Exibe todos os gráficos
     plt.show()
@@ -297,9 +266,10 @@ def equalizar_histograma():
 
     @return Nenhum valor é retornado; apenas exibe as imagens e histogramas.
     """
+    import matplotlib.pyplot as plt
 
     # Lê a imagem no modo grayscale (0 = cv2.IMREAD_GRAYSCALE)
-    imagem_original = cv2.imread("data/raw/third_image.jpeg", 0)
+    imagem_original = ler_imagem("data/raw/third_image.jpeg", 0)
 
     # Redimensiona a imagem para 50% do tamanho original
     imagem_original = cv2.resize(imagem_original, (0, 0), fx=0.5, fy=0.5)
@@ -317,15 +287,13 @@ def equalizar_histograma():
     cv2.imshow("Imagem Equalizada", imagem_equalizada)
 
     # Plota o histograma da imagem original
-    plt.hist(imagem_original.ravel(), 256, [0, 256])
-    plt.title("Histograma Original")
+    histograma(imagem_original).plotar("Histograma Original")
 
     # Cria uma nova figura para o próximo histograma
     plt.figure()
 
     # Plota o histograma da imagem equalizada
-    plt.hist(imagem_equalizada.ravel(), 256, [0, 256])
-    plt.title("Histograma Equalizado")
+    histograma(imagem_equalizada).plotar("Histograma Equalizado")
 
     # Mostra os gráficos
     plt.show()
@@ -347,7 +315,7 @@ def rotacionar():
     """
 
     # Lê a imagem em escala de cinza (modo 0)
-    imagem_original = cv2.imread("data/raw/first_image.jpg", 0)
+    imagem_original = ler_imagem("data/raw/first_image.jpg", 0)
 
     # Verifica se a imagem foi carregada corretamente
     if imagem_original is None:
@@ -387,7 +355,7 @@ def transladar():
     """
 
     # Carrega a imagem em formato BGR
-    imagem_original = cv2.imread("data/raw/first_image.jpg")
+    imagem_original = ler_imagem("data/raw/first_image.jpg")
 
     # Verifica se a imagem foi carregada corretamente
     if imagem_original is None:
@@ -431,7 +399,7 @@ def escalonar():
     """
 
     # Carrega a imagem original colorida
-    imagem_original = cv2.imread("data/raw/first_image.jpg")
+    imagem_original = ler_imagem("data/raw/first_image.jpg")
 
     # Verifica se a imagem foi carregada corretamente
     if imagem_original is None:
@@ -468,7 +436,7 @@ def ajustar_perspectiva():
     """
 
     # Carrega a imagem da pista
-    imagem = cv2.imread("data/raw/fourth_image.jpeg")
+    imagem = ler_imagem("data/raw/fourth_image.jpeg")
 
     # Define os 4 pontos da área preta (ajuste conforme necessário)
     pontos_iniciais = np.float32([
@@ -518,8 +486,8 @@ def somar_imagens():
     """
 
     # Lê as duas imagens do disco
-    primeira_imagem = cv2.imread("data/raw/first_image.jpg")
-    segunda_imagem  = cv2.imread("data/raw/second_image.jpg")
+    primeira_imagem = ler_imagem("data/raw/first_image.jpg")
+    segunda_imagem  = ler_imagem("data/raw/second_image.jpg")
 
     # Verifica se ambas foram carregadas com sucesso
     if primeira_imagem is None or segunda_imagem is None:
@@ -556,27 +524,25 @@ def mudar_contraste():
 
     @return Nenhum valor é retornado. Os histogramas são exibidos com Matplotlib.
     """
+    import matplotlib.pyplot as plt
 
     # Carrega a imagem original
-    imagem_original = cv2.imread("data/raw/second_image.jpg")
+    imagem_original = ler_imagem("data/raw/second_image.jpg")
 
     # Gera uma imagem mais clara e uma mais escura
     imagem_clara  = cv2.add(imagem_original, 40)   # Aumenta brilho
     imagem_escura = cv2.add(imagem_original, -40)  # Diminui brilho
 
-    # Plota o histograma da imagem original
-    plt.hist(imagem_original.ravel(), 256, [0, 256])
-    plt.title("Histograma - Original")
+    # Plota o histograma da imagem original (canais somados em uma única curva)
+    histograma(imagem_original).plotar("Histograma - Original", somar_canais=True)
 
     # Plota o histograma da imagem mais clara
     plt.figure()
-    plt.hist(imagem_clara.ravel(), 256, [0, 256])
-    plt.title("Histograma - Mais Clara")
+    histograma(imagem_clara).plotar("Histograma - Mais Clara", somar_canais=True)
 
     # Plota o histograma da imagem mais escura
     plt.figure()
-    plt.hist(imagem_escura.ravel(), 256, [0, 256])
-    plt.title("Histograma - Mais Escura")
+    histograma(imagem_escura).plotar("Histograma - Mais Escura", somar_canais=True)
 
     # Exibe os gráficos
     plt.show()
@@ -605,8 +571,8 @@ def misturar_imagens():
     """
 
     # Lê as duas imagens do disco
-    primeira_imagem = cv2.imread("data/raw/first_image.jpg")
-    segunda_imagem  = cv2.imread("data/raw/second_image.jpg")
+    primeira_imagem = ler_imagem("data/raw/first_image.jpg")
+    segunda_imagem  = ler_imagem("data/raw/second_image.jpg")
 
     # Redimensiona a segunda imagem para o tamanho da primeira
     segunda_imagem = cv2.resize(segunda_imagem, (primeira_imagem.shape[1], primeira_imagem.shape[0]))
@@ -623,12 +589,17 @@ def misturar_imagens():
 
 
 def main():
+    # Carrega as imagens apenas ao executar o script, e não ao importar o módulo.
+    # Usa cv2.imread (e não o cache) porque modifica_pixel altera a imagem no lugar.
+    imagem_rgb = cv2.imread("data/raw/nineth_image.png")
+    imagem_cinza = cv2.cvtColor(imagem_rgb, cv2.COLOR_BGR2GRAY)
+
     # imprimir_pixel(imagem_rgb)
     # imprimir_pixel(imagem_cinza)
     # imprimir_canal(imagem_rgb)
     # modifica_pixel(imagem_rgb)
     # acessar_informações(imagem_rgb)
-     converter_para_bmp(imagem_rgb)
+    converter_para_bmp(imagem_rgb)
     # plotar_manualmente()
     # plotar_binário()
     # plotar_cinza(imagem_cinza)
@@ -1,7 +1,7 @@
 import cv2
 
-# Carrega a imagem a partir do caminho especificado
-imagem = cv2.imread("data/raw/second_image.jpg")
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.cores import canais, canais_em, converter
 
 
 def segmentar_imagem(imagem):
@@ -13,8 +13,9 @@ def segmentar_imagem(imagem):
     três canais individuais: azul, verde e vermelho. Cada um desses canais é exibido
     separadamente em uma janela e também salvo como arquivo JPEG.
 
-    A função utiliza cv2.split() para realizar a separação e cv2.imwrite() para salvar
-    os canais como imagens independentes. As janelas permanecem abertas até que o usuário
+    A função utiliza canais() para realizar a separação sem copiar a imagem (cada canal é
+    uma visão da matriz original) e cv2.imwrite() para salvar os canais como imagens
+    independentes. As janelas permanecem abertas até que o usuário
     pressione uma tecla.
 
     @note
@@ -27,8 +28,8 @@ def segmentar_imagem(imagem):
     @return Nenhum valor é retornado.
     """
 
-    # Segmenta os canais da imagem (OpenCV usa BGR, não RGB)
-    azul, verde, vermelho = cv2.split(imagem)
+    # Segmenta os canais da imagem (OpenCV usa BGR, não RGB) como visões, sem cópia
+    azul, verde, vermelho = canais(imagem)
 
     # Exibe a imagem original e os canais separadamente
     cv2.imshow("Original", imagem)
@@ -66,8 +67,8 @@ def combinar_segmentos(imagem):
         print("Erro: imagem não encontrada ou não pôde ser carregada.")
         exit()
 
-    # Segmenta os canais da imagem
-    azul, verde, vermelho = cv2.split(imagem)
+    # Segmenta os canais da imagem (visões, sem cópia)
+    azul, verde, vermelho = canais(imagem)
 
     # Recombina os canais em uma única imagem
     imagem = cv2.merge((azul, verde, vermelho))
@@ -87,7 +88,8 @@ def converter_para_cinza(imagem):
 
     @details
     Esta função recebe uma imagem colorida no formato RGB e a converte para uma
-    imagem em escala de cinza usando a função cv2.cvtColor(). A imagem convertida
+    imagem em escala de cinza usando converter(), que chama cv2.cvtColor() apenas
+    na primeira vez para cada imagem. A imagem convertida
     é então exibida em uma janela de visualização até que o usuário pressione
     uma tecla.
 
@@ -101,7 +103,7 @@ def converter_para_cinza(imagem):
     """
 
     # Converte a imagem de RGB para escala de cinza
-    imagem = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
+    imagem = converter(imagem, "cinza")
 
     # Exibe a imagem em tons de cinza
     cv2.imshow("Escala de Cinza", imagem)
@@ -130,11 +132,9 @@ def segmentar_hsv(imagem):
     @return Nenhum valor é retornado.
     """
 
-    # Converte a imagem de BGR para HSV (Hue, Saturation, Value)
-    imagem = cv2.cvtColor(imagem, cv2.COLOR_BGR2HSV)
-
-    # Separa os três canais da imagem HSV
-    matiz, saturação, valor = cv2.split(imagem)
+    # Converte a imagem de BGR para HSV (Hue, Saturation, Value) e separa os três
+    # canais; a conversão é reaproveitada por combinar_segmentos_hsv
+    matiz, saturação, valor = canais_em(imagem, "hsv")
 
     # Exibe cada canal separadamente
     cv2.imshow("Canal H", matiz)        # Matiz: tipo da cor (0–179)
@@ -154,9 +154,12 @@ def combinar_segmentos_hsv(imagem):
     @details
     Esta função recebe uma imagem no formato BGR (padrão OpenCV), converte-a para
     o espaço de cores HSV e separa os canais de Matiz (H), Saturação (S) e Valor (V).
-    Após exibir os canais individualmente, a função recombina os canais com
-    cv2.merge() e converte novamente para o espaço BGR para exibição final da imagem
-    recomposta.
+    Após exibir os canais individualmente, a imagem HSV é convertida novamente para
+    o espaço BGR para exibição final da imagem recomposta.
+
+    Como os canais são visões da própria imagem HSV (ver canais_em()), recombiná-los com
+    cv2.merge() apenas recriaria essa mesma imagem; por isso a conversão de volta parte
+    diretamente da imagem HSV, que é calculada uma única vez por imagem.
 
     Esta função é útil para visualizar e verificar o efeito de separar e combinar canais
     no espaço HSV, e garante que a recombinação preserve as características visuais da imagem.
@@ -166,22 +169,18 @@ def combinar_segmentos_hsv(imagem):
     @return Nenhum valor é retornado.
     """
 
-    # Converte a imagem de BGR para HSV (Hue, Saturation, Value)
-    imagem = cv2.cvtColor(imagem, cv2.COLOR_BGR2HSV)
-
-    # Separa os três canais HSV (matiz, saturação, valor)
-    matiz, saturação, valor = cv2.split(imagem)
+    # Converte a imagem de BGR para HSV (Hue, Saturation, Value), ou reaproveita a
+    # conversão já feita, e separa os canais (matiz, saturação, valor) sem cópia
+    imagem_hsv = converter(imagem, "hsv")
+    matiz, saturação, valor = canais(imagem_hsv)
 
     # Exibe separadamente os canais HSV
     cv2.imshow("Canal H", matiz)        # Matiz: tonalidade da cor (0–179)
     cv2.imshow("Canal S", saturação)    # Saturação: intensidade da cor (0–255)
     cv2.imshow("Canal V", valor)        # Valor: brilho/luminosidade (0–255)
 
-    # Recombina os canais HSV em uma imagem única
-    imagem = cv2.merge((matiz, saturação, valor))
-
     # Converte de volta para BGR para exibir como imagem colorida
-    imagem = cv2.cvtColor(imagem, cv2.COLOR_HSV2BGR)
+    imagem = cv2.cvtColor(imagem_hsv, cv2.COLOR_HSV2BGR)
 
     # Exibe a imagem recombinada
     cv2.imshow("Imagem", imagem)
@@ -193,9 +192,15 @@ def combinar_segmentos_hsv(imagem):
     cv2.destroyAllWindows()
 
 
-# Chamada das funções
-segmentar_imagem(imagem)
-combinar_segmentos(imagem)
-converter_para_cinza(imagem)
-segmentar_hsv(imagem)
-combinar_segmentos_hsv(imagem)
\ No newline at end of file
+def main():
+    # Carrega a imagem apenas ao executar o script, e não ao importar o módulo
+    imagem = ler_imagem("data/raw/second_image.jpg")
+
+    segmentar_imagem(imagem)
+    combinar_segmentos(imagem)
+    converter_para_cinza(imagem)
+    segmentar_hsv(imagem)
+    combinar_segmentos_hsv(imagem)
+
+if __name__ == "__main__":
+    main()
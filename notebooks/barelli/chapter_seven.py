@@ -1,7 +1,6 @@
 import cv2
 
-imagem = cv2.imread("data/raw/fifth_image.jpg",0)
-imagem = cv2.resize(imagem, (0, 0), fx=1, fy=1)
+from src.datasets.carregador import ler_imagem
 
 def operador_sobel(imagem):
     """
@@ -162,6 +161,9 @@ def canny(imagem):
 
 
 def main():
+    # Carrega a imagem apenas ao executar o script, e não ao importar o módulo
+    imagem = ler_imagem("data/raw/fifth_image.jpg", 0)
+
     operador_sobel(imagem)
     operador_laplaciano(imagem)
     aguçamento_de_borda(imagem)
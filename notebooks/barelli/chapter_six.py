@@ -1,7 +1,6 @@
 import cv2
 
-imagem = cv2.imread("data/raw/third_image.jpeg")
-imagem = cv2.resize(imagem, (0, 0), fx=0.6, fy=0.6)
+from src.datasets.carregador import ler_imagem
 
 def filtro_de_média(imagem):
     """
@@ -104,6 +103,10 @@ def filtro_bilateral(imagem):
     cv2.destroyAllWindows()
 
 def main():
+    # Carrega a imagem apenas ao executar o script, e não ao importar o módulo
+    imagem = ler_imagem("data/raw/third_image.jpeg")
+    imagem = cv2.resize(imagem, (0, 0), fx=0.6, fy=0.6)
+
     filtro_de_média(imagem)
     filtro_gaussiano(imagem)
     filtro_de_mediana(imagem)
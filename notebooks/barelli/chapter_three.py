@@ -1,7 +1,9 @@
 # Importa a biblioteca do OpenCV
 import	cv2
 
-def carrega_imagem():
+from src.datasets.fontes import abrir_fonte
+
+def carrega_imagem(caminho="data/raw/first_image.jpg"):
     """
     @brief Carrega e exibe uma imagem usando OpenCV.
 
@@ -16,10 +18,11 @@ def carrega_imagem():
     @note
     É necessário pressionar qualquer tecla para fechar a janela de exibição.
 
+    @param caminho: Caminho da imagem (padrão "data/raw/first_image.jpg").
     @return Nenhum valor é retornado.
     """
     # Carrega a imagem do caminho especificado
-    imagem = cv2.imread("data/raw/first_image.jpg")
+    imagem = cv2.imread(caminho)
 
     # Exibe a imagem em uma janela com o título "Pinquim"
     cv2.imshow("Pinquim", imagem)
@@ -30,7 +33,7 @@ def carrega_imagem():
     # Fecha todas as janelas abertas do OpenCV
     cv2.destroyAllWindows()
 
-def reproduzir_video():
+def reproduzir_video(entrada="data/raw/first_video.mp4", **opcoes):
     """
     @brief Reproduz um vídeo quadro a quadro usando OpenCV.
 
@@ -40,33 +43,30 @@ def reproduzir_video():
     o usuário pressione a tecla 'q'. Cada quadro é exibido com um pequeno 
     atraso de 1 milissegundo. Ideal para testes locais com arquivos de vídeo.
     
-    O caminho do vídeo é fixo como "data/raw/first_video.mp4", mas também pode 
-    ser usado para ler uma webcam mudando o caminho para um inteiro.
+    Os quadros vêm de src.datasets.fontes.abrir_fonte: a entrada padrão é
+    "data/raw/first_video.mp4", mas um inteiro lê uma webcam, e uma sequência de
+    imagens ou uma pilha .npy é reproduzida da mesma forma.
 
     @note
     Este código só funciona corretamente fora de ambientes como Jupyter Notebook,
     pois depende da exibição em janelas nativas do sistema operacional.
 
+    @param entrada: Vídeo, índice da webcam, sequência de imagens ou pilha .npy.
+    @param opcoes: Opções da fonte (passo, inicio, fim, antecipar, ...).
     @return Nada é retornado.
     """
 
-    # Cria o objeto de captura para ler o vídeo
-    captura = cv2.VideoCapture("data/raw/first_video.mp4")
-
-    # Loop para ler e exibir cada quadro
-    while True:
-        ret, frame = captura.read()  # Lê o próximo quadro
-        if not ret:
-            break  # Sai do loop se o vídeo acabar ou houver erro
-
-        cv2.imshow("Imagem", frame)  # Exibe o quadro
+    # Cria a fonte de quadros (vídeo, webcam, imagens...) e a libera ao final
+    with abrir_fonte(entrada, **opcoes) as fonte:
+        # Loop para ler e exibir cada quadro; termina quando a fonte acaba
+        for frame in fonte:
+            cv2.imshow("Imagem", frame)  # Exibe o quadro
 
-        # Espera 1ms por uma tecla e verifica se é 'q' para sair
-        if cv2.waitKey(1) & 0xFF == ord("q"):
-            break
+            # Espera 1ms por uma tecla e verifica se é 'q' para sair
+            if cv2.waitKey(1) & 0xFF == ord("q"):
+                break
 
-    # Libera o recurso de vídeo e fecha as janelas
-    captura.release()
+    # Fecha as janelas
     cv2.destroyAllWindows()
 
 
@@ -0,0 +1,9 @@
+"""
+@brief Código-fonte reutilizável do projeto Computer Vision 101.
+
+@details
+Os scripts em notebooks/ demonstram cada técnica com janelas do OpenCV. Os módulos
+deste pacote expõem as mesmas operações sem interface gráfica, para que possam ser
+usadas em lotes, vídeos e outros módulos. Execute-os a partir da raiz do repositório
+(ex.: python -m src.preprocessing.lote), pois os caminhos de dados são relativos a ela.
+"""
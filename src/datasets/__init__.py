@@ -0,0 +1,3 @@
+"""
+@brief Carregamento de imagens e outras fontes de dados.
+"""
@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+
+# Limite padrão de memória ocupada pelas imagens decodificadas (512 MB)
+LIMITE_PADRAO_BYTES = 512 * 1024 * 1024
+
+
+class CacheDeImagens:
+    """
+    @brief Cache LRU de imagens decodificadas, limitado pela quantidade de bytes.
+
+    @details
+    Cada entrada é identificada pelo caminho absoluto do arquivo e pelo modo de leitura
+    (cor, cinza, ...). Junto com a imagem é guardada a data de modificação e o tamanho do
+    arquivo; se qualquer um deles mudar, a entrada é descartada e o arquivo é lido de novo.
+
+    Quando a soma dos bytes das imagens ultrapassa `limite_bytes`, as imagens usadas há
+    mais tempo são removidas. As imagens são entregues como visões somente leitura: quem
+    precisar alterá-las deve fazer uma cópia (imagem.copy()), o que garante que nenhum
+    chamador modifique a imagem vista pelos demais.
+
+    O cache pode ser usado por várias threads ao mesmo tempo.
+
+    @param limite_bytes: Máximo de bytes mantidos em memória.
+    """
+
+    def __init__(self, limite_bytes=LIMITE_PADRAO_BYTES):
+        self.limite_bytes = limite_bytes
+        self.bytes_ocupados = 0
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def ler(self, caminho, modo=cv2.IMREAD_COLOR):
+        """
+        @brief Lê uma imagem, decodificando o arquivo apenas se ele não estiver no cache.
+
+        @param caminho: Caminho do arquivo de imagem.
+        @param modo: Modo de leitura do cv2.imread (padrão cv2.IMREAD_COLOR).
+        @return Visão somente leitura da imagem, ou None se o arquivo não puder ser lido
+                (mesmo comportamento de cv2.imread).
+        """
+        try:
+            estado = os.stat(caminho)
+        except OSError:
+            return None
+
+        chave = (os.path.realpath(caminho), modo)
+        versao = (estado.st_mtime_ns, estado.st_size)
+
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] == versao:
+                self._entradas.move_to_end(chave)
+                return entrada[1].view()
+
+        # Decodifica fora da trava para não bloquear as outras threads
+        imagem = cv2.imread(caminho, modo)
+        if imagem is None:
+            return None
+        imagem.flags.writeable = False
+
+        with self._trava:
+            antiga = self._entradas.pop(chave, None)
+            if antiga is not None:
+                self.bytes_ocupados -= antiga[1].nbytes
+
+            # Imagens maiores que o próprio limite não são guardadas
+            if imagem.nbytes <= self.limite_bytes:
+                self._entradas[chave] = (versao, imagem)
+                self.bytes_ocupados += imagem.nbytes
+                self._liberar()
+
+        return imagem.view()
+
+    def _liberar(self):
+        # Remove as imagens usadas há mais tempo até respeitar o limite
+        while self.bytes_ocupados > self.limite_bytes:
+            _, (_, imagem) = self._entradas.popitem(last=False)
+            self.bytes_ocupados -= imagem.nbytes
+
+    def limpar(self):
+        """
+        @brief Remove todas as imagens do cache.
+        """
+        with self._trava:
+            self._entradas.clear()
+            self.bytes_ocupados = 0
+
+
+# Cache compartilhado por todos os módulos do processo
+_cache = CacheDeImagens()
+
+
+def ler_imagem(caminho, modo=cv2.IMREAD_COLOR):
+    """
+    @brief Substituto de cv2.imread que decodifica cada arquivo uma única vez por processo.
+
+    @details
+    Usa o cache compartilhado do módulo. Leituras repetidas do mesmo arquivo, no mesmo
+    modo, devolvem a imagem já decodificada, desde que o arquivo não tenha sido alterado.
+
+    @param caminho: Caminho do arquivo de imagem.
+    @param modo: Modo de leitura do cv2.imread (0 ou cv2.IMREAD_GRAYSCALE para cinza).
+    @return Visão somente leitura da imagem, ou None se não puder ser lida.
+    """
+    return _cache.ler(caminho, modo)
+
+
+def configurar_cache(limite_bytes):
+    """
+    @brief Altera o limite de memória do cache compartilhado.
+
+    @param limite_bytes: Novo máximo de bytes; imagens excedentes são removidas na hora.
+    """
+    with _cache._trava:
+        _cache.limite_bytes = limite_bytes
+        _cache._liberar()
+
+
+def limpar_cache():
+    """
+    @brief Esvazia o cache compartilhado.
+    """
+    _cache.limpar()
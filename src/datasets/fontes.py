@@ -0,0 +1,503 @@
+"""
+@brief Fontes de quadros: vídeos, sequências de imagens, pilhas NPY e quadros sintéticos com a mesma interface.
+
+@details
+chapter_three.reproduzir_video lê um vídeo fixo e carrega_imagem uma imagem fixa. Aqui
+toda entrada vira um iterador de quadros com as mesmas operações, de modo que imagens
+paradas e vídeos passam pelas mesmas funções:
+
+    - FonteDeVideo:      arquivo de vídeo (ou índice de webcam) via cv2.VideoCapture;
+    - FonteDeSequencia:  imagens numeradas (diretório, padrão glob, "quadro_%04d.png" ou lista);
+    - FonteDeNPY:        pilha (n, altura, largura[, canais]) em .npy, lida por memória mapeada;
+    - FonteSintetica:    quadros gerados sob demanda (útil em testes e medições).
+
+Todas aceitam `inicio`, `fim` e `passo` (pular quadros), podem ser reposicionadas com
+`posicionar`, decodificam adiantado em uma thread com `antecipar` e agrupam quadros em
+lotes contíguos (n, altura, largura, canais) com `lotes`. Os quadros são lidos um a um,
+à medida que são pedidos: nenhuma fonte guarda o vídeo inteiro na memória.
+
+Exemplo:
+
+    with abrir_fonte("data/raw/first_video.mp4", passo=2, antecipar=8) as fonte:
+        canny = ("canny", {"limiar_inferior": 50, "limiar_superior": 150})
+        for bordas in encadear(fonte, "filtro_gaussiano", canny):
+            ...
+
+    for lote in abrir_fonte("data/raw/*.jpg", cinza=True).lotes(16):
+        ...                                    # lote: array (n, altura, largura)
+"""
+import glob
+import os
+import queue
+import re
+import threading
+
+import cv2
+import numpy as np
+
+from src.preprocessing.lote import EXTENSOES_IMAGEM
+from src.preprocessing.operacoes import obter_operacao
+
+# Extensões tratadas como vídeo por abrir_fonte
+EXTENSOES_VIDEO = (".avi", ".m4v", ".mkv", ".mov", ".mp4", ".mpeg", ".mpg", ".webm", ".wmv")
+
+# Marca o fim dos quadros na fila da decodificação antecipada
+_FIM = object()
+
+
+class FonteDeQuadros:
+    """
+    @brief Base das fontes: percorre os quadros [inicio, fim) de `passo` em `passo`.
+
+    @details
+    As subclasses implementam `_ler(indice)` (acesso direto a um quadro) e `total`; as
+    que só leem em sequência, como o vídeo, sobrescrevem `_percorrer`.
+
+    A iteração continua da posição atual: depois de percorrer a fonte, é preciso
+    chamar `posicionar` (ou `reiniciar`) para lê-la de novo.
+
+    @param inicio: Índice do primeiro quadro.
+    @param fim: Índice após o último quadro; None vai até o fim da fonte.
+    @param passo: Distância entre quadros lidos (2 lê um quadro sim, outro não).
+    @param antecipar: Quadros decodificados adiantados por uma thread (0 = sem thread).
+    @param fps: Quadros por segundo atribuídos à fonte.
+    """
+
+    def __init__(self, inicio=0, fim=None, passo=1, antecipar=0, fps=30.0):
+        if passo < 1:
+            raise ValueError(f"O passo deve ser pelo menos 1, não {passo}.")
+        self.inicio = inicio
+        self.fim = fim
+        self.passo = passo
+        self.antecipar = antecipar
+        self.fps = fps
+        self.posicao = inicio
+
+    @property
+    def total(self):
+        """
+        @brief Número de quadros da fonte inteira, ou None se for desconhecido (webcam).
+        """
+        raise NotImplementedError
+
+    def _ler(self, indice):
+        raise NotImplementedError
+
+    def _fim_efetivo(self):
+        total = self.total
+        if total is None:
+            return self.fim
+        return total if self.fim is None else min(self.fim, total)
+
+    def _percorrer(self, inicio, fim, passo, vaga):
+        # Acesso direto: lê apenas os quadros pedidos
+        indice = inicio
+        while fim is None or indice < fim:
+            quadro = self._ler(indice)
+            if quadro is None:
+                return
+            yield indice, quadro
+            indice += passo
+
+    def __len__(self):
+        fim = self._fim_efetivo()
+        if fim is None:
+            raise TypeError("Fonte sem número de quadros conhecido.")
+        return max(0, -(-(fim - self.inicio) // self.passo))
+
+    def posicionar(self, indice):
+        """
+        @brief Faz a próxima leitura começar no quadro `indice` (índice absoluto na fonte).
+        """
+        self.posicao = indice
+
+    def reiniciar(self):
+        """
+        @brief Volta ao primeiro quadro (`inicio`).
+        """
+        self.posicionar(self.inicio)
+
+    def ler(self, indice):
+        """
+        @brief Lê um único quadro pelo índice, sem alterar a posição da iteração.
+
+        @return Quadro, ou None se o índice estiver fora da fonte.
+        """
+        fim = self._fim_efetivo()
+        if indice < 0 or (fim is not None and indice >= fim):
+            return None
+        for _, quadro in self._percorrer(indice, indice + 1, 1, None):
+            return quadro
+        return None
+
+    def percorrer(self, vaga=None):
+        """
+        @brief Gera pares (índice, quadro) a partir da posição atual.
+
+        @param vaga: Função sem argumentos que devolve o array onde o próximo quadro
+                     deve ser escrito (ou None); as fontes que decodificam no lugar, como o
+                     vídeo, a usam para não alocar um array por quadro.
+        @return Gerador de (índice, quadro).
+        """
+        pares = self._percorrer(self.posicao, self._fim_efetivo(), self.passo, vaga)
+        if self.antecipar > 0:
+            pares = self._antecipado(pares)
+        try:
+            for indice, quadro in pares:
+                self.posicao = indice + self.passo
+                yield indice, quadro
+        finally:
+            pares.close()
+
+    def _antecipado(self, pares):
+        # Uma thread decodifica até `antecipar` quadros à frente de quem consome
+        fila = queue.Queue(maxsize=self.antecipar)
+        parar = threading.Event()
+        erros = []
+
+        def decodificar():
+            try:
+                for par in pares:
+                    while not parar.is_set():
+                        try:
+                            fila.put(par, timeout=0.1)
+                            break
+                        except queue.Full:
+                            pass
+                    if parar.is_set():
+                        break
+            except Exception as erro:
+                erros.append(erro)
+            finally:
+                pares.close()
+                fila.put(_FIM)
+
+        thread = threading.Thread(target=decodificar, daemon=True)
+        thread.start()
+        try:
+            while True:
+                par = fila.get()
+                if par is _FIM:
+                    break
+                yield par
+        finally:
+            parar.set()
+            # Esvazia a fila para a thread poder colocar o marcador de fim e terminar
+            while thread.is_alive():
+                try:
+                    fila.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            thread.join()
+        if erros:
+            raise erros[0]
+
+    def __iter__(self):
+        for _, quadro in self.percorrer():
+            yield quadro
+
+    def lotes(self, tamanho, destino=None):
+        """
+        @brief Agrupa os quadros em arrays contíguos (n, altura, largura[, canais]).
+
+        @details
+        O mesmo array é preenchido a cada lote (o último pode ser uma fatia menor):
+        quem precisar guardar um lote deve copiá-lo. Sem decodificação antecipada, as
+        fontes que decodificam no lugar escrevem direto na posição do lote, sem cópia.
+
+        @param tamanho: Quadros por lote.
+        @param destino: Array (tamanho, altura, largura[, canais]) reutilizado; None aloca
+                        um no primeiro quadro.
+        @return Gerador de lotes.
+        @exception ValueError Se os quadros não tiverem todos a mesma forma.
+        """
+        lote = destino
+        ocupados = 0
+        atual = None
+
+        def vaga():
+            nonlocal atual
+            atual = None if lote is None else lote[ocupados]
+            return atual
+
+        for _, quadro in self.percorrer(None if self.antecipar else vaga):
+            if lote is None:
+                lote = np.empty((tamanho,) + quadro.shape, dtype=quadro.dtype)
+            if quadro is not atual:
+                if quadro.shape != lote.shape[1:]:
+                    raise ValueError(f"Quadro de forma {quadro.shape} em lote de quadros {lote.shape[1:]}.")
+                lote[ocupados] = quadro
+            ocupados += 1
+            if ocupados == tamanho:
+                yield lote
+                ocupados = 0
+        if ocupados:
+            yield lote[:ocupados]
+
+    def aplicar(self, operacao, **parametros):
+        """
+        @brief Gera o resultado de uma operação em cada quadro (ver encadear).
+        """
+        return encadear(self, (operacao, parametros))
+
+    def fechar(self):
+        """
+        @brief Libera os recursos da fonte (arquivo de vídeo, memória mapeada).
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+
+class FonteDeVideo(FonteDeQuadros):
+    """
+    @brief Quadros de um arquivo de vídeo ou de uma webcam (cv2.VideoCapture).
+
+    @details
+    Os quadros pulados pelo `passo` são apenas avançados (grab), sem decodificação da
+    imagem. `posicionar` usa a busca do próprio vídeo; em webcams não há busca.
+
+    @param caminho: Caminho do vídeo ou índice da webcam (0 = padrão).
+    @param cinza: Se True, os quadros são convertidos para tons de cinza.
+    @exception FileNotFoundError Se o vídeo não puder ser aberto.
+    """
+
+    def __init__(self, caminho=0, cinza=False, **opcoes):
+        self.caminho = caminho
+        self.cinza = cinza
+        self._captura = cv2.VideoCapture(caminho)
+        if not self._captura.isOpened():
+            raise FileNotFoundError(f"Vídeo não encontrado ou não pôde ser aberto: {caminho}")
+        opcoes.setdefault("fps", self._captura.get(cv2.CAP_PROP_FPS) or 30.0)
+        super().__init__(**opcoes)
+        # Índice do próximo quadro que a captura vai entregar
+        self._proximo = 0
+
+    @property
+    def total(self):
+        if isinstance(self.caminho, int):
+            return None
+        quadros = int(self._captura.get(cv2.CAP_PROP_FRAME_COUNT))
+        return quadros if quadros > 0 else None
+
+    def _percorrer(self, inicio, fim, passo, vaga):
+        if inicio != self._proximo and not isinstance(self.caminho, int):
+            self._captura.set(cv2.CAP_PROP_POS_FRAMES, inicio)
+            self._proximo = inicio
+
+        indice = self._proximo
+        while fim is None or indice < fim:
+            buffer = None if self.cinza or vaga is None else vaga()
+            ok, quadro = self._captura.read(buffer)
+            if not ok:
+                return
+            self._proximo = indice + 1
+            if self.cinza:
+                quadro = cv2.cvtColor(quadro, cv2.COLOR_BGR2GRAY, dst=None if vaga is None else vaga())
+            yield indice, quadro
+
+            for _ in range(passo - 1):
+                if not self._captura.grab():
+                    return
+                self._proximo += 1
+            indice += passo
+
+    def fechar(self):
+        self._captura.release()
+
+
+def _chave_natural(caminho):
+    # "quadro_2.png" antes de "quadro_10.png"
+    return [int(parte) if parte.isdigit() else parte for parte in re.split(r"(\d+)", caminho)]
+
+
+def listar_sequencia(padrao):
+    """
+    @brief Expande a descrição de uma sequência de imagens em uma lista de arquivos.
+
+    @param padrao: Diretório, padrão glob ("data/raw/*.jpg"), padrão numerado no estilo
+                   printf ("quadros/quadro_%04d.png"), arquivo único ou lista de caminhos.
+    @return Lista de caminhos em ordem natural (2 antes de 10).
+    """
+    if isinstance(padrao, (list, tuple)):
+        return list(padrao)
+    if os.path.isdir(padrao):
+        caminhos = [os.path.join(padrao, nome) for nome in os.listdir(padrao)
+                    if nome.lower().endswith(EXTENSOES_IMAGEM)]
+    elif re.search(r"%0?\d*d", padrao):
+        numerado = re.compile(re.sub(r"%0?\d*d", r"\\d+", re.escape(padrao)) + "$")
+        caminhos = [caminho for caminho in glob.glob(re.sub(r"%0?\d*d", "*", padrao))
+                    if numerado.match(caminho)]
+    else:
+        caminhos = [caminho for caminho in glob.glob(padrao) if os.path.isfile(caminho)]
+    return sorted(caminhos, key=_chave_natural)
+
+
+class FonteDeSequencia(FonteDeQuadros):
+    """
+    @brief Quadros de uma sequência de arquivos de imagem (uma imagem parada é uma sequência de 1).
+
+    @param padrao: Descrição dos arquivos (ver listar_sequencia).
+    @param cinza: Se True, as imagens são lidas em tons de cinza.
+    @exception FileNotFoundError Se nenhum arquivo for encontrado.
+    """
+
+    def __init__(self, padrao, cinza=False, **opcoes):
+        super().__init__(**opcoes)
+        self.caminhos = listar_sequencia(padrao)
+        if not self.caminhos:
+            raise FileNotFoundError(f"Nenhuma imagem encontrada em: {padrao}")
+        self.modo = cv2.IMREAD_GRAYSCALE if cinza else cv2.IMREAD_COLOR
+
+    @property
+    def total(self):
+        return len(self.caminhos)
+
+    def _ler(self, indice):
+        if indice >= len(self.caminhos):
+            return None
+        quadro = cv2.imread(self.caminhos[indice], self.modo)
+        if quadro is None:
+            raise OSError(f"Não foi possível ler a imagem: {self.caminhos[indice]}")
+        return quadro
+
+
+class FonteDeNPY(FonteDeQuadros):
+    """
+    @brief Quadros de uma pilha (n, altura, largura[, canais]) salva com np.save, ou já em memória.
+
+    @details
+    O arquivo é aberto por memória mapeada: só as páginas dos quadros lidos são
+    carregadas. Cada quadro é entregue como uma cópia comum (gravável).
+
+    @param pilha: Caminho do arquivo .npy ou array com os quadros.
+    """
+
+    def __init__(self, pilha, **opcoes):
+        super().__init__(**opcoes)
+        self._pilha = np.load(pilha, mmap_mode="r") if isinstance(pilha, (str, os.PathLike)) else pilha
+        if self._pilha.ndim not in (3, 4):
+            raise ValueError(f"A pilha deve ter 3 ou 4 dimensões, não {self._pilha.ndim}.")
+
+    @property
+    def total(self):
+        return len(self._pilha)
+
+    def _percorrer(self, inicio, fim, passo, vaga):
+        for indice in range(inicio, min(fim, len(self._pilha)), passo):
+            buffer = None if vaga is None else vaga()
+            if buffer is None:
+                yield indice, np.array(self._pilha[indice])
+            else:
+                np.copyto(buffer, self._pilha[indice])
+                yield indice, buffer
+
+
+class FonteSintetica(FonteDeQuadros):
+    """
+    @brief Quadros gerados sob demanda: por padrão, um quadrado que atravessa um fundo em degradê.
+
+    @details
+    Cada quadro depende só do seu índice (o ruído usa a semente mais o índice), de modo
+    que a busca e a leitura repetida devolvem sempre o mesmo quadro.
+
+    @param numero: Número de quadros (None = infinito).
+    @param altura: Altura dos quadros.
+    @param largura: Largura dos quadros.
+    @param canais: 1 (cinza) ou 3 (BGR).
+    @param ruido: Desvio padrão de um ruído gaussiano somado a cada quadro.
+    @param gerador: Função indice -> quadro que substitui a cena padrão.
+    @param semente: Semente do ruído.
+    """
+
+    def __init__(self, numero=100, altura=240, largura=320, canais=3, ruido=0.0,
+                 gerador=None, semente=0, **opcoes):
+        super().__init__(**opcoes)
+        self.numero = numero
+        self.altura = altura
+        self.largura = largura
+        self.canais = canais
+        self.ruido = ruido
+        self.gerador = gerador or self._cena
+        self.semente = semente
+        self._fundo = np.tile(np.linspace(40, 200, largura).astype(np.uint8), (altura, 1))
+
+    @property
+    def total(self):
+        return self.numero
+
+    def _cena(self, indice):
+        quadro = self._fundo.copy()
+        lado = max(1, min(self.altura, self.largura) // 8)
+        y = (indice * 3) % max(1, self.altura - lado)
+        x = (indice * 5) % max(1, self.largura - lado)
+        quadro[y:y + lado, x:x + lado] = 255
+        if self.ruido:
+            ruido = np.random.default_rng(self.semente + indice).normal(0, self.ruido, quadro.shape)
+            quadro = np.clip(quadro + ruido, 0, 255).astype(np.uint8)
+        if self.canais == 3:
+            quadro = cv2.cvtColor(quadro, cv2.COLOR_GRAY2BGR)
+        return quadro
+
+    def _ler(self, indice):
+        if self.numero is not None and indice >= self.numero:
+            return None
+        return self.gerador(indice)
+
+
+def abrir_fonte(entrada, **opcoes):
+    """
+    @brief Cria a fonte adequada para uma entrada.
+
+    @details
+    - FonteDeQuadros: devolvida como está;
+    - inteiro: webcam; arquivo com extensão de vídeo ou URL: FonteDeVideo;
+    - arquivo .npy ou array: FonteDeNPY;
+    - diretório, padrão glob, padrão "%04d", imagem única ou lista: FonteDeSequencia.
+
+    @param entrada: Descrição da fonte.
+    @param opcoes: Parâmetros repassados à fonte (inicio, fim, passo, antecipar, cinza, ...).
+    @return FonteDeQuadros.
+    """
+    if isinstance(entrada, FonteDeQuadros):
+        return entrada
+    if isinstance(entrada, np.ndarray):
+        return FonteDeNPY(entrada, **opcoes)
+    if isinstance(entrada, int) or (isinstance(entrada, str) and "://" in entrada):
+        return FonteDeVideo(entrada, **opcoes)
+    if isinstance(entrada, (str, os.PathLike)):
+        extensao = os.path.splitext(str(entrada))[1].lower()
+        if extensao == ".npy":
+            return FonteDeNPY(entrada, **opcoes)
+        if extensao in EXTENSOES_VIDEO:
+            return FonteDeVideo(str(entrada), **opcoes)
+        entrada = str(entrada)
+    return FonteDeSequencia(entrada, **opcoes)
+
+
+def encadear(quadros, *operacoes):
+    """
+    @brief Aplica uma sequência de operações a cada quadro, sob demanda (gerador).
+
+    @details
+    Cada quadro passa por todas as operações antes de o próximo ser lido, de modo que
+    só um quadro por etapa existe de cada vez, qualquer que seja o tamanho da fonte.
+
+    @param quadros: Fonte ou qualquer iterável de imagens.
+    @param operacoes: Funções, nomes de src.preprocessing.operacoes ou pares (operação, parâmetros).
+    @return Gerador de quadros tratados.
+    """
+    etapas = []
+    for operacao in operacoes:
+        operacao, parametros = operacao if isinstance(operacao, tuple) else (operacao, {})
+        if isinstance(operacao, str):
+            operacao = obter_operacao(operacao)
+        etapas.append((operacao, parametros))
+
+    for quadro in quadros:
+        for operacao, parametros in etapas:
+            quadro = operacao(quadro, **parametros)
+        yield quadro
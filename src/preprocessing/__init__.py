@@ -0,0 +1,3 @@
+"""
+@brief Funções de tratamento de imagem sem interface gráfica.
+"""
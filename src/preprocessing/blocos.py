@@ -0,0 +1,235 @@
+"""
+@brief Processamento em blocos (tiles) de imagens maiores que a memória disponível.
+
+@details
+A imagem é percorrida em blocos retangulares. Cada bloco é lido com uma margem extra
+(halo) da largura do raio do filtro, filtrado e apenas a parte central é escrita na saída.
+Assim o resultado é idêntico ao do filtro aplicado à imagem inteira, mas só alguns blocos
+ficam em memória ao mesmo tempo. Filtros cujo resultado depende da imagem inteira (o
+filtro guiado com `reducao` > 1, que amostra a imagem em uma grade própria) são
+recusados. Entrada e saída podem ser arquivos mapeados em memória (.npy, .raw ou .tif),
+de modo que nem a imagem nem o resultado precisam caber na RAM.
+
+Exemplo:
+
+    entrada = abrir_entrada("scan.npy")
+    saida   = criar_saida("scan-gaussiano.npy", entrada.shape, entrada.dtype)
+    processar_em_blocos(entrada, saida, "filtro_gaussiano", {"tamanho": 31})
+"""
+import argparse
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.preprocessing.operacoes import obter_operacao
+from src.preprocessing.suavizacao import larguras_das_caixas, parametros_guiados, sigma_padrao
+
+
+def _argumentos(funcao, parametros):
+    # Parâmetros efetivos da operação: os padrões da função sobrescritos pelos informados
+    assinatura = inspect.signature(funcao)
+    valores = {
+        nome: parametro.default
+        for nome, parametro in assinatura.parameters.items()
+        if parametro.default is not inspect.Parameter.empty
+    }
+    valores.update(parametros)
+    return valores
+
+
+def raio_do_filtro(nome_operacao, parametros=None):
+    """
+    @brief Raio de vizinhança (em pixels) de um filtro de chapter_six.
+
+    @details
+    É a largura mínima da margem (halo) que cada bloco precisa para que o filtro,
+    aplicado ao bloco, produza no centro o mesmo resultado que na imagem inteira.
+
+    @param nome_operacao: "filtro_de_média", "filtro_gaussiano", "filtro_de_mediana" ou "filtro_bilateral".
+    @param parametros: Parâmetros repassados à operação (os omitidos usam o padrão da função).
+    @return Raio em pixels.
+    @exception ValueError Se o raio da operação não for conhecido, ou se a operação não
+               puder ser dividida em blocos (filtro guiado com reducao > 1).
+    """
+    operacao = obter_operacao(nome_operacao)
+    valores = _argumentos(operacao, parametros or {})
+    nome = operacao.__name__
+
+    if nome in ("filtro_de_média", "filtro_de_mediana"):
+        return valores["tamanho"] // 2
+
+    if nome == "filtro_gaussiano":
+        tamanho = valores["tamanho"]
+        if valores.get("modo") == "rapido":
+            # Caixas empilhadas: o raio é a soma dos raios das caixas, que depende só de
+            # sigma e pode passar de tamanho // 2
+            sigma = valores["sigma"] if valores["sigma"] > 0 else sigma_padrao(tamanho)
+            return sum(largura // 2 for largura in larguras_das_caixas(sigma, valores["passes"]))
+        if tamanho <= 0:
+            # Mesmo cálculo do OpenCV para kernel automático em imagens de 8 bits
+            tamanho = int(round(valores["sigma"] * 3 * 2 + 1)) | 1
+        return tamanho // 2
+
+    if nome == "filtro_bilateral":
+        if valores.get("modo") == "guiado":
+            # Duas médias em caixa de raio r seguidas (coeficientes e média dos coeficientes)
+            if valores["reducao"] > 1:
+                raise ValueError("O filtro guiado com reducao > 1 amostra a imagem inteira em uma grade "
+                                 "própria e não pode ser processado em blocos; use reducao=1.")
+            raio, _ = parametros_guiados(valores["diametro"], valores["sigma_cor"], valores["sigma_espaco"])
+            return 2 * raio
+        diametro = valores["diametro"]
+        if diametro <= 0:
+            # Com diâmetro não positivo, o OpenCV o deriva de sigma_espaco
+            return int(round(valores["sigma_espaco"] * 1.5))
+        return diametro // 2
+
+    raise ValueError(f"Raio desconhecido para a operação {nome_operacao}; informe `raio` explicitamente.")
+
+
+def abrir_entrada(caminho, forma=None, dtype=np.uint8):
+    """
+    @brief Abre uma imagem grande como array mapeado em memória (somente leitura).
+
+    @details
+    Formatos suportados:
+        - .npy: np.load com mmap_mode="r".
+        - .tif/.tiff: tifffile.memmap (requer o pacote opcional tifffile e um TIFF
+          sem compressão).
+        - Qualquer outro: arquivo binário bruto, exigindo `forma` e `dtype`.
+
+    @param caminho: Caminho do arquivo.
+    @param forma: Forma (altura, largura[, canais]) de arquivos brutos.
+    @param dtype: Tipo dos pixels de arquivos brutos (padrão uint8).
+    @return Array mapeado em memória.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+
+    if extensao == ".npy":
+        return np.load(caminho, mmap_mode="r")
+
+    if extensao in (".tif", ".tiff"):
+        try:
+            import tifffile
+        except ImportError as erro:
+            raise ImportError("Leitura de TIFF mapeado em memória requer o pacote tifffile.") from erro
+        return tifffile.memmap(caminho, mode="r")
+
+    if forma is None:
+        raise ValueError("Arquivos brutos exigem a forma (altura, largura[, canais]).")
+    return np.memmap(caminho, dtype=dtype, mode="r", shape=tuple(forma))
+
+
+def criar_saida(caminho, forma, dtype=np.uint8):
+    """
+    @brief Cria o arquivo de saída mapeado em memória, no formato indicado pela extensão.
+
+    @param caminho: Caminho do arquivo (.npy, .tif/.tiff ou bruto).
+    @param forma: Forma do resultado.
+    @param dtype: Tipo dos pixels.
+    @return Array mapeado em memória, pronto para escrita.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+
+    if extensao == ".npy":
+        return np.lib.format.open_memmap(caminho, mode="w+", dtype=dtype, shape=tuple(forma))
+
+    if extensao in (".tif", ".tiff"):
+        try:
+            import tifffile
+        except ImportError as erro:
+            raise ImportError("Escrita de TIFF mapeado em memória requer o pacote tifffile.") from erro
+        return tifffile.memmap(caminho, shape=tuple(forma), dtype=dtype)
+
+    return np.memmap(caminho, dtype=dtype, mode="w+", shape=tuple(forma))
+
+
+def gerar_blocos(altura, largura, tamanho_bloco):
+    """
+    @brief Lista os blocos (y0, y1, x0, x1) que cobrem a imagem sem sobreposição.
+    """
+    return [
+        (y0, min(y0 + tamanho_bloco, altura), x0, min(x0 + tamanho_bloco, largura))
+        for y0 in range(0, altura, tamanho_bloco)
+        for x0 in range(0, largura, tamanho_bloco)
+    ]
+
+
+def processar_em_blocos(entrada, saida, operacao, parametros=None, tamanho_bloco=1024,
+                        raio=None, trabalhadores=None):
+    """
+    @brief Aplica um filtro bloco a bloco, lendo e escrevendo apenas a região de cada bloco.
+
+    @details
+    Cada bloco é expandido pelo raio do filtro em todas as direções (limitado às bordas
+    da imagem). Nas bordas reais da imagem o próprio filtro aplica o seu tratamento de
+    borda, como faria sobre a imagem inteira. Os blocos são independentes e escrevem em
+    regiões disjuntas da saída, por isso são processados em paralelo por threads (o
+    OpenCV libera o GIL durante os filtros).
+
+    @param entrada: Array (possivelmente mapeado em memória) de entrada.
+    @param saida: Array de saída com a mesma forma e tipo do resultado do filtro.
+    @param operacao: Nome de uma operação de src.preprocessing.operacoes ou uma função
+                     que recebe um bloco; funções exigem `raio`.
+    @param parametros: Parâmetros extras repassados à operação.
+    @param tamanho_bloco: Lado dos blocos, sem contar a margem.
+    @param raio: Largura da margem; None a deriva do filtro com raio_do_filtro().
+    @param trabalhadores: Número de threads; None usa a quantidade de núcleos.
+    @return O array de saída.
+    """
+    parametros = parametros or {}
+    if isinstance(operacao, str):
+        if raio is None:
+            raio = raio_do_filtro(operacao, parametros)
+        operacao = obter_operacao(operacao)
+    elif raio is None:
+        raise ValueError("Informe `raio` ao usar uma função própria.")
+
+    altura, largura = entrada.shape[:2]
+
+    def processar(bloco):
+        y0, y1, x0, x1 = bloco
+
+        # Região lida: o bloco mais a margem, limitada às bordas da imagem
+        ly0, ly1 = max(y0 - raio, 0), min(y1 + raio, altura)
+        lx0, lx1 = max(x0 - raio, 0), min(x1 + raio, largura)
+
+        regiao = np.ascontiguousarray(entrada[ly0:ly1, lx0:lx1])
+        resultado = operacao(regiao, **parametros)
+
+        # Escreve apenas o centro, descartando a margem
+        saida[y0:y1, x0:x1] = resultado[y0 - ly0:y1 - ly0, x0 - lx0:x1 - lx0]
+
+    blocos = gerar_blocos(altura, largura, tamanho_bloco)
+    with ThreadPoolExecutor(max_workers=trabalhadores or os.cpu_count() or 1) as executor:
+        # list() propaga exceções dos blocos
+        list(executor.map(processar, blocos))
+
+    if isinstance(saida, np.memmap):
+        saida.flush()
+    return saida
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica um filtro em blocos a uma imagem grande mapeada em memória.")
+    parser.add_argument("entrada", help="Arquivo .npy, .tif ou bruto.")
+    parser.add_argument("saida", help="Arquivo de saída (.npy, .tif ou bruto).")
+    parser.add_argument("operacao", help="filtro_de_média, filtro_gaussiano, filtro_de_mediana ou filtro_bilateral.")
+    parser.add_argument("--bloco", type=int, default=1024, help="Lado dos blocos em pixels.")
+    parser.add_argument("--forma", type=int, nargs="+", default=None,
+                        help="Forma de arquivos brutos: altura largura [canais].")
+    parser.add_argument("--dtype", default="uint8", help="Tipo dos pixels de arquivos brutos.")
+    parser.add_argument("--trabalhadores", type=int, default=None)
+    argumentos = parser.parse_args()
+
+    entrada = abrir_entrada(argumentos.entrada, argumentos.forma, np.dtype(argumentos.dtype))
+    saida = criar_saida(argumentos.saida, entrada.shape, entrada.dtype)
+    processar_em_blocos(entrada, saida, argumentos.operacao, tamanho_bloco=argumentos.bloco,
+                        trabalhadores=argumentos.trabalhadores)
+    print("Resultado salvo em", argumentos.saida)
+
+
+if __name__ == "__main__":
+    main()
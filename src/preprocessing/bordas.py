@@ -0,0 +1,217 @@
+"""
+@brief Detecção de bordas com gradientes calculados uma única vez por imagem.
+
+@details
+Os gradientes de Sobel (dx, dy) são calculados com sinal (CV_16S) e guardados em um
+objeto Gradientes. A partir dele são servidos, sem repetir a convolução: a magnitude e a
+orientação do gradiente, as imagens de Sobel de 8 bits (valor absoluto, em vez do corte
+de CV_8U que descarta as derivadas negativas), o histograma da magnitude e o Canny, que
+no OpenCV aceita os gradientes prontos. Os limiares da histerese podem ser escolhidos
+automaticamente a partir desse histograma.
+
+Exemplo (ajuste de limiares sem refazer os gradientes):
+
+    grad = gradientes(imagem_cinza)
+    for inferior, superior in [(50, 100), (100, 200), (150, 300)]:
+        bordas = grad.canny(inferior, superior)
+    bordas_auto = grad.canny(metodo="otsu")
+"""
+import cv2
+import numpy as np
+
+from src.preprocessing.limiarizacao import limiar_otsu
+from src.preprocessing.piramide import piramide
+from src.utils.cache_de_imagem import derivadas
+
+
+class Gradientes:
+    """
+    @brief Gradientes de Sobel de uma imagem e tudo o que deriva deles.
+
+    @details
+    dx e dy são calculados como o Canny do OpenCV os calcula (CV_16S, borda replicada e,
+    com kernel 7, divididos por 16 para não saturar), de modo que canny() produz exatamente
+    o mesmo resultado que cv2.Canny(imagem, ...) e os limiares têm a mesma escala.
+    Magnitude, orientação e histograma são calculados na primeira vez em que são pedidos.
+    Em imagens coloridas vale, em cada pixel, o canal de maior magnitude, como no Canny.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR.
+    @param tamanho: Tamanho do kernel de Sobel (3, 5 ou 7).
+    @param l2: True usa a norma L2 (sqrt(dx² + dy²)); False usa |dx| + |dy|, o padrão do Canny.
+    """
+
+    def __init__(self, imagem, tamanho=3, l2=False):
+        self.tamanho = tamanho
+        self.l2 = l2
+        self.escala = 1 / 16 if tamanho == 7 else 1
+        self.dx = cv2.Sobel(imagem, cv2.CV_16S, 1, 0, ksize=tamanho, scale=self.escala,
+                            borderType=cv2.BORDER_REPLICATE)
+        self.dy = cv2.Sobel(imagem, cv2.CV_16S, 0, 1, ksize=tamanho, scale=self.escala,
+                            borderType=cv2.BORDER_REPLICATE)
+        self._magnitude = None
+        self._orientacao = None
+        self._contagens = None
+
+    @property
+    def magnitude(self):
+        """
+        @brief Magnitude do gradiente (float32), na norma usada pelo Canny.
+        """
+        if self._magnitude is None:
+            dx = self.dx.astype(np.float32)
+            dy = self.dy.astype(np.float32)
+            magnitude = cv2.magnitude(dx, dy) if self.l2 else cv2.add(np.abs(dx), np.abs(dy))
+            if magnitude.ndim == 3:
+                magnitude = magnitude.max(axis=2)
+            self._magnitude = magnitude
+        return self._magnitude
+
+    @property
+    def orientacao(self):
+        """
+        @brief Orientação do gradiente em graus (0 a 360), float32.
+        """
+        if self._orientacao is None:
+            self._orientacao = cv2.phase(self.dx.astype(np.float32), self.dy.astype(np.float32),
+                                         angleInDegrees=True)
+        return self._orientacao
+
+    @property
+    def sobel_x(self):
+        """
+        @brief |dx| saturado em 8 bits, para exibição (bordas claras e escuras aparecem).
+        """
+        return cv2.convertScaleAbs(self.dx)
+
+    @property
+    def sobel_y(self):
+        """
+        @brief |dy| saturado em 8 bits, para exibição.
+        """
+        return cv2.convertScaleAbs(self.dy)
+
+    @property
+    def contagens(self):
+        """
+        @brief Histograma da magnitude arredondada: contagens[m] = pixels com magnitude m.
+        """
+        if self._contagens is None:
+            self._contagens = np.bincount(np.rint(self.magnitude).astype(np.int64).ravel())
+        return self._contagens
+
+    def limiares(self, metodo="mediana", sigma=0.33, fracao_sem_borda=0.7):
+        """
+        @brief Escolhe os limiares da histerese a partir do histograma da magnitude.
+
+        @details
+        Métodos:
+            - "mediana": m = mediana das magnitudes não nulas; limiares (1 - sigma)·m e
+              (1 + sigma)·m.
+            - "otsu": o limiar de Otsu separa gradientes fracos (fundo) de fortes (bordas)
+              e é o limiar superior; o inferior é a metade dele.
+            - "percentil": o superior deixa `fracao_sem_borda` dos pixels abaixo dele e
+              o inferior é 0,4 vezes o superior (regra do MATLAB).
+
+        @param metodo: "mediana", "otsu" ou "percentil".
+        @param sigma: Abertura em torno da mediana (método "mediana").
+        @param fracao_sem_borda: Fração de pixels considerada fundo (método "percentil").
+        @return Tupla (limiar_inferior, limiar_superior), na escala de cv2.Canny.
+        """
+        inferior, superior = self._limiares(metodo, sigma, fracao_sem_borda)
+        return inferior / self.escala, superior / self.escala
+
+    def _limiares(self, metodo, sigma, fracao_sem_borda):
+        # Limiares na escala da magnitude (dx e dy como guardados)
+        contagens = self.contagens
+        acumuladas = np.cumsum(contagens)
+
+        if metodo == "mediana":
+            nao_nulas = acumuladas - contagens[0]
+            if nao_nulas[-1] == 0:
+                return 0.0, 0.0
+            mediana = float(np.searchsorted(nao_nulas, nao_nulas[-1] / 2))
+            return max(0.0, (1 - sigma) * mediana), (1 + sigma) * mediana
+
+        if metodo == "otsu":
+            superior = float(limiar_otsu(contagens))
+            return superior / 2, superior
+
+        if metodo == "percentil":
+            superior = float(np.searchsorted(acumuladas, fracao_sem_borda * acumuladas[-1]))
+            return 0.4 * superior, superior
+
+        raise ValueError(f"Método de limiar desconhecido: {metodo}")
+
+    def canny(self, limiar_inferior=None, limiar_superior=None, metodo="mediana", destino=None, **opcoes):
+        """
+        @brief Canny sobre os gradientes já calculados.
+
+        @param limiar_inferior: Limiar inferior da histerese; None escolhe pelos limiares().
+        @param limiar_superior: Limiar superior da histerese; None escolhe pelos limiares().
+        @param metodo: Método de limiares() usado quando os limiares não são informados.
+        @param destino: Array (altura, largura) uint8 que recebe as bordas (opcional).
+        @param opcoes: Demais argumentos de limiares() (sigma, fracao_sem_borda).
+        @return Imagem binária com as bordas em branco.
+        """
+        if limiar_inferior is None or limiar_superior is None:
+            limiar_inferior, limiar_superior = self.limiares(metodo, **opcoes)
+
+        # Com kernel 7 os gradientes estão divididos por 16, e os limiares também
+        return cv2.Canny(self.dx, self.dy, limiar_inferior * self.escala, limiar_superior * self.escala,
+                         edges=destino, L2gradient=self.l2)
+
+
+def gradientes(imagem, tamanho=3, l2=False):
+    """
+    @brief Devolve os gradientes da imagem, calculando-os apenas na primeira chamada.
+
+    @details
+    O objeto fica guardado nas representações derivadas da imagem
+    (src.utils.cache_de_imagem), como o histograma de src.preprocessing.histograma.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR.
+    @param tamanho: Tamanho do kernel de Sobel.
+    @param l2: Norma do gradiente (ver Gradientes).
+    @return Instância de Gradientes compartilhada entre as chamadas.
+    """
+    tabela = derivadas(imagem)
+    nome = f"gradientes:{tamanho}:{int(l2)}"
+    if nome not in tabela:
+        tabela[nome] = Gradientes(imagem, tamanho, l2)
+    return tabela[nome]
+
+
+def canny_multiescala(imagem, niveis=3, metodo="mediana", combinar=False, **opcoes):
+    """
+    @brief Canny com limiares automáticos em cada nível de uma pirâmide Gaussiana.
+
+    @details
+    Os níveis vêm da pirâmide da imagem (src.preprocessing.piramide), guardada e
+    compartilhada com outros módulos. Cada nível é a metade do anterior; os níveis grossos
+    mantêm apenas as bordas de estruturas grandes e descartam textura e ruído. Os limiares são escolhidos
+    separadamente em cada nível, a partir do histograma da magnitude daquele nível.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR.
+    @param niveis: Número de níveis (1 = apenas a imagem original).
+    @param metodo: Método de escolha dos limiares (ver Gradientes.limiares()).
+    @param combinar: True devolve uma única imagem no tamanho original com a união das
+                     bordas de todos os níveis.
+    @param opcoes: Demais argumentos de Gradientes.limiares().
+    @return Lista de imagens de bordas (do nível mais fino ao mais grosso) ou, com
+            combinar=True, a imagem combinada.
+    """
+    altura, largura = imagem.shape[:2]
+    niveis_da_imagem = piramide(imagem, niveis)
+    resultados = [
+        gradientes(niveis_da_imagem.nivel(indice)).canny(metodo=metodo, **opcoes)
+        for indice in range(len(niveis_da_imagem))
+    ]
+
+    if not combinar:
+        return resultados
+
+    combinada = resultados[0].copy()
+    for bordas in resultados[1:]:
+        cv2.bitwise_or(combinada, cv2.resize(bordas, (largura, altura), interpolation=cv2.INTER_NEAREST),
+                       dst=combinada)
+    return combinada
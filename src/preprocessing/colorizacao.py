@@ -0,0 +1,198 @@
+"""
+@brief Colorização de imagens em tons de cinza por uma paleta de 256 cores (uma consulta por pixel).
+
+@details
+Colorir uma imagem cinza, como em tests/melhorador_de_imagem.processar_imagem_pb_antiga,
+é atribuir uma cor BGR a cada um dos 256 tons. A paleta (256 x 3) é calculada uma vez,
+sobre os 256 tons, e a imagem é colorida com uma única consulta por pixel escrita direto
+no buffer de saída, sem os planos intermediários de H, S e V, o merge e a conversão de
+cor da imagem inteira. O buffer pode ser fornecido pelo chamador (`destino=`), para
+reutilizar a mesma memória em todos os quadros de um lote ou vídeo.
+
+colorir_pb_antiga também está registrada em src.preprocessing.operacoes, e pode ser usada
+em processar_video e nos lotes como as demais operações.
+
+Exemplo:
+
+    paleta = Paleta.de_hsv(matiz=15, saturacao=(100, 255))
+    saida  = np.empty(cinza.shape + (3,), dtype=np.uint8)
+    paleta.aplicar(cinza, destino=saida)
+
+    colorida = colorir_pb_antiga(cinza)    # a receita de processar_imagem_pb_antiga
+"""
+import cv2
+import numpy as np
+
+from src.preprocessing.cores import converter
+from src.preprocessing.tons import AjusteDeTons
+
+_TONS = np.arange(256)
+
+
+def _plano(valor):
+    # Escalar, par (início, fim) de uma rampa linear ou tabela de 256 valores
+    if np.isscalar(valor):
+        return np.full(256, valor, dtype=np.uint8)
+    valor = np.asarray(valor)
+    if valor.shape == (2,):
+        return np.rint(valor[0] + (valor[1] - valor[0]) * _TONS / 255).astype(np.uint8)
+    return valor.astype(np.uint8)
+
+
+class Paleta:
+    """
+    @brief Tabela de 256 cores BGR aplicada a imagens em tons de cinza.
+
+    @param cores: Array (256, 3) uint8 com a cor BGR de cada tom.
+    """
+
+    def __init__(self, cores):
+        cores = np.asarray(cores, dtype=np.uint8)
+        if cores.shape != (256, 3):
+            raise ValueError(f"A paleta deve ter 256 x 3 valores, não {cores.shape}.")
+        self.cores = cores
+        # Formato aceito por cv2.LUT em imagens de 3 canais: cada canal consulta a sua coluna
+        self._tabela = np.ascontiguousarray(cores.reshape(1, 256, 3))
+
+    @classmethod
+    def de_hsv(cls, matiz=15, saturacao=255, valor=None):
+        """
+        @brief Paleta descrita em HSV (H de 0 a 179, como no OpenCV).
+
+        @param matiz: Matiz de todos os tons (15 = laranja, como em processar_imagem_pb_antiga).
+        @param saturacao: Escalar, par (inicial, final) para uma rampa ao longo dos tons, ou
+                          256 valores.
+        @param valor: Como `saturacao`; None usa o próprio tom (V = cinza).
+        @return Nova Paleta.
+        """
+        hsv = np.stack([_plano(matiz), _plano(saturacao), _plano(_TONS if valor is None else valor)], axis=1)
+
+        # Conversão em ponto flutuante (H em graus, S e V de 0 a 1) arredondada uma única
+        # vez: a conversão de 8 bits do OpenCV arredonda de forma ligeiramente diferente
+        # conforme a posição do pixel na linha (vetorizada ou não)
+        escala = np.array([2.0, 1 / 255, 1 / 255], dtype=np.float32)
+        bgr = cv2.cvtColor((hsv * escala).astype(np.float32).reshape(1, 256, 3), cv2.COLOR_HSV2BGR)
+        return cls(np.clip(np.rint(bgr.reshape(256, 3) * 255), 0, 255).astype(np.uint8))
+
+    @classmethod
+    def gradiente(cls, *cores):
+        """
+        @brief Paleta que interpola linearmente entre cores BGR (ex.: preto, sépia, branco).
+
+        @param cores: Duas ou mais cores (b, g, r), do tom 0 ao tom 255, igualmente espaçadas.
+        @return Nova Paleta.
+        """
+        cores = np.asarray(cores, dtype=np.float64)
+        posicoes = np.linspace(0, 255, len(cores))
+        return cls(np.rint(np.stack([np.interp(_TONS, posicoes, cores[:, canal]) for canal in range(3)],
+                                    axis=1)).astype(np.uint8))
+
+    def compor(self, tabela):
+        """
+        @brief Paleta que aplica primeiro uma tabela de tons (256 valores) e depois esta paleta.
+
+        @details
+        Permite juntar um ajuste de tons (ex.: AjusteDeTons().equalizar().compilar(imagem))
+        e a colorização em uma única consulta por pixel.
+        """
+        return Paleta(self.cores[np.asarray(tabela).ravel()])
+
+    def aplicar(self, cinza, destino=None):
+        """
+        @brief Colore uma imagem em tons de cinza.
+
+        @param cinza: Imagem uint8 2D.
+        @param destino: Array (altura, largura, 3) uint8 que recebe o resultado; None aloca um.
+        @return Imagem BGR (o próprio `destino`, quando fornecido).
+        """
+        if destino is None:
+            destino = np.empty(cinza.shape + (3,), dtype=np.uint8)
+        # O cinza é replicado nos 3 canais do destino e cada canal é consultado no lugar
+        cv2.cvtColor(cinza, cv2.COLOR_GRAY2BGR, dst=destino)
+        cv2.LUT(destino, self._tabela, dst=destino)
+        return destino
+
+    def aplicar_lote(self, quadros, destino=None):
+        """
+        @brief Colore um lote de quadros com a mesma paleta.
+
+        @param quadros: Array (n, altura, largura) uint8 ou sequência de imagens 2D.
+        @param destino: Array (n, altura, largura, 3) uint8 que recebe o resultado; None aloca um.
+        @return Array (n, altura, largura, 3) com os quadros coloridos.
+        """
+        if isinstance(quadros, np.ndarray):
+            if destino is None:
+                destino = np.empty(quadros.shape + (3,), dtype=np.uint8)
+            # Quadros e destino contíguos formam uma única imagem alta: uma chamada para o
+            # lote todo. Sem contiguidade, reshape copiaria e o resultado não chegaria ao destino
+            if quadros.flags.c_contiguous and destino.flags.c_contiguous:
+                numero, altura, largura = quadros.shape
+                self.aplicar(quadros.reshape(numero * altura, largura), destino.reshape(numero * altura, largura, 3))
+                return destino
+        else:
+            quadros = list(quadros)
+            if destino is None:
+                destino = np.empty((len(quadros),) + quadros[0].shape + (3,), dtype=np.uint8)
+
+        for quadro, saida in zip(quadros, destino):
+            self.aplicar(quadro, saida)
+        return destino
+
+
+def paleta_pb_antiga(cinza, matiz=15, saturacao=(100, 255)):
+    """
+    @brief Paleta de processar_imagem_pb_antiga para uma imagem: equalização seguida do tom HSV.
+
+    @details
+    Em processar_imagem_pb_antiga, V é a imagem equalizada e S é a imagem equalizada
+    normalizada para [100, 255]. Ambos dependem só do tom de cada pixel (e do histograma
+    da imagem), de modo que toda a receita vira uma paleta de 256 cores. As tabelas de
+    equalização e normalização vêm de src.preprocessing.tons e ficam guardadas por imagem.
+
+    @param cinza: Imagem uint8 em tons de cinza.
+    @param matiz: Matiz H (0 a 179).
+    @param saturacao: Intervalo (mínimo, máximo) da normalização de S.
+    @return Paleta que leva cada tom original à cor final.
+    """
+    valor = AjusteDeTons().equalizar().compilar(cinza)[0]
+    saturacao = AjusteDeTons().equalizar().normalizar(*saturacao).compilar(cinza)[0]
+    return Paleta.de_hsv(matiz, saturacao, valor)
+
+
+def colorir_pb_antiga(imagem, matiz=15, saturacao=(100, 255), destino=None):
+    """
+    @brief Equaliza e colore uma imagem cinza, como processar_imagem_pb_antiga.
+
+    @details
+    As cores diferem no máximo em 1 nível das obtidas com cv2.cvtColor sobre a imagem
+    inteira, cuja conversão de 8 bits arredonda de modo diferente conforme a posição do
+    pixel; aqui cada tom tem sempre a mesma cor.
+
+    @param imagem: Imagem uint8 em tons de cinza, ou BGR (convertida para cinza).
+    @param matiz: Matiz H (0 a 179; 15 = laranja).
+    @param saturacao: Intervalo (mínimo, máximo) da saturação.
+    @param destino: Array (altura, largura, 3) uint8 que recebe o resultado; None aloca um.
+    @return Imagem BGR colorida.
+    """
+    cinza = converter(imagem, "cinza") if imagem.ndim == 3 else imagem
+    return paleta_pb_antiga(cinza, matiz, saturacao).aplicar(cinza, destino)
+
+
+def colorir_lote_pb_antiga(quadros, matiz=15, saturacao=(100, 255), destino=None):
+    """
+    @brief colorir_pb_antiga para um lote de quadros, escrevendo em um único buffer.
+
+    @details
+    Cada quadro tem a sua paleta (a equalização depende do histograma do quadro), mas
+    todos são escritos no mesmo array de saída, que pode ser reutilizado entre lotes.
+
+    @param quadros: Array (n, altura, largura) uint8 ou sequência de imagens 2D de mesmo tamanho.
+    @param destino: Array (n, altura, largura, 3) uint8 que recebe o resultado; None aloca um.
+    @return Array (n, altura, largura, 3).
+    """
+    quadros = list(quadros)
+    if destino is None:
+        destino = np.empty((len(quadros),) + quadros[0].shape + (3,), dtype=np.uint8)
+    for quadro, saida in zip(quadros, destino):
+        colorir_pb_antiga(quadro, matiz, saturacao, saida)
+    return destino
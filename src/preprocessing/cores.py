@@ -0,0 +1,73 @@
+import cv2
+
+from src.utils.cache_de_imagem import derivadas
+
+# Conversões a partir de BGR (formato de cv2.imread) para cada espaço de cores
+CONVERSOES = {
+    "rgb":   cv2.COLOR_BGR2RGB,
+    "hsv":   cv2.COLOR_BGR2HSV,
+    "lab":   cv2.COLOR_BGR2LAB,
+    "cinza": cv2.COLOR_BGR2GRAY,
+}
+
+
+def canais(imagem):
+    """
+    @brief Separa os canais de uma imagem sem copiar a memória.
+
+    @details
+    Diferente de cv2.split(), que aloca uma nova matriz por canal, cada canal devolvido
+    é uma visão (fatia com passo) da própria imagem: imagem[:, :, 0], imagem[:, :, 1], ...
+    Funções do OpenCV que exigem memória contínua (ex.: cv2.imshow) fazem a cópia
+    sozinhas apenas quando necessário.
+
+    @param imagem: Imagem com um ou mais canais (np.ndarray).
+    @return Tupla de visões 2D, na ordem dos canais da imagem (B, G, R para BGR).
+    """
+    if imagem.ndim == 2:
+        return (imagem,)
+    return tuple(imagem[:, :, canal] for canal in range(imagem.shape[2]))
+
+
+def converter(imagem, espaco):
+    """
+    @brief Converte uma imagem BGR para outro espaço de cores, no máximo uma vez por imagem.
+
+    @details
+    O resultado é guardado nas representações derivadas da imagem
+    (src.utils.cache_de_imagem): chamadas seguintes com a mesma imagem (somente leitura)
+    e o mesmo espaço devolvem a conversão já calculada. O array devolvido é somente leitura, pois é
+    compartilhado entre todos os chamadores; use .copy() para alterá-lo.
+
+    @param imagem: Imagem colorida no formato BGR.
+    @param espaco: "bgr", "rgb", "hsv", "lab" ou "cinza".
+    @return Imagem convertida (a própria imagem para "bgr").
+    @exception ValueError Se o espaço de cores não for suportado.
+    """
+    if espaco == "bgr":
+        return imagem
+    if espaco not in CONVERSOES:
+        raise ValueError(f"Espaço de cores desconhecido: {espaco}. Disponíveis: bgr, {', '.join(CONVERSOES)}")
+
+    tabela = derivadas(imagem)
+    chave = "cor:" + espaco
+    if chave not in tabela:
+        convertida = cv2.cvtColor(imagem, CONVERSOES[espaco])
+        convertida.flags.writeable = False
+        tabela[chave] = convertida
+    return tabela[chave]
+
+
+def canais_em(imagem, espaco):
+    """
+    @brief Canais de uma imagem BGR em outro espaço de cores (ex.: H, S e V).
+
+    @details
+    Combina converter() e canais(): a conversão é feita uma única vez por imagem e os
+    canais são visões da imagem convertida, sem cópias adicionais.
+
+    @param imagem: Imagem colorida no formato BGR.
+    @param espaco: "bgr", "rgb", "hsv", "lab" ou "cinza".
+    @return Tupla de visões 2D dos canais.
+    """
+    return canais(converter(imagem, espaco))
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+def _recortar(imagens, roi):
+    # Aplica o ROI (x, y, largura, altura) nos dois últimos eixos (linhas, colunas)
+    if roi is None:
+        return imagens
+    x, y, largura, altura = roi
+    return imagens[..., y:y + altura, x:x + largura]
+
+
+def contar_pixels(imagens, roi=None, valor_branco=255):
+    """
+    @brief Conta os pixels brancos e pretos de uma imagem binária ou de um lote, sem laços.
+
+    @details
+    Substitui a contagem pixel a pixel de chapter_five.plotar_manualmente por uma única
+    passada vetorizada do NumPy sobre a imagem inteira (ou sobre o ROI escolhido).
+    Como no capítulo, um pixel é branco se vale `valor_branco` e preto caso contrário.
+
+    A entrada pode ser:
+        - Uma imagem 2D (altura, largura): os valores devolvidos são inteiros/floats.
+        - Um lote 3D (N, altura, largura): os valores devolvidos são arrays com N posições.
+
+    @param imagens: Imagem binária 2D ou lote 3D (np.ndarray).
+    @param roi: Região (x, y, largura, altura) a considerar; None usa a imagem inteira.
+    @param valor_branco: Valor que representa o branco (padrão 255).
+    @return Dicionário com "brancos", "pretos", "total", "fracao_brancos" e "fracao_pretos".
+    """
+    imagens = _recortar(np.asarray(imagens), roi)
+
+    total   = imagens.shape[-2] * imagens.shape[-1]
+    brancos = np.count_nonzero(imagens == valor_branco, axis=(-2, -1))
+    pretos  = total - brancos
+
+    return {
+        "brancos":        brancos,
+        "pretos":         pretos,
+        "total":          total,
+        "fracao_brancos": brancos / total if total else 0.0,
+        "fracao_pretos":  pretos / total if total else 0.0,
+    }
+
+
+def ocupacao_por_bloco(imagens, tamanho_bloco, roi=None, valor_branco=255):
+    """
+    @brief Calcula a fração de pixels brancos em cada bloco de uma grade sobre a imagem.
+
+    @details
+    A imagem é dividida em blocos de `tamanho_bloco` pixels; os blocos da última linha e
+    da última coluna podem ser menores quando as dimensões não são múltiplas do bloco.
+    As somas por bloco são feitas com np.add.reduceat, em uma passada por eixo.
+
+    @param imagens: Imagem binária 2D ou lote 3D (N, altura, largura).
+    @param tamanho_bloco: Lado do bloco em pixels, ou uma tupla (altura, largura).
+    @param roi: Região (x, y, largura, altura) a considerar; None usa a imagem inteira.
+    @param valor_branco: Valor que representa o branco (padrão 255).
+    @return Array (linhas de blocos, colunas de blocos), ou (N, ...) para lotes, com as frações;
+            vazio (0 linhas ou colunas de blocos) se o ROI não tiver pixels.
+    @exception ValueError Se o bloco não tiver lados positivos.
+    """
+    if np.isscalar(tamanho_bloco):
+        tamanho_bloco = (tamanho_bloco, tamanho_bloco)
+    altura_bloco, largura_bloco = tamanho_bloco
+    if altura_bloco < 1 or largura_bloco < 1:
+        raise ValueError(f"O bloco deve ter lados positivos, não {tamanho_bloco}.")
+
+    brancos = _recortar(np.asarray(imagens), roi) == valor_branco
+    altura, largura = brancos.shape[-2:]
+
+    inicio_linhas  = np.arange(0, altura, altura_bloco)
+    inicio_colunas = np.arange(0, largura, largura_bloco)
+
+    # ROI sem pixels: grade vazia (np.add.reduceat não aceita eixos vazios)
+    if altura == 0 or largura == 0:
+        return np.zeros(brancos.shape[:-2] + (inicio_linhas.size, inicio_colunas.size))
+
+    # Soma os brancos de cada faixa de linhas e, em seguida, de cada faixa de colunas
+    contagens = np.add.reduceat(brancos, inicio_linhas, axis=-2, dtype=np.int64)
+    contagens = np.add.reduceat(contagens, inicio_colunas, axis=-1)
+
+    # Área real de cada bloco (os das bordas podem ser menores)
+    alturas  = np.diff(np.append(inicio_linhas, altura))
+    larguras = np.diff(np.append(inicio_colunas, largura))
+
+    return contagens / np.outer(alturas, larguras)
@@ -0,0 +1,160 @@
+import cv2
+import numpy as np
+
+
+class Transformacao:
+    """
+    @brief Sequência de transformações geométricas composta em uma única matriz 3x3.
+
+    @details
+    As operações de chapter_five (rotacionar, transladar, escalonar, ajustar_perspectiva)
+    aplicam uma matriz por vez, e encadeá-las reamostra a imagem a cada passo: cada
+    etapa aloca uma nova imagem e acumula o borramento da interpolação. Aqui as
+    operações apenas multiplicam a matriz acumulada; a imagem é reamostrada uma única
+    vez em aplicar().
+
+    As operações são aplicadas na ordem em que são chamadas. Por exemplo,
+
+        Transformacao().rotacionar(90, centro).transladar(100, 100)
+
+    rotaciona a imagem e depois a desloca, como chamar rotacionar e transladar em sequência.
+    Coordenadas seguem o OpenCV: x para a direita (colunas) e y para baixo (linhas).
+
+    @param matriz: Matriz inicial 3x3 (ou 2x3 afim); None começa pela identidade.
+    """
+
+    def __init__(self, matriz=None):
+        self.matriz = np.eye(3) if matriz is None else _para_3x3(matriz)
+
+    def compor(self, matriz):
+        """
+        @brief Acrescenta uma matriz 3x3 (ou 2x3) ao final da sequência.
+
+        @return A própria transformação, para permitir encadear chamadas.
+        """
+        self.matriz = _para_3x3(matriz) @ self.matriz
+        return self
+
+    def rotacionar(self, angulo, centro=(0, 0), escala=1.0):
+        """
+        @brief Rotação em graus (sentido anti-horário, como cv2.getRotationMatrix2D).
+
+        @param angulo: Ângulo em graus; negativo gira no sentido horário.
+        @param centro: Ponto (x, y) em torno do qual a imagem gira.
+        @param escala: Fator de escala isotrópico aplicado junto com a rotação.
+        """
+        return self.compor(cv2.getRotationMatrix2D(tuple(map(float, centro)), angulo, escala))
+
+    def transladar(self, dx, dy):
+        """
+        @brief Deslocamento de dx pixels no eixo X e dy pixels no eixo Y.
+        """
+        return self.compor([[1, 0, dx], [0, 1, dy]])
+
+    def escalonar(self, fx, fy=None, centro=(0, 0)):
+        """
+        @brief Mudança de escala em relação a um ponto (padrão: origem, como cv2.resize).
+
+        @param fx: Fator no eixo X.
+        @param fy: Fator no eixo Y (padrão: igual a fx).
+        @param centro: Ponto (x, y) que permanece fixo.
+        """
+        fy = fx if fy is None else fy
+        cx, cy = centro
+        return self.compor([[fx, 0, cx - fx * cx], [0, fy, cy - fy * cy]])
+
+    def perspectiva(self, pontos_iniciais, pontos_finais):
+        """
+        @brief Transformação de perspectiva que leva 4 pontos a outros 4 (cv2.getPerspectiveTransform).
+        """
+        return self.compor(cv2.getPerspectiveTransform(
+            np.float32(pontos_iniciais), np.float32(pontos_finais)
+        ))
+
+    def inversa(self):
+        """
+        @brief Nova transformação que desfaz esta.
+        """
+        return Transformacao(np.linalg.inv(self.matriz))
+
+    @property
+    def afim(self):
+        """
+        @brief True se a matriz não tem componente de perspectiva (última linha [0, 0, 1]).
+        """
+        return np.allclose(self.matriz[2], [0, 0, 1])
+
+    def aplicar(self, imagem, tamanho_saida=None, interpolacao=cv2.INTER_LINEAR,
+                borda=cv2.BORDER_CONSTANT, destino=None):
+        """
+        @brief Reamostra a imagem uma única vez com a matriz acumulada.
+
+        @details
+        Usa cv2.warpAffine quando a transformação é afim e cv2.warpPerspective caso contrário.
+
+        @param imagem: Imagem de entrada (np.ndarray).
+        @param tamanho_saida: Tamanho (largura, altura) da saída; padrão: o da entrada.
+        @param interpolacao: Interpolação do OpenCV (ex.: cv2.INTER_CUBIC).
+        @param borda: Tratamento das bordas (padrão: preenche com preto).
+        @param destino: Array de saída pré-alocado, com a forma e o tipo do resultado;
+                        é preenchido no lugar e devolvido.
+        @return Imagem transformada.
+        """
+        if tamanho_saida is None:
+            tamanho_saida = (imagem.shape[1], imagem.shape[0])
+
+        if self.afim:
+            return cv2.warpAffine(imagem, self.matriz[:2], tamanho_saida, dst=destino,
+                                  flags=interpolacao, borderMode=borda)
+        return cv2.warpPerspective(imagem, self.matriz, tamanho_saida, dst=destino,
+                                   flags=interpolacao, borderMode=borda)
+
+    def aplicar_lote(self, imagens, tamanho_saida=None, interpolacao=cv2.INTER_LINEAR,
+                     borda=cv2.BORDER_CONSTANT, destino=None):
+        """
+        @brief Aplica a mesma transformação a um lote de imagens ou quadros do mesmo tamanho.
+
+        @details
+        O resultado é escrito em um único array contínuo (N, altura, largura[, canais]),
+        alocado uma vez para o lote inteiro ou fornecido pelo chamador em `destino`, o que
+        permite reutilizar o mesmo buffer a cada lote de quadros.
+
+        @param imagens: Array (N, altura, largura[, canais]) ou lista de imagens.
+        @param tamanho_saida: Tamanho (largura, altura) da saída; padrão: o da entrada.
+        @param interpolacao: Interpolação do OpenCV.
+        @param borda: Tratamento das bordas.
+        @param destino: Array (N, altura_saida, largura_saida[, canais]) pré-alocado.
+        @return Array com as imagens transformadas.
+        @exception ValueError Se o lote for uma lista vazia sem `destino` (a forma da
+                   saída não pode ser deduzida).
+        """
+        if len(imagens) == 0:
+            # Um array vazio ainda informa a forma dos quadros; uma lista vazia, não
+            if destino is not None:
+                return destino
+            if not isinstance(imagens, np.ndarray):
+                raise ValueError("Lote vazio: forneça um array (0, altura, largura[, canais]) ou `destino`.")
+            largura, altura = tamanho_saida or (imagens.shape[2], imagens.shape[1])
+            return np.empty((0, altura, largura) + imagens.shape[3:], dtype=imagens.dtype)
+
+        primeira = imagens[0]
+        if tamanho_saida is None:
+            tamanho_saida = (primeira.shape[1], primeira.shape[0])
+        largura, altura = tamanho_saida
+
+        if destino is None:
+            destino = np.empty((len(imagens), altura, largura) + primeira.shape[2:], dtype=primeira.dtype)
+
+        for imagem, saida in zip(imagens, destino):
+            self.aplicar(imagem, tamanho_saida, interpolacao, borda, destino=saida)
+        return destino
+
+
+def _para_3x3(matriz):
+    # Completa matrizes afins 2x3 com a linha [0, 0, 1]
+    matriz = np.asarray(matriz, dtype=np.float64)
+    if matriz.shape == (2, 3):
+        matriz = np.vstack([matriz, [0, 0, 1]])
+    if matriz.shape != (3, 3):
+        raise ValueError(f"A matriz deve ser 2x3 ou 3x3, recebida {matriz.shape}.")
+    return matriz
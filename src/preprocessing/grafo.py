@@ -0,0 +1,160 @@
+"""
+@brief Grafo de operações avaliado sob demanda.
+
+@details
+As etapas são declaradas antes de qualquer processamento e só são executadas quando
+uma saída é pedida. Etapas compartilhadas (ex.: um mesmo desfoque alimentando Sobel
+e Canny) são calculadas uma única vez, e cada resultado intermediário é liberado assim
+que a última etapa que depende dele termina.
+
+Exemplo (desaguçamento de chapter_seven com Canny sobre o mesmo desfoque):
+
+    grafo     = Grafo()
+    imagem    = grafo.entrada("imagem")
+    suavizada = grafo.etapa(cv2.GaussianBlur, imagem, (13, 13), 3)
+    detalhes  = grafo.etapa(cv2.subtract, imagem, suavizada)
+    realçada  = grafo.etapa(cv2.addWeighted, imagem, 1, detalhes, 3, 0)
+    bordas    = grafo.etapa(cv2.Canny, suavizada, 100, 200)
+
+    realçada, bordas = grafo.executar({"imagem": imagem_cinza}, [realçada, bordas])
+"""
+
+
+class Etapa:
+    """
+    @brief Uma etapa do grafo: uma função e os argumentos com que será chamada.
+
+    @details
+    Argumentos que forem outras etapas são substituídos pelos seus resultados no momento
+    da execução; os demais são repassados como estão. Etapas de entrada não têm função
+    e recebem o valor fornecido em Grafo.executar().
+    """
+
+    def __init__(self, funcao, argumentos, parametros, nome):
+        self.funcao     = funcao
+        self.argumentos = argumentos
+        self.parametros = parametros
+        self.nome       = nome
+
+    @property
+    def dependencias(self):
+        """
+        @brief Etapas das quais esta etapa depende, sem repetições e na ordem dos argumentos.
+        """
+        vistas = []
+        for valor in (*self.argumentos, *self.parametros.values()):
+            if isinstance(valor, Etapa) and valor not in vistas:
+                vistas.append(valor)
+        return vistas
+
+    def __repr__(self):
+        return f"Etapa({self.nome})"
+
+
+class Grafo:
+    """
+    @brief Conjunto de etapas encadeadas, executado de forma preguiçosa.
+    """
+
+    def __init__(self):
+        self.etapas = []
+
+    def entrada(self, nome):
+        """
+        @brief Declara uma entrada do grafo.
+
+        @param nome: Chave usada para fornecer o valor em executar().
+        @return A etapa de entrada.
+        """
+        etapa = Etapa(None, (), {}, nome)
+        self.etapas.append(etapa)
+        return etapa
+
+    def etapa(self, funcao, *argumentos, nome=None, **parametros):
+        """
+        @brief Declara uma etapa sem executá-la.
+
+        @param funcao: Função chamada com os argumentos resolvidos.
+        @param argumentos: Argumentos posicionais; etapas são trocadas pelos seus resultados.
+        @param nome: Nome opcional para depuração (padrão: nome da função).
+        @param parametros: Argumentos nomeados; etapas também são resolvidas.
+        @return A nova etapa.
+        """
+        etapa = Etapa(funcao, argumentos, parametros, nome or getattr(funcao, "__name__", "etapa"))
+        self.etapas.append(etapa)
+        return etapa
+
+    @staticmethod
+    def _ordenar(saidas):
+        # Ordem topológica (pós-ordem) apenas das etapas necessárias para as saídas. A busca
+        # usa uma pilha explícita para que cadeias longas não esbarrem no limite de recursão
+        ordem = []
+        visitadas = set()
+
+        for saida in saidas:
+            if saida in visitadas:
+                continue
+            visitadas.add(saida)
+            pilha = [(saida, iter(saida.dependencias))]
+            while pilha:
+                etapa, pendentes = pilha[-1]
+                for dependencia in pendentes:
+                    if dependencia not in visitadas:
+                        visitadas.add(dependencia)
+                        pilha.append((dependencia, iter(dependencia.dependencias)))
+                        break
+                else:
+                    pilha.pop()
+                    ordem.append(etapa)
+        return ordem
+
+    def executar(self, entradas, saidas):
+        """
+        @brief Calcula as saídas pedidas, executando apenas as etapas necessárias.
+
+        @details
+        Cada etapa é executada no máximo uma vez. Um contador de consumidores é mantido
+        para cada resultado intermediário; quando chega a zero, o resultado é descartado,
+        o que limita o pico de memória ao conjunto de imagens ainda necessárias.
+
+        @param entradas: Dicionário {nome da entrada: valor}.
+        @param saidas: Uma etapa ou uma lista de etapas.
+        @return O resultado da etapa, ou a lista de resultados na mesma ordem de `saidas`.
+        @exception KeyError Se uma entrada necessária não for fornecida.
+        """
+        unica = isinstance(saidas, Etapa)
+        if unica:
+            saidas = [saidas]
+
+        ordem = self._ordenar(saidas)
+
+        # Quantas etapas ainda precisam de cada resultado
+        consumidores = {etapa: 0 for etapa in ordem}
+        for etapa in ordem:
+            for dependencia in etapa.dependencias:
+                consumidores[dependencia] += 1
+
+        manter = set(saidas)
+        valores = {}
+
+        for etapa in ordem:
+            if etapa.funcao is None:
+                if etapa.nome not in entradas:
+                    raise KeyError(f"Entrada não fornecida: {etapa.nome}")
+                valores[etapa] = entradas[etapa.nome]
+            else:
+                argumentos = [valores[a] if isinstance(a, Etapa) else a for a in etapa.argumentos]
+                parametros = {
+                    chave: valores[v] if isinstance(v, Etapa) else v
+                    for chave, v in etapa.parametros.items()
+                }
+                valores[etapa] = etapa.funcao(*argumentos, **parametros)
+
+            # Libera os intermediários que não têm mais consumidores
+            for dependencia in etapa.dependencias:
+                consumidores[dependencia] -= 1
+                if consumidores[dependencia] == 0 and dependencia not in manter:
+                    del valores[dependencia]
+
+        resultados = [valores[saida] for saida in saidas]
+        return resultados[0] if unica else resultados
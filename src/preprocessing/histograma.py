@@ -0,0 +1,201 @@
+import cv2
+import numpy as np
+
+from src.preprocessing.cores import canais
+from src.utils.cache_de_imagem import derivadas
+
+
+def _contar(imagem):
+    # 256 contagens por canal; calcHist lê as fatias sem achatar a imagem
+    return np.stack([
+        cv2.calcHist([canal], [0], None, [256], [0, 256]).ravel()
+        for canal in canais(imagem)
+    ]).astype(np.int64)
+
+
+class Histograma:
+    """
+    @brief Histograma de 256 faixas por canal, calculado uma vez e reutilizado.
+
+    @details
+    As contagens são obtidas com cv2.calcHist em uma passada por canal. A partir delas
+    são servidos, sem voltar a ler a imagem: a função de distribuição acumulada (CDF),
+    a tabela de equalização, estatísticas resumidas e o gráfico do histograma.
+
+    Para vídeo, atualizar() e remover() somam ou subtraem as contagens de um quadro,
+    o que mantém o histograma de uma janela de quadros sem recalculá-la por inteiro.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou colorida (BGR); None cria um
+                   histograma vazio com `canais` canais, para ser preenchido com atualizar().
+    @param canais: Número de canais do histograma vazio (usado apenas com imagem=None).
+    """
+
+    def __init__(self, imagem=None, canais=1):
+        if imagem is None:
+            self.contagens = np.zeros((canais, 256), dtype=np.int64)
+        else:
+            self.contagens = _contar(imagem)
+
+    @property
+    def total(self):
+        """
+        @brief Quantidade de pixels contados em cada canal.
+        """
+        return self.contagens[0].sum()
+
+    def atualizar(self, quadro):
+        """
+        @brief Soma as contagens de um novo quadro ao histograma.
+        """
+        self.contagens += _contar(quadro)
+        return self
+
+    def remover(self, quadro):
+        """
+        @brief Subtrai as contagens de um quadro que saiu da janela.
+        """
+        self.contagens -= _contar(quadro)
+        return self
+
+    def cdf(self, normalizada=True):
+        """
+        @brief Função de distribuição acumulada de cada canal.
+
+        @param normalizada: Se True, os valores vão de 0 a 1; senão são contagens acumuladas.
+        @return Array (canais, 256).
+        """
+        acumulada = np.cumsum(self.contagens, axis=1)
+        if normalizada:
+            return acumulada / np.maximum(acumulada[:, -1:], 1)
+        return acumulada
+
+    def lut_equalizacao(self):
+        """
+        @brief Tabela de consulta (LUT) que equaliza cada canal.
+
+        @details
+        Segue a mesma fórmula de cv2.equalizeHist: as intensidades são remapeadas pela CDF,
+        descontando a primeira faixa ocupada, e escaladas para 0–255. Aplicar a tabela com
+        cv2.LUT dá o mesmo resultado de cv2.equalizeHist sem recalcular o histograma.
+
+        @return Array uint8 (canais, 256).
+        """
+        tabelas = np.zeros(self.contagens.shape, dtype=np.uint8)
+
+        for canal, contagens in enumerate(self.contagens):
+            ocupadas = np.flatnonzero(contagens)
+            if ocupadas.size == 0:
+                continue
+            primeira = ocupadas[0]
+            total = contagens.sum()
+
+            # Imagem de um único tom: o OpenCV mantém o próprio valor
+            if contagens[primeira] == total:
+                tabelas[canal] = primeira
+                continue
+
+            # Escala e produtos em float32, como no OpenCV: em float64 o arredondamento
+            # difere em 1 nível quando o produto cai perto de x,5
+            escala = np.float32(255) / np.float32(total - contagens[primeira])
+            acumulada = (np.cumsum(contagens) - contagens[primeira]).astype(np.float32)
+            tabela = np.rint(acumulada * escala)
+            tabela[:primeira + 1] = 0
+            tabelas[canal] = np.clip(tabela, 0, 255)
+
+        return tabelas
+
+    def equalizar(self, imagem):
+        """
+        @brief Equaliza a imagem a partir deste histograma (equivalente a cv2.equalizeHist).
+
+        @param imagem: A mesma imagem usada para calcular o histograma.
+        @return Imagem equalizada, com um único passo de cv2.LUT por canal.
+        """
+        tabelas = self.lut_equalizacao()
+        if imagem.ndim == 2:
+            return cv2.LUT(imagem, tabelas[0])
+        return cv2.merge([cv2.LUT(canal, tabela) for canal, tabela in zip(canais(imagem), tabelas)])
+
+    def estatisticas(self):
+        """
+        @brief Estatísticas de cada canal calculadas apenas a partir das contagens.
+
+        @return Dicionário com arrays (um valor por canal) para "media", "desvio_padrao",
+                "minimo", "maximo" e "mediana".
+        """
+        intensidades = np.arange(256)
+        total = np.maximum(self.contagens.sum(axis=1), 1)
+
+        media = self.contagens @ intensidades / total
+        variancia = self.contagens @ (intensidades ** 2) / total - media ** 2
+
+        ocupadas = self.contagens > 0
+        minimo = np.argmax(ocupadas, axis=1)
+        maximo = 255 - np.argmax(ocupadas[:, ::-1], axis=1)
+        mediana = np.argmax(self.cdf() >= 0.5, axis=1)
+
+        return {
+            "media":         media,
+            "desvio_padrao": np.sqrt(np.maximum(variancia, 0)),
+            "minimo":        minimo,
+            "maximo":        maximo,
+            "mediana":       mediana,
+        }
+
+    def plotar(self, titulo="Histograma", nomes_canais=None, somar_canais=False):
+        """
+        @brief Plota o histograma com matplotlib a partir das contagens já calculadas.
+
+        @details
+        Usa plt.stairs sobre as 256 faixas, em vez de plt.hist(imagem.ravel(), ...), que
+        achataria e reagruparia todos os pixels novamente. Cada canal é desenhado em
+        uma figura própria, como em chapter_five.plotar_colorido.
+
+        @param titulo: Título do gráfico (o nome do canal é acrescentado quando houver mais de um).
+        @param nomes_canais: Nomes dos canais; padrão B, G, R para imagens coloridas.
+        @param somar_canais: Se True, desenha uma única curva com a soma dos canais (como
+                             plt.hist sobre a imagem colorida achatada).
+        @return Nenhum valor é retornado; chame plt.show() para exibir.
+        """
+        import matplotlib.pyplot as plt
+
+        contagens_por_canal = self.contagens
+        if somar_canais:
+            contagens_por_canal, nomes_canais = self.contagens.sum(axis=0, keepdims=True), [""]
+        elif nomes_canais is None:
+            nomes_canais = ["B", "G", "R"] if len(self.contagens) == 3 else [""] * len(self.contagens)
+
+        for indice, (contagens, nome) in enumerate(zip(contagens_por_canal, nomes_canais)):
+            if indice > 0:
+                plt.figure()
+            plt.stairs(contagens, np.arange(257), fill=True)
+            plt.title(f"{titulo} {nome}".strip())
+            plt.xlabel("Intensidade (0 a 255)")
+            plt.ylabel("Quantidade de pixels")
+            plt.grid(True)
+
+
+def histograma(imagem):
+    """
+    @brief Devolve o histograma da imagem, calculando-o apenas na primeira chamada.
+
+    @details
+    O resultado fica guardado nas representações derivadas da imagem
+    (src.utils.cache_de_imagem) e é descartado junto com ela. Só imagens somente leitura
+    (como as de ler_imagem) são guardadas; imagens graváveis têm o histograma calculado
+    a cada chamada.
+
+    @param imagem: Imagem de 8 bits (np.ndarray).
+    @return Instância de Histograma compartilhada entre as chamadas.
+    """
+    tabela = derivadas(imagem)
+    if "histograma" not in tabela:
+        tabela["histograma"] = Histograma(imagem)
+    return tabela["histograma"]
+
+
+def invalidar_histograma(imagem):
+    """
+    @brief Remove do cache o histograma de uma imagem modificada no lugar.
+    """
+    derivadas(imagem).pop("histograma", None)
@@ -0,0 +1,348 @@
+"""
+@brief Limiarização automática (Otsu, triângulo, multi-Otsu) e adaptativa por imagem integral.
+
+@details
+Os limiares globais são escolhidos a partir do histograma de 256 faixas da imagem
+(src.preprocessing.histograma), calculado uma única vez por imagem: pedir o limiar de
+Otsu e depois o do triângulo, ou binarizar de novo a mesma imagem, não volta a ler os pixels.
+
+A limiarização adaptativa compara cada pixel com estatísticas da sua vizinhança
+(média, ou média e desvio padrão no método de Sauvola). As somas de cada janela vêm de
+uma imagem integral, com 4 acessos por pixel qualquer que seja o tamanho da janela. A
+imagem é processada em faixas de linhas, para que as imagens integrais (int32/float64)
+ocupem pouca memória mesmo em imagens grandes.
+
+Exemplo:
+
+    binaria  = binarizar(imagem_cinza, "otsu")
+    limiar   = limiar_otsu(histograma(imagem_cinza).contagens[0])   # recebe o histograma, não a imagem
+    classes  = multi_limiarizar(imagem_cinza, classes=3)
+    texto    = limiar_adaptativo(imagem_cinza, tamanho=31, metodo="sauvola")
+    por_quadro = LimiarDeVideo("otsu", janela=30)   # operação para processar_video
+"""
+from collections import deque
+
+import cv2
+import numpy as np
+
+from src.preprocessing.cores import converter
+from src.preprocessing.histograma import Histograma, histograma
+
+METODOS_GLOBAIS = ("otsu", "triangulo")
+METODOS_ADAPTATIVOS = ("media", "sauvola", "niblack")
+
+# Linhas de cada faixa da limiarização adaptativa (sem contar as margens da janela)
+_LINHAS_POR_FAIXA = 256
+
+
+def _validar_contagens(contagens, dtype):
+    # As funções de limiar recebem um histograma; uma imagem aqui daria um erro de
+    # broadcasting pouco claro (ou um limiar sem sentido, se fosse uma única linha)
+    contagens = np.asarray(contagens)
+    if contagens.ndim != 1 or contagens.size == 0:
+        raise ValueError(f"Esperado um histograma 1D (contagem de cada valor), recebido um array de forma "
+                         f"{contagens.shape}. Para uma imagem, use limiar_global(imagem, metodo) ou "
+                         f"histograma(imagem).contagens[canal].")
+    return contagens.astype(dtype, copy=False)
+
+
+def limiar_otsu(contagens):
+    """
+    @brief Limiar de Otsu de um histograma com qualquer número de faixas.
+
+    @param contagens: Contagem de cada valor inteiro 0, 1, ..., n-1 (array 1D).
+    @return Maior valor da classe inferior (maximiza a variância entre as classes). Com
+            menos de dois valores ocupados (ex.: imagem uniforme) não há duas classes a
+            separar e o limiar é 0, como em cv2.THRESH_OTSU.
+    @exception ValueError: Se `contagens` não for um histograma 1D (ex.: uma imagem).
+    """
+    contagens = _validar_contagens(contagens, np.float64)
+    if np.count_nonzero(contagens) < 2:
+        return 0
+    valores = np.arange(len(contagens))
+
+    peso_inferior = np.cumsum(contagens)
+    peso_superior = peso_inferior[-1] - peso_inferior
+    soma_inferior = np.cumsum(contagens * valores)
+    soma_superior = soma_inferior[-1] - soma_inferior
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        media_inferior = soma_inferior / peso_inferior
+        media_superior = soma_superior / peso_superior
+        variancia = peso_inferior * peso_superior * (media_inferior - media_superior) ** 2
+    return int(np.nanargmax(variancia))
+
+
+def limiar_triangulo(contagens):
+    """
+    @brief Limiar do triângulo (Zack et al.), o mesmo de cv2.THRESH_TRIANGLE.
+
+    @details
+    Traça a reta do pico do histograma até a ponta da cauda mais longa e escolhe o valor
+    do histograma mais distante dela. Funciona bem quando o objeto ocupa poucos pixels e o
+    histograma tem um único pico (ex.: texto escuro sobre papel).
+
+    @param contagens: Contagem de cada valor inteiro 0, 1, ..., n-1 (array 1D).
+    @return Maior valor da classe inferior.
+    @exception ValueError: Se `contagens` não for um histograma 1D (ex.: uma imagem).
+    """
+    contagens = _validar_contagens(contagens, np.int64)
+    ultimo = len(contagens) - 1
+    ocupadas = np.flatnonzero(contagens)
+    if ocupadas.size == 0:
+        return 0
+
+    esquerda = max(ocupadas[0] - 1, 0)
+    direita = min(ocupadas[-1] + 1, ultimo)
+    pico = int(np.argmax(contagens))
+
+    # A cauda mais longa é sempre tratada como a da esquerda
+    invertido = pico - esquerda < direita - pico
+    if invertido:
+        contagens = contagens[::-1]
+        esquerda, pico = ultimo - direita, ultimo - pico
+
+    indices = np.arange(esquerda + 1, pico + 1)
+    distancias = contagens[pico] * indices + (esquerda - pico) * contagens[indices]
+    limiar = esquerda
+    if indices.size and distancias.max() > 0:
+        limiar = int(indices[np.argmax(distancias)])
+    limiar -= 1
+    return ultimo - limiar if invertido else limiar
+
+
+def limiares_multi_otsu(contagens, classes=3):
+    """
+    @brief Limiares que dividem o histograma em `classes` classes com máxima variância entre elas.
+
+    @details
+    Generalização de Otsu por programação dinâmica sobre o histograma: para cada número de
+    classes e cada último valor, guarda a melhor divisão dos valores anteriores. O custo é
+    O(classes · faixas²), independente do número de pixels.
+
+    @param contagens: Contagem de cada valor inteiro 0, 1, ..., n-1 (array 1D).
+    @param classes: Número de classes (2 dá o limiar de Otsu).
+    @return Lista crescente com `classes` - 1 limiares; a classe k tem os valores
+            (limiares[k-1], limiares[k]].
+    @exception ValueError: Se `contagens` não for um histograma 1D ou `classes` for inválido.
+    """
+    contagens = _validar_contagens(contagens, np.float64)
+    faixas = len(contagens)
+    if not 2 <= classes <= faixas:
+        raise ValueError(f"O número de classes deve estar entre 2 e {faixas}.")
+
+    peso = np.concatenate(([0.0], np.cumsum(contagens)))
+    soma = np.concatenate(([0.0], np.cumsum(contagens * np.arange(faixas))))
+
+    # merito[i, j] = (soma dos valores i..j)² / (pixels em i..j): parcela da classe na variância
+    inicio, fim = np.triu_indices(faixas)
+    merito = np.full((faixas, faixas), -np.inf)
+    pesos = peso[fim + 1] - peso[inicio]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        merito[inicio, fim] = np.where(pesos > 0, (soma[fim + 1] - soma[inicio]) ** 2 / pesos, 0.0)
+
+    # melhor[j] = maior mérito dividindo os valores 0..j nas classes já colocadas
+    melhor = merito[0].copy()
+    escolhas = []
+    for _ in range(classes - 1):
+        # candidato[i, j]: as classes anteriores terminam em i e a nova vai de i + 1 a j
+        candidato = melhor[:-1, None] + merito[1:, :]
+        escolha = np.argmax(candidato, axis=0)
+        melhor = np.concatenate(([-np.inf], candidato[escolha[1:], np.arange(1, faixas)]))
+        escolhas.append(escolha)
+
+    limiares = []
+    ultimo = faixas - 1
+    for escolha in reversed(escolhas):
+        ultimo = int(escolha[ultimo])
+        limiares.append(ultimo)
+    return limiares[::-1]
+
+
+def _limiar_das_contagens(contagens, metodo):
+    if metodo == "otsu":
+        return limiar_otsu(contagens)
+    if metodo == "triangulo":
+        return limiar_triangulo(contagens)
+    raise ValueError(f"Método de limiar desconhecido: {metodo}. Disponíveis: {', '.join(METODOS_GLOBAIS)}")
+
+
+def _cinza(imagem):
+    # Canal único de 8 bits; imagens BGR usam a conversão guardada por imagem
+    if imagem.ndim == 3 and imagem.shape[2] == 3:
+        return converter(imagem, "cinza")
+    return imagem
+
+
+def limiar_global(imagem, metodo="otsu"):
+    """
+    @brief Limiar automático da imagem, a partir do seu histograma guardado.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR (convertida para cinza).
+    @param metodo: "otsu" ou "triangulo".
+    @return Limiar (pixels maiores que ele pertencem ao objeto).
+    """
+    return _limiar_das_contagens(histograma(_cinza(imagem)).contagens[0], metodo)
+
+
+def binarizar(imagem, limiar="otsu", invertido=False, destino=None):
+    """
+    @brief Binariza a imagem com um limiar fixo ou automático (0 ou 255, como cv2.THRESH_BINARY).
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR (convertida para cinza).
+    @param limiar: Valor do limiar ou o nome do método ("otsu", "triangulo").
+    @param invertido: True deixa em branco os pixels menores ou iguais ao limiar.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem binária uint8.
+    """
+    cinza = _cinza(imagem)
+    if isinstance(limiar, str):
+        limiar = limiar_global(cinza, limiar)
+    tipo = cv2.THRESH_BINARY_INV if invertido else cv2.THRESH_BINARY
+    return cv2.threshold(cinza, limiar, 255, tipo, dst=destino)[1]
+
+
+def multi_limiarizar(imagem, classes=3, niveis=None):
+    """
+    @brief Separa a imagem em várias classes de intensidade com os limiares de multi-Otsu.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR (convertida para cinza).
+    @param classes: Número de classes.
+    @param niveis: Valor de saída de cada classe; None espalha as classes de 0 a 255.
+    @return Imagem uint8 com o valor da classe de cada pixel (uma única passada de cv2.LUT).
+    """
+    cinza = _cinza(imagem)
+    limiares = limiares_multi_otsu(histograma(cinza).contagens[0], classes)
+    if niveis is None:
+        niveis = np.linspace(0, 255, classes).round()
+
+    classe = np.searchsorted(limiares, np.arange(256), side="left")
+    return cv2.LUT(cinza, np.asarray(niveis, dtype=np.uint8)[classe])
+
+
+def limiar_adaptativo(imagem, tamanho=31, c=5, metodo="media", k=0.2, alcance=128, invertido=False,
+                      linhas_por_faixa=_LINHAS_POR_FAIXA, destino=None):
+    """
+    @brief Limiarização adaptativa com somas de janela por imagem integral.
+
+    @details
+    O limiar de cada pixel depende da janela tamanho x tamanho ao seu redor (bordas
+    replicadas, como em cv2.adaptiveThreshold):
+        - "media":   T = média - c. É o ADAPTIVE_THRESH_MEAN_C do OpenCV, que já calcula
+                     as médias com custo constante, e por isso é usado diretamente;
+        - "sauvola": T = média · (1 + k · (desvio / alcance - 1)), bom para documentos
+                     com iluminação irregular;
+        - "niblack": T = média + k · desvio - c.
+    Em "sauvola" e "niblack" a soma e a soma dos quadrados de cada janela vêm de imagens
+    integrais exatas (int32 e float64). O custo por pixel não depende de `tamanho`.
+
+    @param imagem: Imagem de 8 bits em tons de cinza ou BGR (convertida para cinza).
+    @param tamanho: Lado da janela (ímpar).
+    @param c: Constante subtraída do limiar ("media" e "niblack").
+    @param metodo: "media", "sauvola" ou "niblack".
+    @param k: Peso do desvio padrão ("sauvola" e "niblack").
+    @param alcance: Faixa dinâmica do desvio padrão no método de Sauvola (R = 128 em 8 bits).
+    @param invertido: True deixa em branco os pixels menores ou iguais ao limiar.
+    @param linhas_por_faixa: Linhas processadas de cada vez (limita a memória das integrais).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem binária uint8 (0 ou 255).
+    """
+    if metodo not in METODOS_ADAPTATIVOS:
+        raise ValueError(f"Método desconhecido: {metodo}. Disponíveis: {', '.join(METODOS_ADAPTATIVOS)}")
+    if tamanho % 2 == 0 or tamanho < 3:
+        raise ValueError("O tamanho da janela deve ser ímpar e maior que 1.")
+
+    cinza = _cinza(imagem)
+    if metodo == "media":
+        tipo = cv2.THRESH_BINARY_INV if invertido else cv2.THRESH_BINARY
+        return cv2.adaptiveThreshold(cinza, 255, cv2.ADAPTIVE_THRESH_MEAN_C, tipo, tamanho, c, dst=destino)
+
+    altura, largura = cinza.shape
+    raio = tamanho // 2
+    area = float(tamanho * tamanho)
+    estendida = cv2.copyMakeBorder(cinza, raio, raio, raio, raio, cv2.BORDER_REPLICATE)
+    saida = np.empty_like(cinza) if destino is None else destino
+
+    for y0 in range(0, altura, linhas_por_faixa):
+        y1 = min(y0 + linhas_por_faixa, altura)
+        faixa = estendida[y0:y1 + 2 * raio]
+
+        # Somas de cada janela: 4 acessos a cada imagem integral
+        integral, quadrados = cv2.integral2(faixa, sdepth=cv2.CV_32S, sqdepth=cv2.CV_64F)
+        soma = (integral[tamanho:, tamanho:] - integral[tamanho:, :largura]
+                - integral[:y1 - y0, tamanho:] + integral[:y1 - y0, :largura])
+        soma_quadrados = (quadrados[tamanho:, tamanho:] - quadrados[tamanho:, :largura]
+                          - quadrados[:y1 - y0, tamanho:] + quadrados[:y1 - y0, :largura])
+
+        media = soma / area
+        desvio = np.sqrt(np.maximum(soma_quadrados / area - media ** 2, 0))
+        if metodo == "sauvola":
+            limiar = media * (1 + k * (desvio / alcance - 1))
+        else:
+            limiar = media + k * desvio - c
+
+        ativos = cinza[y0:y1] > limiar
+        if invertido:
+            ativos = ~ativos
+        np.multiply(ativos, np.uint8(255), out=saida[y0:y1], casting="unsafe")
+    return saida
+
+
+def limiarizar_lote(imagens, limiar="otsu", compartilhado=False, invertido=False):
+    """
+    @brief Binariza uma sequência de imagens com limiares automáticos.
+
+    @param imagens: Sequência de imagens de 8 bits (cinza ou BGR).
+    @param limiar: Valor fixo ou método ("otsu", "triangulo").
+    @param compartilhado: True usa um único limiar, calculado do histograma somado de todas
+                          as imagens (mesma iluminação em todo o lote); False calcula um
+                          limiar por imagem.
+    @param invertido: True deixa em branco os pixels menores ou iguais ao limiar.
+    @return Lista de imagens binárias.
+    """
+    cinzas = [_cinza(imagem) for imagem in imagens]
+    if compartilhado and isinstance(limiar, str):
+        total = Histograma()
+        for cinza in cinzas:
+            total.contagens += histograma(cinza).contagens
+        limiar = _limiar_das_contagens(total.contagens[0], limiar)
+    return [binarizar(cinza, limiar, invertido) for cinza in cinzas]
+
+
+class LimiarDeVideo:
+    """
+    @brief Binarização de quadros de vídeo com limiar automático sobre uma janela de quadros.
+
+    @details
+    O limiar vem do histograma somado dos últimos `janela` quadros, atualizado a cada quadro
+    somando as contagens do quadro novo e subtraindo as do que saiu (custo O(256) por
+    quadro, sem reler quadros antigos). Assim o limiar acompanha mudanças lentas de
+    iluminação sem oscilar de um quadro para o outro. Uma instância é uma operação que
+    pode ser passada a src.preprocessing.video.processar_video com um único trabalhador
+    (o estado depende da ordem dos quadros).
+
+    @param metodo: "otsu" ou "triangulo".
+    @param janela: Número de quadros considerados no histograma.
+    @param invertido: True deixa em branco os pixels menores ou iguais ao limiar.
+    """
+
+    def __init__(self, metodo="otsu", janela=30, invertido=False):
+        if metodo not in METODOS_GLOBAIS:
+            raise ValueError(f"Método de limiar desconhecido: {metodo}. Disponíveis: {', '.join(METODOS_GLOBAIS)}")
+        self.metodo = metodo
+        self.janela = janela
+        self.invertido = invertido
+        self.histograma = Histograma()
+        self._contagens = deque()
+        self.limiar = None
+
+    def __call__(self, quadro):
+        cinza = _cinza(quadro)
+        contagens = Histograma(cinza).contagens
+        self.histograma.contagens += contagens
+        self._contagens.append(contagens)
+        if len(self._contagens) > self.janela:
+            self.histograma.contagens -= self._contagens.popleft()
+
+        self.limiar = _limiar_das_contagens(self.histograma.contagens[0], self.metodo)
+        return binarizar(cinza, self.limiar, self.invertido)
@@ -0,0 +1,129 @@
+"""
+@brief Execução em lote, sem janelas, de uma operação sobre muitas imagens.
+
+@details
+Os capítulos abrem uma imagem fixa e mostram o resultado em janelas. Aqui a mesma
+operação do registro (src.preprocessing.operacoes) é aplicada a um diretório, padrão
+glob ou arquivo, com cada imagem lida, processada e gravada em um processo separado.
+
+Exemplo (linha de comando):
+
+    python -m src.preprocessing.lote "data/raw/*.jpg" canny --destino data/processed
+"""
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from src.preprocessing.operacoes import obter_operacao
+
+# Extensões reconhecidas quando a entrada é um diretório
+EXTENSOES_IMAGEM = (".bmp", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp")
+
+
+def listar_entradas(entrada):
+    """
+    @brief Expande a entrada do lote em uma lista ordenada de arquivos de imagem.
+
+    @details
+    A entrada pode ser um diretório (todas as imagens dentro dele), um padrão glob
+    (ex.: "data/raw/*.jpg") ou o caminho de um único arquivo.
+
+    @param entrada: Diretório, padrão glob ou arquivo.
+    @return Lista ordenada de caminhos.
+    """
+    if os.path.isdir(entrada):
+        return sorted(
+            os.path.join(entrada, nome)
+            for nome in os.listdir(entrada)
+            if nome.lower().endswith(EXTENSOES_IMAGEM)
+        )
+    return sorted(caminho for caminho in glob.glob(entrada) if os.path.isfile(caminho))
+
+
+def _inicializar_trabalhador():
+    # Cada processo já ocupa um núcleo; evita que o OpenCV abra mais threads por processo
+    cv2.setNumThreads(1)
+
+
+def _processar_arquivo(tarefa):
+    caminho_entrada, nome_operacao, parametros, destino, cinza = tarefa
+
+    modo = cv2.IMREAD_GRAYSCALE if cinza else cv2.IMREAD_COLOR
+    imagem = cv2.imread(caminho_entrada, modo)
+    if imagem is None:
+        return caminho_entrada, None
+
+    imagem_tratada = obter_operacao(nome_operacao)(imagem, **parametros)
+
+    # Mantém o nome original e acrescenta a operação (ex.: first_image-canny.jpg)
+    nome, extensao = os.path.splitext(os.path.basename(caminho_entrada))
+    caminho_saida = os.path.join(destino, f"{nome}-{nome_operacao}{extensao}")
+    cv2.imwrite(caminho_saida, imagem_tratada)
+
+    return caminho_entrada, caminho_saida
+
+
+def processar_lote(entrada, nome_operacao, destino="data/processed", parametros=None,
+                   trabalhadores=None, cinza=False):
+    """
+    @brief Aplica uma operação a todas as imagens de uma entrada, em paralelo e sem janelas.
+
+    @details
+    Cada arquivo é lido, processado e salvo dentro de um processo de um
+    ProcessPoolExecutor, de modo que leitura, filtragem e escrita ocorrem em paralelo
+    em todos os núcleos. Os resultados são gravados em `destino` com o nome da
+    operação acrescentado ao nome original.
+
+    @param entrada: Diretório, padrão glob ou arquivo (ver listar_entradas).
+    @param nome_operacao: Nome de uma operação de src.preprocessing.operacoes (ex.: "canny").
+    @param destino: Diretório de saída (padrão "data/processed").
+    @param parametros: Dicionário de parâmetros extras repassados à operação.
+    @param trabalhadores: Número de processos; None usa a quantidade de núcleos.
+    @param cinza: Se True, as imagens são lidas em tons de cinza.
+    @return Lista de pares (entrada, saída); a saída é None se a leitura falhar.
+    """
+    # Valida o nome antes de iniciar os processos
+    obter_operacao(nome_operacao)
+
+    caminhos = listar_entradas(entrada)
+    os.makedirs(destino, exist_ok=True)
+
+    tarefas = [
+        (caminho, nome_operacao, parametros or {}, destino, cinza)
+        for caminho in caminhos
+    ]
+
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+
+    # Agrupa as tarefas para reduzir a comunicação entre processos em lotes grandes
+    tamanho_bloco = max(1, len(tarefas) // (trabalhadores * 4))
+
+    with ProcessPoolExecutor(max_workers=trabalhadores, initializer=_inicializar_trabalhador) as executor:
+        return list(executor.map(_processar_arquivo, tarefas, chunksize=tamanho_bloco))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica uma operação dos capítulos a um lote de imagens.")
+    parser.add_argument("entrada", help="Diretório, padrão glob (entre aspas) ou arquivo de imagem.")
+    parser.add_argument("operacao", help="Nome da operação (ex.: filtro_gaussiano, canny, equalizar_histograma).")
+    parser.add_argument("--destino", default="data/processed", help="Diretório de saída.")
+    parser.add_argument("--trabalhadores", type=int, default=None, help="Número de processos (padrão: núcleos).")
+    parser.add_argument("--cinza", action="store_true", help="Lê as imagens em tons de cinza.")
+    argumentos = parser.parse_args()
+
+    resultados = processar_lote(
+        argumentos.entrada, argumentos.operacao, argumentos.destino,
+        trabalhadores=argumentos.trabalhadores, cinza=argumentos.cinza
+    )
+
+    falhas = [caminho for caminho, saida in resultados if saida is None]
+    print(f"Imagens processadas: {len(resultados) - len(falhas)}")
+    for caminho in falhas:
+        print("Erro: imagem não pôde ser carregada:", caminho)
+
+
+if __name__ == "__main__":
+    main()
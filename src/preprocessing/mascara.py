@@ -0,0 +1,361 @@
+"""
+@brief Máscaras binárias com 1 bit por pixel (np.packbits), operações lógicas e morfologia bit a bit.
+
+@details
+As imagens binárias de chapter_five e chapter_eight usam um byte (0 ou 255) por pixel.
+MascaraBinaria guarda cada linha com 8 pixels por byte, o mais significativo à esquerda
+(o mesmo arranjo do formato PBM), ocupando 1/8 da memória e do disco.
+
+Contagem de pixels, operações lógicas e morfologia trabalham diretamente sobre os bits:
+a erosão por um segmento horizontal, por exemplo, é um E lógico de palavras de 64 bits
+deslocadas, processando 64 pixels por operação.
+
+Exemplo:
+
+    mascara = MascaraBinaria.de_imagem(imagem_cinza, limiar=127)
+    limpa   = mascara.abrir(tamanho=5)
+    print(limpa.contar(), "pixels brancos")
+    limpa.salvar("data/processed/mascara.pbm")
+"""
+import os
+
+import cv2
+import numpy as np
+
+from src.preprocessing.morfologia import compor_iteracoes, decompor_em_retangulos, elemento_estruturante
+
+# Número de bits 1 de cada byte, para versões do NumPy sem np.bitwise_count
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _contar_bits(valores):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(valores)
+    return _BITS_POR_BYTE[valores]
+
+
+class MascaraBinaria:
+    """
+    @brief Máscara binária (altura x largura) armazenada com 1 bit por pixel.
+
+    @param bits: Linhas empacotadas (uint8, altura x ceil(largura / 8)), como as de
+                 np.packbits(..., axis=1). Bits além da largura devem ser zero.
+    @param largura: Largura da máscara em pixels.
+    """
+
+    def __init__(self, bits, largura):
+        self.bits = bits
+        self.largura = largura
+
+    @property
+    def altura(self):
+        return self.bits.shape[0]
+
+    @property
+    def shape(self):
+        return self.altura, self.largura
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    @classmethod
+    def de_imagem(cls, imagem, limiar=127):
+        """
+        @brief Binariza uma imagem em tons de cinza (pixel > limiar), como cv2.THRESH_BINARY.
+
+        @param imagem: Imagem em tons de cinza, ou array booleano (usado como está).
+        @param limiar: Limiar da binarização (padrão 127, como em chapter_eight).
+        @return Nova MascaraBinaria.
+        """
+        ativos = imagem if imagem.dtype == np.bool_ else imagem > limiar
+        return cls(np.packbits(ativos, axis=1), imagem.shape[1])
+
+    @classmethod
+    def vazia(cls, altura, largura):
+        """
+        @brief Máscara com todos os pixels em 0.
+        """
+        return cls(np.zeros((altura, -(-largura // 8)), dtype=np.uint8), largura)
+
+    def para_imagem(self, valor=255):
+        """
+        @brief Expande a máscara para uma imagem uint8 (0 ou `valor`), como a de cv2.threshold.
+        """
+        ativos = np.unpackbits(self.bits, axis=1, count=self.largura)
+        return ativos * np.uint8(valor) if valor != 1 else ativos
+
+    def contar(self):
+        """
+        @brief Número de pixels ativos (popcount direto sobre os bytes empacotados).
+        """
+        return int(_contar_bits(self.bits).sum(dtype=np.int64))
+
+    def contar_por_linha(self):
+        """
+        @brief Número de pixels ativos em cada linha.
+        """
+        return _contar_bits(self.bits).sum(axis=1, dtype=np.int64)
+
+    def copy(self):
+        return MascaraBinaria(self.bits.copy(), self.largura)
+
+    def __eq__(self, outra):
+        return (isinstance(outra, MascaraBinaria) and self.largura == outra.largura
+                and np.array_equal(self.bits, outra.bits))
+
+    def _verificar(self, outra):
+        if self.shape != outra.shape:
+            raise ValueError(f"Máscaras de tamanhos diferentes: {self.shape} e {outra.shape}.")
+
+    def _limpar_sobra(self, bits):
+        # Zera os bits além da largura no último byte de cada linha
+        sobra = bits.shape[1] * 8 - self.largura
+        if sobra:
+            bits[:, -1] &= np.uint8((0xFF << sobra) & 0xFF)
+        return bits
+
+    def __and__(self, outra):
+        self._verificar(outra)
+        return MascaraBinaria(self.bits & outra.bits, self.largura)
+
+    def __or__(self, outra):
+        self._verificar(outra)
+        return MascaraBinaria(self.bits | outra.bits, self.largura)
+
+    def __xor__(self, outra):
+        self._verificar(outra)
+        return MascaraBinaria(self.bits ^ outra.bits, self.largura)
+
+    def __invert__(self):
+        return MascaraBinaria(self._limpar_sobra(~self.bits), self.largura)
+
+    def subtrair(self, outra):
+        """
+        @brief Pixels ativos nesta máscara e inativos na outra (self E NÃO outra).
+        """
+        self._verificar(outra)
+        return MascaraBinaria(self.bits & ~outra.bits, self.largura)
+
+    # Morfologia ------------------------------------------------------------------------
+
+    def _palavras(self, preenchimento):
+        # Linhas como palavras de 64 bits (pixel mais à esquerda no bit mais significativo),
+        # com os bits além da largura iguais a `preenchimento`
+        bytes_por_linha = -(-self.bits.shape[1] // 8) * 8
+        estendidos = np.full((self.altura, bytes_por_linha), 0xFF if preenchimento else 0, dtype=np.uint8)
+        estendidos[:, :self.bits.shape[1]] = self.bits
+
+        sobra = self.bits.shape[1] * 8 - self.largura
+        if sobra and preenchimento:
+            estendidos[:, self.bits.shape[1] - 1] |= np.uint8((1 << sobra) - 1)
+        elif sobra:
+            estendidos[:, self.bits.shape[1] - 1] &= np.uint8((0xFF << sobra) & 0xFF)
+        return estendidos.view(">u8").astype(np.uint64)
+
+    def _de_palavras(self, palavras):
+        bits = palavras.astype(">u8").view(np.uint8)[:, :self.bits.shape[1]]
+        return MascaraBinaria(self._limpar_sobra(np.ascontiguousarray(bits)), self.largura)
+
+    @staticmethod
+    def _deslocar(palavras, deslocamento, eixo, preenchimento):
+        """
+        @brief Resultado[x] = palavras[x + deslocamento] ao longo do eixo (0 = linhas, 1 = pixels).
+
+        @details
+        Posições que caem fora da máscara recebem `preenchimento` (1 na erosão, para que a
+        borda não interfira, e 0 na dilatação), como a borda padrão do OpenCV.
+        """
+        if deslocamento == 0:
+            return palavras
+        cheio = np.uint64(0xFFFFFFFFFFFFFFFF) if preenchimento else np.uint64(0)
+
+        if eixo == 0:
+            resultado = np.full_like(palavras, cheio)
+            altura = palavras.shape[0]
+            if abs(deslocamento) < altura:
+                if deslocamento > 0:
+                    resultado[:altura - deslocamento] = palavras[deslocamento:]
+                else:
+                    resultado[-deslocamento:] = palavras[:altura + deslocamento]
+            return resultado
+
+        # Deslocamento horizontal: palavras inteiras e depois bits, com o "vai um" da vizinha
+        colunas = palavras.shape[1]
+        palavras_inteiras, bits = divmod(abs(deslocamento), 64)
+        estendidas = np.full((palavras.shape[0], colunas + palavras_inteiras + 1), cheio, dtype=np.uint64)
+        if deslocamento > 0:
+            estendidas[:, :colunas] = palavras
+            atual = estendidas[:, palavras_inteiras:palavras_inteiras + colunas]
+            vizinha = estendidas[:, palavras_inteiras + 1:palavras_inteiras + 1 + colunas]
+            if bits == 0:
+                return atual.copy()
+            return (atual << np.uint64(bits)) | (vizinha >> np.uint64(64 - bits))
+
+        estendidas[:, palavras_inteiras + 1:] = palavras
+        atual = estendidas[:, 1:1 + colunas]
+        vizinha = estendidas[:, :colunas]
+        if bits == 0:
+            return atual.copy()
+        return (atual >> np.uint64(bits)) | (vizinha << np.uint64(64 - bits))
+
+    @classmethod
+    def _segmento(cls, palavras, inicio, fim, eixo, erosao):
+        # E (erosão) ou OU (dilatação) de palavras[x + d] para d de inicio a fim, por duplicação:
+        # janelas de 1, 2, 4, ... posições, com O(log(comprimento)) deslocamentos
+        combinar = np.bitwise_and if erosao else np.bitwise_or
+        comprimento = fim - inicio + 1
+
+        resultado = palavras
+        coberto = 1
+        while coberto * 2 <= comprimento:
+            resultado = combinar(resultado, cls._deslocar(resultado, coberto, eixo, erosao))
+            coberto *= 2
+        if coberto < comprimento:
+            resultado = combinar(resultado, cls._deslocar(resultado, comprimento - coberto, eixo, erosao))
+        return cls._deslocar(resultado, inicio, eixo, erosao)
+
+    def _morfologia(self, tamanho, forma, iteracoes, elemento, erosao):
+        if elemento is None:
+            elemento = elemento_estruturante(forma, tamanho)
+        composto, (ancora_x, ancora_y) = compor_iteracoes(np.asarray(elemento), iteracoes)
+
+        # Margem com o valor neutro em volta da máscara, para que os deslocamentos de cada
+        # passada não percam pixels da borda que ainda serão usados pela passada seguinte
+        altura_elemento, largura_elemento = composto.shape
+        margem_y = max(ancora_y, altura_elemento - 1 - ancora_y)
+        margem_palavras = -(-max(ancora_x, largura_elemento - 1 - ancora_x) // 64)
+        neutro = 0xFFFFFFFFFFFFFFFF if erosao else 0
+        palavras = np.pad(self._palavras(preenchimento=erosao),
+                          ((margem_y, margem_y), (margem_palavras, margem_palavras)), constant_values=neutro)
+        combinar = np.bitwise_and if erosao else np.bitwise_or
+
+        resultado = None
+        for x0, y0, x1, y1 in decompor_em_retangulos(composto):
+            # O OpenCV não reflete o elemento na dilatação: ambas usam (x + dx, y + dy)
+            horizontal = self._segmento(palavras, x0 - ancora_x, x1 - ancora_x, 1, erosao)
+            parcial = self._segmento(horizontal, y0 - ancora_y, y1 - ancora_y, 0, erosao)
+            resultado = parcial if resultado is None else combinar(resultado, parcial)
+        return self._de_palavras(resultado[margem_y:margem_y + self.altura,
+                                           margem_palavras:resultado.shape[1] - margem_palavras])
+
+    def erodir(self, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+        """
+        @brief Erosão bit a bit; mesmo resultado de cv2.erode sobre para_imagem().
+
+        @param tamanho: Lado do elemento (ignorado se `elemento` for informado).
+        @param forma: "retangulo", "elipse" ou "cruz".
+        @param iteracoes: Número de erosões seguidas (compostas em um único elemento).
+        @param elemento: Elemento estruturante próprio (âncora no centro).
+        @return Nova MascaraBinaria.
+        """
+        return self._morfologia(tamanho, forma, iteracoes, elemento, erosao=True)
+
+    def dilatar(self, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+        """
+        @brief Dilatação bit a bit; mesmo resultado de cv2.dilate. Parâmetros como em erodir().
+        """
+        return self._morfologia(tamanho, forma, iteracoes, elemento, erosao=False)
+
+    def abrir(self, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+        """
+        @brief Abertura: remove pontos e ruídos menores que o elemento.
+        """
+        return self.erodir(tamanho, forma, iteracoes, elemento).dilatar(tamanho, forma, iteracoes, elemento)
+
+    def fechar(self, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+        """
+        @brief Fechamento: preenche buracos menores que o elemento.
+        """
+        return self.dilatar(tamanho, forma, iteracoes, elemento).erodir(tamanho, forma, iteracoes, elemento)
+
+    def gradiente(self, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+        """
+        @brief Gradiente morfológico: contorno dos objetos (dilatação E NÃO erosão).
+        """
+        return self.dilatar(tamanho, forma, iteracoes, elemento).subtrair(
+            self.erodir(tamanho, forma, iteracoes, elemento))
+
+    # Entrada e saída -------------------------------------------------------------------
+
+    def salvar(self, caminho):
+        """
+        @brief Salva a máscara com 1 bit por pixel.
+
+        @details
+        - .pbm: PBM binário (P4), escrito direto dos bits, sem expandir a máscara. No PBM
+          o bit 1 é preto, por isso os bits são invertidos: a imagem aparece como a BMP
+          de chapter_eight (objetos brancos).
+        - .png: PNG de 1 bit (cv2.IMWRITE_PNG_BILEVEL), comprimido.
+
+        @param caminho: Caminho do arquivo (.pbm ou .png).
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        if extensao == ".pbm":
+            with open(caminho, "wb") as arquivo:
+                arquivo.write(f"P4\n{self.largura} {self.altura}\n".encode("ascii"))
+                arquivo.write(self._limpar_sobra(~self.bits).tobytes())
+        elif extensao == ".png":
+            cv2.imwrite(caminho, self.para_imagem(), [cv2.IMWRITE_PNG_BILEVEL, 1])
+        else:
+            raise ValueError(f"Formato não suportado: {extensao}. Use .pbm ou .png.")
+
+    @classmethod
+    def ler(cls, caminho):
+        """
+        @brief Lê uma máscara salva com salvar() (.pbm P4 ou .png).
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        if extensao == ".png":
+            return cls.de_imagem(cv2.imread(caminho, cv2.IMREAD_GRAYSCALE))
+
+        with open(caminho, "rb") as arquivo:
+            conteudo = arquivo.read()
+
+        # Cabeçalho: "P4", largura e altura, separados por espaços (comentários com #)
+        campos, posicao = [], 0
+        while len(campos) < 3:
+            while conteudo[posicao:posicao + 1].isspace():
+                posicao += 1
+            if conteudo[posicao:posicao + 1] == b"#":
+                posicao = conteudo.index(b"\n", posicao)
+                continue
+            inicio = posicao
+            while not conteudo[posicao:posicao + 1].isspace():
+                posicao += 1
+            campos.append(conteudo[inicio:posicao])
+        if campos[0] != b"P4":
+            raise ValueError(f"{caminho} não é um PBM binário (P4).")
+
+        largura, altura = int(campos[1]), int(campos[2])
+        bits = np.frombuffer(conteudo, dtype=np.uint8, count=altura * -(-largura // 8), offset=posicao + 1)
+        mascara = cls(bits.reshape(altura, -1).copy(), largura)
+        return ~mascara
+
+
+def salvar_lote(caminho, mascaras):
+    """
+    @brief Salva várias máscaras do mesmo tamanho em um único arquivo .npz (1 bit por pixel).
+
+    @param caminho: Caminho do arquivo .npz.
+    @param mascaras: Sequência de MascaraBinaria.
+    @exception ValueError: Se o lote estiver vazio ou as máscaras tiverem tamanhos diferentes.
+    """
+    mascaras = list(mascaras)
+    if not mascaras:
+        raise ValueError("O lote de máscaras está vazio; não há tamanho a salvar.")
+    larguras = {mascara.largura for mascara in mascaras}
+    if len(larguras) > 1 or len({mascara.altura for mascara in mascaras}) > 1:
+        raise ValueError("Todas as máscaras do lote devem ter o mesmo tamanho.")
+    np.savez(caminho, bits=np.stack([mascara.bits for mascara in mascaras]), largura=larguras.pop())
+
+
+def ler_lote(caminho):
+    """
+    @brief Lê as máscaras salvas com salvar_lote().
+
+    @return Lista de MascaraBinaria.
+    """
+    with np.load(caminho) as arquivo:
+        largura = int(arquivo["largura"])
+        return [MascaraBinaria(bits, largura) for bits in arquivo["bits"]]
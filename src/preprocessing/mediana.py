@@ -0,0 +1,229 @@
+"""
+@brief Filtros de mediana e de percentil com custo constante em relação ao tamanho da janela.
+
+@details
+Implementa o algoritmo de Perreault e Hébert (2007): cada coluna da imagem mantém o
+histograma dos pixels nas 2r+1 linhas da janela atual. Ao descer uma linha, cada
+histograma de coluna recebe o pixel que entra e perde o que sai (custo O(1)). O histograma
+da janela de cada pixel é a soma de 2r+1 histogramas de coluna, obtida de uma vez para a
+linha inteira por uma imagem integral dos histogramas, com custo que depende apenas do
+número de faixas (256), e não do raio.
+
+Para imagens de 16 bits são usados dois níveis, como no artigo: um histograma grosso com
+os 8 bits mais significativos localiza a faixa da mediana, e um histograma fino (os 8 bits
+menos significativos, apenas dessa faixa) encontra o valor exato. A imagem é processada
+em faixas verticais para limitar a memória dos histogramas finos.
+
+A mediana comum não precisa desse motor: cv2.medianBlur já usa o mesmo algoritmo em C++
+para uint8, e a mediana de 16 bits é obtida de passadas de 8 bits (ver mediana_16bits).
+O motor cobre os demais casos: percentis (ex.: mínimo e máximo robustos) e mediana com
+peso central, em uint8 e uint16.
+
+A operação registrada src.preprocessing.operacoes.filtro_de_mediana escolhe entre os três
+caminhos, de modo que lotes, blocos e vídeo chegam a este módulo pelo nome da operação:
+
+    filtro_de_mediana(imagem_16bits, tamanho=15)               # mediana_16bits
+    filtro_de_mediana(imagem, tamanho=9, percentil=90)         # filtro_de_percentil
+"""
+import cv2
+import numpy as np
+
+# Largura máxima (em colunas, com as margens) de cada faixa vertical em imagens de 16 bits:
+# 512 colunas x 65536 contagens x 1 byte = 32 MB de histogramas finos
+_COLUNAS_POR_FAIXA_16BITS = 512
+
+# Lado dos blocos das passadas finas da mediana de 16 bits
+_BLOCO_16BITS = 64
+
+
+def _posto(quantidade, percentil):
+    # Posição (a partir de 0) do valor procurado entre os `quantidade` valores ordenados
+    return int(round(percentil / 100 * (quantidade - 1)))
+
+
+def _filtrar_faixa(estendida, alto, canal, saida, x0, x1, raio, posto, peso_central):
+    altura = canal.shape[0]
+    diametro = 2 * raio + 1
+    dezesseis_bits = canal.dtype == np.uint16
+
+    colunas = slice(x0, x1 + 2 * raio)
+    indices = np.arange(x1 - x0 + 2 * raio)
+    posicoes = np.arange(x1 - x0)
+    valores = np.arange(256)
+
+    # Cada contagem de coluna vai no máximo até o diâmetro: cabe em uint8 até janelas 255x255
+    if diametro < 256:
+        tipo_contagem, profundidade = np.uint8, cv2.CV_32S
+    else:
+        tipo_contagem, profundidade = np.float64, cv2.CV_64F
+    um = tipo_contagem(1)
+
+    # Histogramas por coluna: grosso (8 bits mais significativos) e, em 16 bits, fino.
+    # Os finos ficam agrupados por faixa grossa, para que o bloco de uma faixa (todas as
+    # colunas x 256 valores) seja contíguo na memória.
+    grossa = np.zeros((len(indices), 256), dtype=tipo_contagem)
+    fina = np.zeros((256, len(indices), 256), dtype=tipo_contagem) if dezesseis_bits else None
+
+    def entrar(linha):
+        grossa[indices, alto[linha, colunas]] += um
+        if dezesseis_bits:
+            fina[alto[linha, colunas], indices, estendida[linha, colunas] & 0xFF] += um
+
+    def sair(linha):
+        grossa[indices, alto[linha, colunas]] -= um
+        if dezesseis_bits:
+            fina[alto[linha, colunas], indices, estendida[linha, colunas] & 0xFF] -= um
+
+    def acumular_janelas(histogramas, selecao=posicoes):
+        # Histograma acumulado (contagem de valores <= v) da janela de cada posição. A imagem
+        # integral soma ao mesmo tempo ao longo das colunas (as `diametro` colunas da janela)
+        # e ao longo dos valores (o acúmulo), tudo em uma chamada do OpenCV.
+        integral = cv2.integral(histogramas, sdepth=profundidade)
+        return integral[selecao + diametro, 1:] - integral[selecao, 1:]
+
+    for linha in range(diametro - 1):
+        entrar(linha)
+
+    for y in range(altura):
+        entrar(y + diametro - 1)
+
+        centro = canal[y, x0:x1]
+        centro_alto = (centro >> 8) if dezesseis_bits else centro
+
+        acumuladas = acumular_janelas(grossa)
+        if peso_central > 1:
+            acumuladas += (peso_central - 1) * (valores >= centro_alto[:, None])
+        faixa = (acumuladas > posto).argmax(axis=1)
+
+        if not dezesseis_bits:
+            saida[y, x0:x1] = faixa
+        else:
+            # Posição procurada dentro da faixa grossa encontrada
+            abaixo = np.where(faixa > 0, acumuladas[posicoes, faixa - 1], 0)
+            restante = posto - abaixo
+            resultado = np.empty(x1 - x0, dtype=np.uint16)
+
+            # Vizinhos costumam cair na mesma faixa grossa, então há poucas faixas por linha
+            for valor in np.unique(faixa):
+                selecao = np.flatnonzero(faixa == valor)
+                finas = acumular_janelas(fina[valor], selecao)
+                if peso_central > 1:
+                    mesma_faixa = centro_alto[selecao] == valor
+                    baixos = centro[selecao[mesma_faixa]] & 0xFF
+                    finas[mesma_faixa] += (peso_central - 1) * (valores >= baixos[:, None])
+                baixo = (finas > restante[selecao, None]).argmax(axis=1)
+                resultado[selecao] = valor * 256 + baixo
+            saida[y, x0:x1] = resultado
+
+        sair(y)
+
+
+def _filtrar_canal(canal, raio, posto, peso_central):
+    largura = canal.shape[1]
+
+    # Mesma borda de cv2.medianBlur (replica os pixels da borda)
+    estendida = cv2.copyMakeBorder(canal, raio, raio, raio, raio, cv2.BORDER_REPLICATE)
+    alto = (estendida >> 8) if canal.dtype == np.uint16 else estendida
+    saida = np.empty_like(canal)
+
+    if canal.dtype == np.uint16:
+        largura_faixa = max(64, _COLUNAS_POR_FAIXA_16BITS - 2 * raio)
+    else:
+        largura_faixa = largura
+
+    for x0 in range(0, largura, largura_faixa):
+        _filtrar_faixa(estendida, alto, canal, saida, x0, min(x0 + largura_faixa, largura),
+                       raio, posto, peso_central)
+    return saida
+
+
+def _mediana_16bits_canal(canal, tamanho, tamanho_bloco=_BLOCO_16BITS):
+    """
+    @brief Mediana exata de um canal uint16 a partir de medianas de 8 bits (cv2.medianBlur).
+
+    @details
+    A mediana comuta com funções monótonas: mediana(f(I)) = f(mediana(I)). Com f(v) = v >> 8,
+    uma passada sobre o byte mais significativo dá a faixa grossa c de cada mediana. Para
+    cada faixa c presente, f(v) = clip(v - 256c, 0, 255) é monótona e, onde a mediana cai na
+    faixa c, devolve exatamente o seu byte menos significativo. As passadas finas são feitas
+    por blocos (com margem do raio), já que num bloco pequeno há poucas faixas distintas.
+    """
+    altura, largura = canal.shape
+    raio = tamanho // 2
+
+    grossa = cv2.medianBlur((canal >> 8).astype(np.uint8), tamanho)
+    saida = grossa.astype(np.uint16) << 8
+
+    for y0 in range(0, altura, tamanho_bloco):
+        for x0 in range(0, largura, tamanho_bloco):
+            y1, x1 = min(y0 + tamanho_bloco, altura), min(x0 + tamanho_bloco, largura)
+
+            # Região lida: o bloco mais a margem, limitada às bordas da imagem
+            ly0, ly1 = max(y0 - raio, 0), min(y1 + raio, altura)
+            lx0, lx1 = max(x0 - raio, 0), min(x1 + raio, largura)
+            regiao = canal[ly0:ly1, lx0:lx1].astype(np.int32)
+
+            faixas = grossa[y0:y1, x0:x1]
+            bloco = saida[y0:y1, x0:x1]
+            for valor in np.unique(faixas):
+                deslocada = np.clip(regiao - int(valor) * 256, 0, 255).astype(np.uint8)
+                fina = cv2.medianBlur(deslocada, tamanho)[y0 - ly0:y1 - ly0, x0 - lx0:x1 - lx0]
+                mascara = faixas == valor
+                bloco[mascara] += fina[mascara]
+    return saida
+
+
+def _por_canal(funcao, imagem, destino, *argumentos):
+    # Aplica a função de um canal a cada canal, escrevendo direto em `destino`
+    if destino is None:
+        destino = np.empty_like(imagem)
+    if imagem.ndim == 2:
+        destino[...] = funcao(imagem, *argumentos)
+        return destino
+    for indice in range(imagem.shape[2]):
+        destino[:, :, indice] = funcao(np.ascontiguousarray(imagem[:, :, indice]), *argumentos)
+    return destino
+
+
+def mediana_16bits(imagem, tamanho=3, destino=None):
+    """
+    @brief Mediana de uma imagem uint16 com qualquer janela ímpar (cv2.medianBlur só aceita até 5).
+
+    @param imagem: Imagem uint16, com um ou mais canais.
+    @param tamanho: Lado da janela (ímpar).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem filtrada; mesmo resultado de cv2.medianBlur, com borda replicada.
+    """
+    if imagem.dtype != np.uint16:
+        raise ValueError(f"Tipo não suportado: {imagem.dtype}. Use uint16.")
+    if tamanho % 2 == 0 or tamanho < 1:
+        raise ValueError("O tamanho da janela deve ser ímpar e positivo.")
+    return _por_canal(_mediana_16bits_canal, imagem, destino, tamanho)
+
+
+def filtro_de_percentil(imagem, tamanho=3, percentil=50, peso_central=1, destino=None):
+    """
+    @brief Substitui cada pixel pelo percentil dos valores da sua janela tamanho x tamanho.
+
+    @details
+    percentil=50 é a mediana; valores baixos (ex.: 10) e altos (ex.: 90) funcionam como
+    erosão e dilatação robustas a ruído. Com `peso_central` > 1 o pixel central é contado
+    várias vezes (mediana ponderada no centro), o que preserva melhor detalhes finos.
+
+    O custo por pixel não depende de `tamanho`. Imagens coloridas são filtradas canal a canal.
+
+    @param imagem: Imagem uint8 ou uint16, com um ou mais canais.
+    @param tamanho: Lado da janela (ímpar).
+    @param percentil: Percentil de 0 a 100 (50 = mediana).
+    @param peso_central: Número de vezes que o pixel central é contado.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem filtrada, no tipo da entrada.
+    """
+    if imagem.dtype not in (np.uint8, np.uint16):
+        raise ValueError(f"Tipo não suportado: {imagem.dtype}. Use uint8 ou uint16.")
+    if tamanho % 2 == 0 or tamanho < 1:
+        raise ValueError("O tamanho da janela deve ser ímpar e positivo.")
+
+    raio = tamanho // 2
+    posto = _posto(tamanho * tamanho + peso_central - 1, percentil)
+    return _por_canal(_filtrar_canal, imagem, destino, raio, posto, peso_central)
@@ -0,0 +1,364 @@
+"""
+@brief Morfologia matemática (erosão, dilatação, abertura, fechamento, gradiente e chapéus).
+
+@details
+Três otimizações em relação a chamar cv2.erode/cv2.dilate diretamente:
+
+1. Iterações repetidas viram um único elemento estruturante equivalente (a soma de
+   Minkowski do elemento com ele mesmo): erodir 5 vezes com uma elipse 5x5 é o mesmo que
+   erodir uma vez com o elemento 21x21 resultante. O resultado é idêntico ao do OpenCV,
+   cuja borda padrão não interfere na erosão nem na dilatação.
+2. O elemento é decomposto em uma união de retângulos (um por trecho distinto de linha),
+   e cada retângulo em duas passadas 1D (horizontal e vertical). A erosão pela união é o
+   mínimo das erosões por cada retângulo. Em elementos simétricos (retângulo, elipse,
+   cruz e suas iterações) as passadas são encadeadas, e o custo cresce com o lado do
+   elemento, e não com a sua área como no cv2.erode com elementos não retangulares.
+3. Passadas 1D muito longas usam o algoritmo de van Herk/Gil-Werman: mínimos (ou
+   máximos) acumulados dentro de blocos do tamanho da janela, com 3 comparações por pixel
+   qualquer que seja o tamanho. As demais ficam com o OpenCV, que é vetorizado.
+
+Exemplo (chapter_eight.erosão, sem 5 passadas sobre a imagem):
+
+    erodida = erodir(imagem_binaria, tamanho=5, forma="elipse", iteracoes=5)
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+# Formas aceitas pelo parâmetro `forma`
+FORMAS = {
+    "retangulo": cv2.MORPH_RECT,
+    "elipse":    cv2.MORPH_ELLIPSE,
+    "cruz":      cv2.MORPH_CROSS,
+}
+
+# A partir deste comprimento, as passadas 1D usam van Herk/Gil-Werman em vez do OpenCV.
+# O custo do OpenCV cresce com o comprimento e o de van Herk não; medido em 1080p, o
+# OpenCV (vetorizado) é mais rápido até cerca de mil pixels.
+COMPRIMENTO_VAN_HERK = 1024
+
+# Custo fixo de uma passada pela imagem (chamada, leitura e escrita), em comparações por
+# pixel, usado para escolher entre o OpenCV direto e a decomposição
+_CUSTO_POR_PASSADA = 20
+
+
+def elemento_estruturante(forma="elipse", tamanho=5):
+    """
+    @brief Cria um elemento estruturante (como cv2.getStructuringElement).
+
+    @param forma: "retangulo", "elipse" ou "cruz".
+    @param tamanho: Lado do elemento, ou tupla (largura, altura).
+    @return Matriz uint8 com 1 nas posições do elemento.
+    """
+    if forma not in FORMAS:
+        raise ValueError(f"Forma desconhecida: {forma}. Disponíveis: {', '.join(FORMAS)}")
+    if np.isscalar(tamanho):
+        tamanho = (tamanho, tamanho)
+    return cv2.getStructuringElement(FORMAS[forma], tuple(tamanho))
+
+
+def compor_iteracoes(elemento, iteracoes, ancora=None):
+    """
+    @brief Elemento equivalente a aplicar `elemento` `iteracoes` vezes seguidas.
+
+    @details
+    É a soma de Minkowski do elemento com ele mesmo: o conjunto de todas as somas de
+    `iteracoes` deslocamentos do elemento. A âncora do resultado é a soma das âncoras.
+
+    @param elemento: Matriz com as posições do elemento diferentes de zero.
+    @param iteracoes: Número de aplicações.
+    @param ancora: Âncora (x, y) do elemento; None usa o centro, como o OpenCV.
+    @return Tupla (elemento_equivalente, ancora_equivalente).
+    """
+    altura, largura = elemento.shape
+    if ancora is None:
+        ancora = (largura // 2, altura // 2)
+
+    # Recorte do elemento na sua caixa envolvente; o composto começa nesse recorte
+    linhas, colunas = np.nonzero(elemento)
+    recorte = (np.asarray(elemento)[linhas.min():linhas.max() + 1, colunas.min():colunas.max() + 1] != 0)
+    recorte = recorte.astype(np.uint8)
+    altura_recorte, largura_recorte = recorte.shape
+    minimo = iteracoes * np.array([linhas.min() - ancora[1], colunas.min() - ancora[0]])
+
+    composto = np.zeros((iteracoes * (altura_recorte - 1) + 1, iteracoes * (largura_recorte - 1) + 1),
+                        dtype=np.uint8)
+    composto[:altura_recorte, :largura_recorte] = recorte
+
+    # Cada dilatação pelo recorte refletido soma mais um deslocamento a todas as posições,
+    # bem mais barato que somar todos os pares de posições em elementos grandes
+    refletido = np.ascontiguousarray(recorte[::-1, ::-1])
+    for _ in range(iteracoes - 1):
+        composto = cv2.dilate(composto, refletido, anchor=(largura_recorte - 1, altura_recorte - 1),
+                              borderType=cv2.BORDER_CONSTANT, borderValue=0)
+    return composto, (int(-minimo[1]), int(-minimo[0]))
+
+
+def decompor_em_retangulos(elemento):
+    """
+    @brief Decompõe um elemento estruturante em uma união de retângulos.
+
+    @details
+    Para cada trecho contínuo [x0, x1] de alguma linha do elemento, o retângulo cobre esse
+    trecho em todas as linhas consecutivas que o contêm. Todo ponto do elemento fica em
+    algum retângulo e nenhum retângulo sai do elemento, de modo que a decomposição é exata
+    para qualquer forma. Em formas convexas há um retângulo por largura de linha distinta.
+
+    @param elemento: Matriz com as posições do elemento diferentes de zero.
+    @return Lista de retângulos (x0, y0, x1, y1), com limites inclusivos.
+    """
+    ativo = np.asarray(elemento) != 0
+    trechos_por_linha = []
+    for linha in ativo:
+        borda = np.diff(np.concatenate(([0], linha.astype(np.int8), [0])))
+        inicios = np.flatnonzero(borda == 1)
+        fins = np.flatnonzero(borda == -1) - 1
+        trechos_por_linha.append(list(zip(inicios.tolist(), fins.tolist())))
+
+    retangulos = set()
+    for x0, x1 in {trecho for trechos in trechos_por_linha for trecho in trechos}:
+        contem = ativo[:, x0:x1 + 1].all(axis=1)
+
+        # Cada sequência de linhas consecutivas que contém o trecho é um retângulo
+        borda = np.diff(np.concatenate(([0], contem.astype(np.int8), [0])))
+        for y0, y1 in zip(np.flatnonzero(borda == 1), np.flatnonzero(borda == -1) - 1):
+            retangulos.add((x0, int(y0), x1, int(y1)))
+
+    # Descarta retângulos contidos em outros (não alteram a união)
+    return sorted(r for r in retangulos if not any(o != r and _contem(o, r) for o in retangulos))
+
+
+def _contem(externo, interno):
+    return (externo[0] <= interno[0] and externo[1] <= interno[1]
+            and externo[2] >= interno[2] and externo[3] >= interno[3])
+
+
+def _van_herk(valores, comprimento, eixo, funcao):
+    """
+    @brief Mínimo (ou máximo) deslizante 1D de van Herk/Gil-Werman.
+
+    @details
+    A entrada tem n + comprimento - 1 posições ao longo do eixo e a saída, n. O eixo é
+    dividido em blocos de `comprimento`; em cada bloco são acumulados o mínimo da esquerda
+    para a direita (g) e da direita para a esquerda (h). Toda janela cobre o fim de um
+    bloco e o começo do seguinte, logo seu mínimo é min(h[x], g[x + comprimento - 1]).
+    """
+    valores = np.moveaxis(valores, eixo, -1)
+    total = valores.shape[-1]
+    saidas = total - comprimento + 1
+
+    blocos = -(-total // comprimento)
+    neutro = np.iinfo(valores.dtype).max if funcao is np.minimum else np.iinfo(valores.dtype).min
+    estendidos = np.full(valores.shape[:-1] + (blocos * comprimento,), neutro, dtype=valores.dtype)
+    estendidos[..., :total] = valores
+    estendidos = estendidos.reshape(valores.shape[:-1] + (blocos, comprimento))
+
+    g = funcao.accumulate(estendidos, axis=-1).reshape(valores.shape[:-1] + (-1,))
+    h = funcao.accumulate(estendidos[..., ::-1], axis=-1)[..., ::-1].reshape(valores.shape[:-1] + (-1,))
+
+    resultado = funcao(h[..., :saidas], g[..., comprimento - 1:comprimento - 1 + saidas])
+    return np.moveaxis(resultado, -1, eixo)
+
+
+def _segmento(imagem, comprimento, horizontal, erosao):
+    # Erosão/dilatação por um segmento centrado de `comprimento` (ímpar) pixels
+    if comprimento <= 1:
+        return imagem
+
+    if comprimento >= COMPRIMENTO_VAN_HERK and np.issubdtype(imagem.dtype, np.integer):
+        limites = np.iinfo(imagem.dtype)
+        neutro = limites.max if erosao else limites.min
+        meio = comprimento // 2
+        margens = (0, 0, meio, meio) if horizontal else (meio, meio, 0, 0)
+        estendida = cv2.copyMakeBorder(imagem, *margens, cv2.BORDER_CONSTANT, value=[float(neutro)] * 4)
+        if estendida.ndim < imagem.ndim:
+            estendida = estendida[:, :, None]
+        funcao = np.minimum if erosao else np.maximum
+        return _van_herk(estendida, comprimento, 1 if horizontal else 0, funcao)
+
+    forma = (1, comprimento) if horizontal else (comprimento, 1)
+    operacao = cv2.erode if erosao else cv2.dilate
+    resultado = operacao(imagem, np.ones(forma, dtype=np.uint8))
+    return resultado.reshape(imagem.shape)
+
+
+def _escada(imagem, retangulos, erosao):
+    """
+    @brief Morfologia por uma união de retângulos centrados na âncora (elementos simétricos).
+
+    @details
+    Ordenados pela largura crescente, os retângulos têm alturas decrescentes (senão um
+    conteria o outro). Como segmentos centrados se somam (erodir por 2a+1 e depois por
+    2(a'-a)+1 é erodir por 2a'+1) e a erosão vertical comuta com o mínimo, o mínimo das
+    erosões por todos os retângulos é obtido encadeando as passadas:
+
+        S1 = H(a1);  S(k+1) = min(V(b(k) - b(k+1))(S(k)), H(a(k+1)));  resultado = V(bK)(SK)
+
+    onde H(a) e V(b) são segmentos de meia largura a e meia altura b. O comprimento total
+    das passadas é o da largura mais o da altura do elemento, e não a soma das áreas.
+    """
+    meios = sorted(((x1 - x0) // 2, (y1 - y0) // 2) for x0, y0, x1, y1 in retangulos)
+    combinar = cv2.min if erosao else cv2.max
+
+    largura_atual, altura_anterior = meios[0]
+    horizontal = _segmento(imagem, 2 * largura_atual + 1, True, erosao)
+    acumulada = horizontal
+    for meia_largura, meia_altura in meios[1:]:
+        horizontal = _segmento(horizontal, 2 * (meia_largura - largura_atual) + 1, True, erosao)
+        vertical = _segmento(acumulada, 2 * (altura_anterior - meia_altura) + 1, False, erosao)
+        acumulada = combinar(vertical, horizontal)
+        largura_atual, altura_anterior = meia_largura, meia_altura
+    return _segmento(acumulada, 2 * altura_anterior + 1, False, erosao)
+
+
+def _uniao(imagem, elemento, ancora, retangulos, erosao):
+    # Caso geral: cada retângulo, em qualquer posição do elemento, sobre a imagem com margem
+    altura, largura = imagem.shape[:2]
+    altura_el, largura_el = elemento.shape
+    ancora_x, ancora_y = ancora
+
+    # Borda neutra (o maior valor na erosão, o menor na dilatação), como a padrão do OpenCV
+    if np.issubdtype(imagem.dtype, np.integer):
+        limites = np.iinfo(imagem.dtype)
+    else:
+        limites = np.finfo(imagem.dtype)
+    neutro = limites.max if erosao else limites.min
+    estendida = cv2.copyMakeBorder(imagem, ancora_y, altura_el - 1 - ancora_y,
+                                   ancora_x, largura_el - 1 - ancora_x,
+                                   cv2.BORDER_CONSTANT, value=[float(neutro)] * 4)
+
+    operacao = cv2.erode if erosao else cv2.dilate
+    combinar = np.minimum if erosao else np.maximum
+    resultado = None
+    for x0, y0, x1, y1 in retangulos:
+        # O OpenCV já separa elementos retangulares em passadas de linha e de coluna
+        kernel = np.ones((y1 - y0 + 1, x1 - x0 + 1), dtype=np.uint8)
+        parcial = operacao(estendida, kernel, anchor=(0, 0))[y0:y0 + altura, x0:x0 + largura]
+        resultado = parcial.copy() if resultado is None else combinar(resultado, parcial, out=resultado)
+    return resultado.reshape(imagem.shape)
+
+
+@lru_cache(maxsize=128)
+def _plano(bytes_elemento, forma_elemento, iteracoes):
+    """
+    @brief Escolhe como aplicar um elemento (calculado uma vez por elemento e iterações).
+
+    @details
+    Custos estimados em comparações por pixel: com elementos não retangulares o OpenCV
+    compara cada posição do elemento, a cada iteração; cada passada própria custa o seu
+    comprimento mais um custo fixo.
+
+    @return Tupla (caminho, composto, ancora, retangulos), com caminho "retangulo",
+            "opencv", "escada" ou "uniao".
+    """
+    elemento = np.frombuffer(bytes_elemento, dtype=np.uint8).reshape(forma_elemento)
+    composto, ancora = compor_iteracoes(elemento, iteracoes)
+    if composto.all():
+        return "retangulo", composto, ancora, None
+
+    retangulos = decompor_em_retangulos(composto)
+    centrados = all(x0 + x1 == 2 * ancora[0] and y0 + y1 == 2 * ancora[1]
+                    for x0, y0, x1, y1 in retangulos)
+
+    custo_opencv = iteracoes * np.count_nonzero(elemento)
+    if centrados:
+        custo_proprio = 2 * len(retangulos) * _CUSTO_POR_PASSADA + sum(composto.shape)
+    else:
+        custo_proprio = sum(_CUSTO_POR_PASSADA + (x1 - x0) + (y1 - y0) for x0, y0, x1, y1 in retangulos)
+
+    if custo_opencv <= custo_proprio:
+        return "opencv", composto, ancora, retangulos
+    return ("escada" if centrados else "uniao"), composto, ancora, retangulos
+
+
+def _morfologia(imagem, elemento, forma, tamanho, iteracoes, erosao, destino=None):
+    if elemento is None:
+        elemento = elemento_estruturante(forma, tamanho)
+    elemento = np.ascontiguousarray(elemento, dtype=np.uint8)
+    operacao = cv2.erode if erosao else cv2.dilate
+
+    caminho, composto, ancora, retangulos = _plano(elemento.tobytes(), elemento.shape, iteracoes)
+    if caminho == "retangulo":
+        # O OpenCV já separa retângulos em linha e coluna; as iterações viram um único
+        # retângulo maior, em uma só passada pela imagem
+        return operacao(imagem, composto, dst=destino, anchor=ancora)
+    if caminho == "opencv":
+        return operacao(imagem, elemento, dst=destino, iterations=iteracoes)
+    if caminho == "escada":
+        resultado = _escada(imagem, retangulos, erosao)
+    else:
+        resultado = _uniao(imagem, composto, ancora, retangulos, erosao)
+    if destino is None:
+        return resultado
+    np.copyto(destino, resultado)
+    return destino
+
+
+def erodir(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None, destino=None):
+    """
+    @brief Erosão: cada pixel recebe o mínimo da vizinhança definida pelo elemento.
+
+    @details
+    Mesmo resultado de cv2.erode(imagem, elemento, iterations=iteracoes), com as
+    iterações compostas em um único elemento e o elemento decomposto em passadas 1D.
+
+    @param imagem: Imagem de entrada (binária, cinza ou colorida).
+    @param tamanho: Lado do elemento (ignorado se `elemento` for informado).
+    @param forma: "retangulo", "elipse" ou "cruz" (ignorado se `elemento` for informado).
+    @param iteracoes: Número de erosões seguidas.
+    @param elemento: Elemento estruturante próprio (matriz com âncora no centro).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem erodida.
+    """
+    return _morfologia(imagem, elemento, forma, tamanho, iteracoes, erosao=True, destino=destino)
+
+
+def dilatar(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None, destino=None):
+    """
+    @brief Dilatação: cada pixel recebe o máximo da vizinhança definida pelo elemento.
+
+    @details
+    Mesmo resultado de cv2.dilate(imagem, elemento, iterations=iteracoes). Parâmetros
+    como em erodir().
+    """
+    return _morfologia(imagem, elemento, forma, tamanho, iteracoes, erosao=False, destino=destino)
+
+
+def abrir(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+    """
+    @brief Abertura (erosão seguida de dilatação): remove pontos e ruídos menores que o elemento.
+    """
+    erodida = erodir(imagem, tamanho, forma, iteracoes, elemento)
+    return dilatar(erodida, tamanho, forma, iteracoes, elemento)
+
+
+def fechar(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+    """
+    @brief Fechamento (dilatação seguida de erosão): preenche buracos menores que o elemento.
+    """
+    dilatada = dilatar(imagem, tamanho, forma, iteracoes, elemento)
+    return erodir(dilatada, tamanho, forma, iteracoes, elemento)
+
+
+def gradiente(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+    """
+    @brief Gradiente morfológico (dilatação menos erosão): contorno dos objetos.
+    """
+    dilatada = dilatar(imagem, tamanho, forma, iteracoes, elemento)
+    erodida = erodir(imagem, tamanho, forma, iteracoes, elemento)
+    return cv2.subtract(dilatada, erodida)
+
+
+def topo_chapeu(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+    """
+    @brief Top-hat (imagem menos a abertura): detalhes claros menores que o elemento.
+    """
+    return cv2.subtract(imagem, abrir(imagem, tamanho, forma, iteracoes, elemento))
+
+
+def chapeu_preto(imagem, tamanho=5, forma="elipse", iteracoes=1, elemento=None):
+    """
+    @brief Black-hat (fechamento menos a imagem): detalhes escuros menores que o elemento.
+    """
+    return cv2.subtract(fechar(imagem, tamanho, forma, iteracoes, elemento), imagem)
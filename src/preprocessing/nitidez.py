@@ -0,0 +1,103 @@
+"""
+@brief Aguçamento (máscara de nitidez e Laplaciano) calculado com sinal e saturado só no final.
+
+@details
+Em chapter_seven, desaguçamento faz `3 * cv2.subtract(imagem, suavizada)` em uint8: a
+subtração satura em 0 (os detalhes negativos, o lado escuro de cada borda, se perdem) e
+a multiplicação por 3 dá a volta em 256 (valores acima de 85 viram lixo). Da mesma forma,
+o Laplaciano com saída CV_8U corta a metade negativa da resposta.
+
+Aqui os detalhes são tratados com sinal, e as etapas são fundidas:
+    - máscara de nitidez: imagem + q · (imagem - suavizada) = (1 + q) · imagem - q · suavizada,
+      uma única chamada de cv2.addWeighted (calculada em ponto flutuante e saturada só
+      no resultado) depois do Gaussiano;
+    - Laplaciano: imagem - q · Laplaciano é uma convolução com o kernel δ - q · L, feita
+      em uma única passada de cv2.filter2D.
+
+Exemplo:
+
+    nitida = mascara_de_nitidez(imagem, raio=3, quantidade=1.5, limiar=4)
+    realce = nitidez_laplaciana(imagem, quantidade=1)
+    bordas = laplaciano(imagem)           # int16, com sinal
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def _kernel_laplaciano(tamanho):
+    # Kernel de cv2.Laplacian: 3x3 fixo com tamanho 1, soma das segundas derivadas nos demais
+    if tamanho == 1:
+        return np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]], dtype=np.float32)
+    kx, ky = cv2.getDerivKernels(2, 0, tamanho)
+    kernel = np.outer(ky, kx)
+    kx, ky = cv2.getDerivKernels(0, 2, tamanho)
+    return (kernel + np.outer(ky, kx)).astype(np.float32)
+
+
+def laplaciano(imagem, tamanho=1, destino=None):
+    """
+    @brief Laplaciano com sinal (int16 para imagens de 8 bits; float32 nos demais casos).
+
+    @param imagem: Imagem de entrada.
+    @param tamanho: Abertura do kernel (1, 3, 5 ou 7), como em cv2.Laplacian.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Laplaciano sem corte dos valores negativos.
+    """
+    profundidade = cv2.CV_16S if imagem.dtype == np.uint8 else cv2.CV_32F
+    return cv2.Laplacian(imagem, profundidade, dst=destino, ksize=tamanho)
+
+
+def nitidez_laplaciana(imagem, quantidade=1.0, tamanho=1, destino=None):
+    """
+    @brief Realça as bordas subtraindo o Laplaciano: imagem - quantidade · Laplaciano.
+
+    @details
+    Feito como uma única convolução com o kernel δ - quantidade · L, sem array
+    intermediário e com saturação apenas no resultado. Com quantidade=1 e tamanho=1 é a
+    versão correta de chapter_seven.aguçamento_de_borda (que cortava o Laplaciano negativo).
+
+    @param imagem: Imagem de entrada (qualquer número de canais).
+    @param quantidade: Peso do Laplaciano.
+    @param tamanho: Abertura do kernel do Laplaciano (1, 3, 5 ou 7).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem realçada, no tipo da entrada.
+    """
+    kernel = -quantidade * _kernel_laplaciano(tamanho)
+    kernel[kernel.shape[0] // 2, kernel.shape[1] // 2] += 1
+    return cv2.filter2D(imagem, -1, kernel, dst=destino)
+
+
+def mascara_de_nitidez(imagem, raio=3, quantidade=1.0, limiar=0, tamanho=0, destino=None):
+    """
+    @brief Máscara de nitidez (unsharp mask): imagem + quantidade · (imagem - Gaussiano).
+
+    @details
+    O Gaussiano é a única passada intermediária; subtração, escala e soma são uma
+    chamada de cv2.addWeighted, com os detalhes negativos preservados e a saturação
+    aplicada uma só vez. Com `limiar` > 0, os pixels cujo detalhe |imagem - Gaussiano| é
+    menor que o limiar ficam como estão, o que evita realçar ruído em regiões lisas.
+
+    @param imagem: Imagem de entrada (uint8, uint16 ou float; qualquer número de canais).
+    @param raio: Desvio padrão do Gaussiano, em pixels.
+    @param quantidade: Intensidade do realce (1 = detalhes dobrados).
+    @param limiar: Menor detalhe realçado, em níveis de cinza.
+    @param tamanho: Lado do kernel Gaussiano; 0 o calcula a partir do raio.
+    @param destino: Array de saída pré-alocado (opcional); pode ser a própria imagem.
+    @return Imagem realçada, no tipo da entrada.
+    """
+    suavizada = cv2.GaussianBlur(imagem, (tamanho, tamanho), raio)
+    if limiar <= 0:
+        return cv2.addWeighted(imagem, 1 + quantidade, suavizada, -quantidade, 0, dst=destino)
+
+    # A máscara e a cópia dos pixels mantidos leem a imagem original, por isso o realce é
+    # montado no buffer do Gaussiano e só então escrito em `destino` (que pode ser a imagem)
+    mantidos = cv2.absdiff(imagem, suavizada) < limiar
+    resultado = cv2.addWeighted(imagem, 1 + quantidade, suavizada, -quantidade, 0, dst=suavizada)
+    np.copyto(resultado, imagem, where=mantidos)
+    if destino is None:
+        return resultado
+    np.copyto(destino, resultado)
+    return destino
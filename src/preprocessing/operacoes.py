@@ -0,0 +1,361 @@
+import unicodedata
+
+import cv2
+import numpy as np
+
+from src.preprocessing.bordas import gradientes
+from src.preprocessing.colorizacao import colorir_pb_antiga
+from src.preprocessing.geometria import Transformacao
+from src.preprocessing.limiarizacao import binarizar, limiar_adaptativo
+from src.preprocessing.mediana import filtro_de_percentil, mediana_16bits
+from src.preprocessing.morfologia import erodir
+from src.preprocessing.nitidez import laplaciano, mascara_de_nitidez, nitidez_laplaciana
+from src.preprocessing.suavizacao import ImagemIntegral, filtro_guiado, gaussiano_por_caixas, parametros_guiados
+from src.preprocessing.tons import ajustar_tons
+from src.utils.buffers import pool_padrao
+
+
+# Todas as operações aceitam `destino`: um array já alocado (ex.: obtido de
+# src.utils.buffers.PoolDeBuffers), com a forma e o tipo do resultado, onde o resultado é
+# escrito e que é devolvido. Sem ele, o resultado é alocado a cada chamada.
+
+
+def converter_para_cinza(imagem, destino=None):
+    """
+    @brief Converte uma imagem BGR para tons de cinza.
+
+    @details
+    Imagens que já possuem um único canal são devolvidas sem alteração (ou copiadas para
+    `destino`), o que permite encadear esta função antes de operações que exigem entrada
+    em escala de cinza.
+
+    @param imagem: Imagem BGR ou em tons de cinza (np.ndarray).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem em tons de cinza (np.ndarray 2D).
+    """
+    if imagem.ndim == 2:
+        if destino is None:
+            return imagem
+        np.copyto(destino, imagem)
+        return destino
+    return cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY, dst=destino)
+
+
+def _modo_desconhecido(modo, modos):
+    return ValueError(f"Modo desconhecido: {modo}. Use {' ou '.join(repr(nome) for nome in modos)}.")
+
+
+def filtro_de_média(imagem, tamanho=5, modo="exato", destino=None):
+    """
+    @brief Aplica o filtro de média com kernel tamanho x tamanho.
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param tamanho: Lado do kernel quadrado (padrão 5, como em chapter_six).
+    @param modo: "exato" usa cv2.blur (somas corridas do OpenCV); "integral" usa
+                 src.preprocessing.suavizacao.ImagemIntegral (mesmo resultado em lados ímpares).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem suavizada.
+    """
+    if modo == "exato":
+        return cv2.blur(imagem, (tamanho, tamanho), dst=destino)
+    if modo == "integral":
+        return ImagemIntegral(imagem, tamanho // 2).media(tamanho, destino)
+    raise _modo_desconhecido(modo, ("exato", "integral"))
+
+
+def filtro_gaussiano(imagem, tamanho=5, sigma=0, modo="exato", passes=3, destino=None):
+    """
+    @brief Aplica o filtro Gaussiano, exato (cv2.GaussianBlur) ou aproximado por filtros de caixa.
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param tamanho: Lado do kernel (ímpar, padrão 5).
+    @param sigma: Desvio padrão; 0 faz o OpenCV calculá-lo a partir do kernel.
+    @param modo: "exato" ou "rapido" (src.preprocessing.suavizacao.gaussiano_por_caixas,
+                 custo independente do tamanho; compensa em kernels grandes).
+    @param passes: Número de caixas no modo "rapido".
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem suavizada.
+    """
+    if modo == "exato":
+        return cv2.GaussianBlur(imagem, (tamanho, tamanho), sigma, dst=destino)
+    if modo == "rapido":
+        return gaussiano_por_caixas(imagem, tamanho, sigma, passes, destino)
+    raise _modo_desconhecido(modo, ("exato", "rapido"))
+
+
+def filtro_de_mediana(imagem, tamanho=3, percentil=50, peso_central=1, destino=None):
+    """
+    @brief Aplica o filtro de mediana (ou de percentil) com janela tamanho x tamanho.
+
+    @details
+    A mediana simples usa cv2.medianBlur sempre que o OpenCV aceita o tipo (uint8, ou
+    janelas até 5); uint16 com janelas maiores usa src.preprocessing.mediana.mediana_16bits.
+    Outros percentis e o peso central usam src.preprocessing.mediana.filtro_de_percentil
+    (uint8 e uint16). Todos os caminhos têm custo constante em relação ao tamanho.
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param tamanho: Abertura da janela (ímpar, padrão 3).
+    @param percentil: Percentil de 0 a 100 (50 = mediana).
+    @param peso_central: Número de vezes que o pixel central é contado.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem filtrada.
+    """
+    if percentil == 50 and peso_central == 1:
+        if imagem.dtype == np.uint8 or tamanho <= 5:
+            return cv2.medianBlur(imagem, tamanho, dst=destino)
+        if imagem.dtype == np.uint16:
+            return mediana_16bits(imagem, tamanho, destino)
+    return filtro_de_percentil(imagem, tamanho, percentil, peso_central, destino)
+
+
+def filtro_bilateral(imagem, diametro=8, sigma_cor=10, sigma_espaco=10, modo="exato", reducao=1,
+                     destino=None):
+    """
+    @brief Suaviza preservando bordas: filtro bilateral (cv2.bilateralFilter) ou filtro guiado.
+
+    @details
+    No modo "guiado" os parâmetros do bilateral são traduzidos para o filtro guiado
+    (src.preprocessing.suavizacao.parametros_guiados), cujo custo não cresce com o
+    diâmetro. O resultado se aproxima do bilateral, mas não é idêntico.
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param diametro: Diâmetro da vizinhança de cada pixel.
+    @param sigma_cor: Desvio padrão no espaço de cores.
+    @param sigma_espaco: Desvio padrão no espaço de coordenadas.
+    @param modo: "exato" ou "guiado".
+    @param reducao: Subamostragem dos coeficientes do filtro guiado (1 = sem redução).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem filtrada.
+    """
+    if modo == "exato":
+        return cv2.bilateralFilter(imagem, diametro, sigma_cor, sigma_espaco, dst=destino)
+    if modo == "guiado":
+        raio, eps = parametros_guiados(diametro, sigma_cor, sigma_espaco)
+        return filtro_guiado(imagem, raio, eps, reducao=reducao, destino=destino)
+    raise _modo_desconhecido(modo, ("exato", "guiado"))
+
+
+def operador_sobel(imagem, dx=1, dy=0, tamanho=3, destino=None):
+    """
+    @brief Módulo da derivada de Sobel em uma direção, em 8 bits.
+
+    @details
+    A derivada é calculada com sinal (CV_16S em imagens de 8 bits, CV_32F nas demais) e
+    convertida com cv2.convertScaleAbs: bordas de claro para escuro aparecem tanto quanto
+    as de escuro para claro. Com saída CV_8U direta, as derivadas negativas eram cortadas
+    em 0. Para os gradientes com sinal, use src.preprocessing.bordas.gradientes.
+
+    @param imagem: Imagem de entrada, preferencialmente em tons de cinza.
+    @param dx: Ordem da derivada em X (1 para Sobel X).
+    @param dy: Ordem da derivada em Y (1 para Sobel Y).
+    @param tamanho: Tamanho do kernel de Sobel.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem de bordas na direção escolhida.
+    """
+    profundidade = cv2.CV_16S if imagem.dtype == np.uint8 else cv2.CV_32F
+    return cv2.convertScaleAbs(cv2.Sobel(imagem, profundidade, dx, dy, ksize=tamanho), dst=destino)
+
+
+def operador_laplaciano(imagem, destino=None):
+    """
+    @brief Módulo do Laplaciano em 8 bits (bordas claras e escuras aparecem).
+
+    @details
+    O Laplaciano é calculado com sinal (ver src.preprocessing.nitidez.laplaciano) e
+    convertido com cv2.convertScaleAbs; com saída CV_8U direta, a metade negativa da
+    resposta era cortada em 0.
+
+    @param imagem: Imagem de entrada, preferencialmente em tons de cinza.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem de bordas.
+    """
+    return cv2.convertScaleAbs(laplaciano(imagem), dst=destino)
+
+
+def aguçamento_de_borda(imagem, destino=None):
+    """
+    @brief Subtrai o Laplaciano da imagem original para realçar as bordas.
+
+    @details
+    O Laplaciano entra com sinal e a subtração é fundida em uma única convolução, com
+    saturação só no resultado (ver src.preprocessing.nitidez.nitidez_laplaciana).
+
+    @param imagem: Imagem de entrada, preferencialmente em tons de cinza.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem aguçada.
+    """
+    return nitidez_laplaciana(imagem, 1, 1, destino)
+
+
+def desaguçamento(imagem, tamanho=13, sigma=3, intensidade=3, destino=None):
+    """
+    @brief Aplica a máscara de desaguçamento (unsharp mask) de chapter_seven.
+
+    @details
+    Suaviza a imagem, extrai os detalhes subtraindo a versão suavizada, multiplica os
+    detalhes por `intensidade` e os soma de volta à original. Os detalhes são tratados
+    com sinal e saturados só no final (ver src.preprocessing.nitidez.mascara_de_nitidez);
+    a versão em uint8 perdia os detalhes negativos e dava a volta em 256.
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param tamanho: Lado do kernel Gaussiano (padrão 13).
+    @param sigma: Desvio padrão do Gaussiano (padrão 3).
+    @param intensidade: Fator aplicado à máscara de detalhes (padrão 3).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem realçada.
+    """
+    return mascara_de_nitidez(imagem, sigma, intensidade, 0, tamanho, destino)
+
+
+def canny(imagem, limiar_inferior=100, limiar_superior=200, limiar=None, tamanho=3, l2=False, destino=None):
+    """
+    @brief Aplica o detector de bordas de Canny.
+
+    @details
+    Os gradientes vêm de src.preprocessing.bordas.gradientes e ficam guardados com a
+    imagem (somente leitura): testar outros limiares na mesma imagem não refaz o Sobel.
+    O resultado é o mesmo de cv2.Canny(imagem, limiar_inferior, limiar_superior).
+
+    @param imagem: Imagem de entrada de 8 bits.
+    @param limiar_inferior: Limiar inferior da histerese (padrão 100).
+    @param limiar_superior: Limiar superior da histerese (padrão 200).
+    @param limiar: None usa os limiares informados; "mediana", "otsu" ou "percentil" os
+                   escolhe pelo histograma da magnitude (ver bordas.Gradientes.limiares).
+    @param tamanho: Tamanho do kernel de Sobel (3, 5 ou 7).
+    @param l2: True usa a norma L2 do gradiente.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem binária com as bordas em branco.
+    """
+    gradiente = gradientes(imagem, tamanho, l2)
+    if limiar is not None:
+        return gradiente.canny(metodo=limiar, destino=destino)
+    return gradiente.canny(limiar_inferior, limiar_superior, destino=destino)
+
+
+def equalizar_histograma(imagem, destino=None):
+    """
+    @brief Equaliza o histograma de uma imagem, convertendo-a para cinza se necessário.
+
+    @details
+    A conversão para cinza usa um array temporário do pool compartilhado
+    (src.utils.buffers), devolvido ao final.
+
+    @param imagem: Imagem BGR ou em tons de cinza de 8 bits.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem em tons de cinza equalizada.
+    """
+    if imagem.ndim == 2:
+        return cv2.equalizeHist(imagem, dst=destino)
+    with pool_padrao.emprestar(imagem.shape[:2], imagem.dtype) as cinza:
+        return cv2.equalizeHist(converter_para_cinza(imagem, cinza), dst=destino)
+
+
+def erosão(imagem, tamanho=5, iteracoes=5, destino=None):
+    """
+    @brief Aplica erosão com elemento estruturante elíptico, como em chapter_eight.
+
+    @param imagem: Imagem de entrada (geralmente binária).
+    @param tamanho: Lado do elemento estruturante elíptico (padrão 5).
+    @param iteracoes: Número de vezes que a erosão é aplicada (padrão 5).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem erodida (mesmo resultado de cv2.erode; ver src.preprocessing.morfologia).
+    """
+    return erodir(imagem, tamanho, "elipse", iteracoes, destino=destino)
+
+
+def rotacionar(imagem, angulo=90, escala=1, destino=None):
+    """
+    @brief Rotaciona a imagem em torno do centro, mantendo o tamanho (chapter_five.rotacionar).
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param angulo: Ângulo em graus, no sentido anti-horário (padrão 90).
+    @param escala: Fator de escala aplicado junto com a rotação.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem rotacionada.
+    """
+    altura, largura = imagem.shape[:2]
+    return Transformacao().rotacionar(angulo, (largura / 2, altura / 2), escala).aplicar(imagem, destino=destino)
+
+
+def transladar(imagem, dx=100, dy=100, destino=None):
+    """
+    @brief Desloca a imagem dx pixels para a direita e dy para baixo (chapter_five.transladar).
+    """
+    return Transformacao().transladar(dx, dy).aplicar(imagem, destino=destino)
+
+
+def escalonar(imagem, fator=2, interpolacao=cv2.INTER_CUBIC, destino=None):
+    """
+    @brief Redimensiona a imagem pelo fator dado (chapter_five.escalonar: 2x, bicúbica).
+    """
+    return cv2.resize(imagem, None, dst=destino, fx=fator, fy=fator, interpolation=interpolacao)
+
+
+def ajustar_perspectiva(imagem, pontos_iniciais=((80, 100), (1230, 80), (60, 720), (1240, 730)),
+                        tamanho_saida=(800, 600), destino=None):
+    """
+    @brief Retifica a região delimitada por 4 pontos para um retângulo (chapter_five.ajustar_perspectiva).
+
+    @param imagem: Imagem de entrada (np.ndarray).
+    @param pontos_iniciais: Cantos (x, y) da região: superior esquerdo, superior direito,
+                            inferior esquerdo e inferior direito.
+    @param tamanho_saida: Tamanho (largura, altura) do retângulo de saída.
+    @return Imagem retificada.
+    """
+    largura, altura = tamanho_saida
+    pontos_finais = ((0, 0), (largura, 0), (0, altura), (largura, altura))
+    return Transformacao().perspectiva(pontos_iniciais, pontos_finais).aplicar(imagem, tamanho_saida,
+                                                                               destino=destino)
+
+
+# Registro das operações disponíveis pelo nome usado nos capítulos
+OPERACOES = {
+    "converter_para_cinza": converter_para_cinza,
+    "filtro_de_média":      filtro_de_média,
+    "filtro_gaussiano":     filtro_gaussiano,
+    "filtro_de_mediana":    filtro_de_mediana,
+    "filtro_bilateral":     filtro_bilateral,
+    "operador_sobel":       operador_sobel,
+    "operador_laplaciano":  operador_laplaciano,
+    "aguçamento_de_borda":  aguçamento_de_borda,
+    "desaguçamento":        desaguçamento,
+    "mascara_de_nitidez":   mascara_de_nitidez,
+    "canny":                canny,
+    "equalizar_histograma": equalizar_histograma,
+    "ajustar_tons":         ajustar_tons,
+    "colorir_pb_antiga":    colorir_pb_antiga,
+    "erosão":               erosão,
+    "binarizar":            binarizar,
+    "limiar_adaptativo":    limiar_adaptativo,
+    "rotacionar":           rotacionar,
+    "transladar":           transladar,
+    "escalonar":            escalonar,
+    "ajustar_perspectiva":  ajustar_perspectiva,
+}
+
+
+def _sem_acentos(texto):
+    # Remove acentos para permitir nomes digitados sem eles (ex.: "erosao")
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def obter_operacao(nome):
+    """
+    @brief Busca uma operação registrada pelo nome.
+
+    @details
+    O nome pode ser digitado com ou sem acentos ("filtro_de_media" encontra
+    "filtro_de_média").
+
+    @param nome: Nome da operação, igual ao da função no capítulo correspondente.
+    @return A função da operação.
+    @exception KeyError Se nenhuma operação com esse nome estiver registrada.
+    """
+    if nome in OPERACOES:
+        return OPERACOES[nome]
+
+    for nome_registrado, operacao in OPERACOES.items():
+        if _sem_acentos(nome_registrado) == _sem_acentos(nome):
+            return operacao
+
+    raise KeyError(f"Operação desconhecida: {nome}. Disponíveis: {', '.join(OPERACOES)}")
@@ -0,0 +1,221 @@
+"""
+@brief Pirâmides Gaussiana e Laplaciana com níveis calculados sob demanda e guardados por imagem.
+
+@details
+O nível 0 é a própria imagem e cada nível seguinte tem metade da largura e da altura do
+anterior (cv2.pyrDown). Um nível só é calculado quando pedido, a partir do nível
+imediatamente anterior, e fica guardado: pedir o nível 2 duas vezes, ou os níveis 1 e 2,
+reduz a imagem apenas duas vezes no total. Com piramide(imagem) os níveis ficam nas
+representações derivadas da imagem (src.utils.cache_de_imagem) e são compartilhados por
+todos os módulos que trabalham com a mesma imagem.
+
+Exemplo (detecção grossa em 1/4 da resolução, refinamento apenas nas regiões achadas):
+
+    pir = piramide(imagem)
+    previa = pir.aplicar("filtro_gaussiano", nivel=2)
+    resultados = pir.grosso_para_fino(detectar_regioes, refinar_regiao, nivel=2)
+"""
+import cv2
+import numpy as np
+
+from src.utils.cache_de_imagem import derivadas
+
+
+class Piramide:
+    """
+    @brief Pirâmide Gaussiana (e Laplaciana) de uma imagem, construída sob demanda.
+
+    @param imagem: Imagem de entrada (nível 0), em tons de cinza ou colorida.
+    @param niveis: Número máximo de níveis, contando o original; None desce até um lado
+                   da imagem chegar a 1 pixel.
+    @param _niveis_guardados: Dicionário compartilhado com os níveis já calculados (usado
+                              por piramide() para reaproveitar níveis entre chamadas).
+    """
+
+    def __init__(self, imagem, niveis=None, _niveis_guardados=None):
+        self.imagem = imagem
+
+        altura, largura = imagem.shape[:2]
+        maximo = int(np.floor(np.log2(min(altura, largura)))) + 1
+        self.niveis = maximo if niveis is None else min(niveis, maximo)
+
+        # Os níveis guardados não incluem a imagem original, para que o cache por imagem
+        # não mantenha a própria imagem viva
+        if _niveis_guardados is None:
+            _niveis_guardados = {"gaussianos": [], "laplacianos": {}}
+        self._gaussianos = _niveis_guardados["gaussianos"]
+        self._laplacianos = _niveis_guardados["laplacianos"]
+
+    def _verificar(self, nivel):
+        if not 0 <= nivel < self.niveis:
+            raise IndexError(f"Nível {nivel} fora da pirâmide (0 a {self.niveis - 1}).")
+
+    def nivel(self, nivel):
+        """
+        @brief Nível da pirâmide Gaussiana (0 = imagem original).
+
+        @details
+        Os arrays devolvidos são somente leitura, pois são compartilhados; use .copy()
+        para alterá-los.
+        """
+        self._verificar(nivel)
+        if nivel == 0:
+            return self.imagem
+
+        while len(self._gaussianos) < nivel:
+            anterior = self.imagem if not self._gaussianos else self._gaussianos[-1]
+            reduzido = cv2.pyrDown(anterior)
+            reduzido.flags.writeable = False
+            self._gaussianos.append(reduzido)
+        return self._gaussianos[nivel - 1]
+
+    def __getitem__(self, nivel):
+        return self.nivel(nivel)
+
+    def __len__(self):
+        return self.niveis
+
+    def laplaciano(self, nivel):
+        """
+        @brief Nível da pirâmide Laplaciana: detalhes perdidos entre o nível e o seguinte.
+
+        @details
+        L[i] = G[i] - pyrUp(G[i + 1]). Para imagens de 8 bits o resultado é int16 (tem
+        sinal), de modo que reconstruir() devolve exatamente a imagem original. O último
+        nível é o próprio nível Gaussiano mais grosso.
+        """
+        self._verificar(nivel)
+        gaussiano = self.nivel(nivel)
+        tipo = np.int16 if gaussiano.dtype == np.uint8 else np.float32
+
+        # O último nível depende de quantos níveis a pirâmide tem, por isso não é guardado
+        if nivel == self.niveis - 1:
+            return gaussiano.astype(tipo)
+
+        if nivel not in self._laplacianos:
+            altura, largura = gaussiano.shape[:2]
+            ampliado = cv2.pyrUp(self.nivel(nivel + 1), dstsize=(largura, altura))
+            laplaciano = cv2.subtract(gaussiano, ampliado, dtype=cv2.CV_16S if tipo == np.int16 else cv2.CV_32F)
+            laplaciano.flags.writeable = False
+            self._laplacianos[nivel] = laplaciano
+        return self._laplacianos[nivel]
+
+    @staticmethod
+    def reconstruir(laplacianos):
+        """
+        @brief Reconstrói a imagem a partir dos níveis Laplacianos (do mais fino ao mais grosso).
+
+        @details
+        Útil para editar bandas de frequência separadamente (ex.: realçar ou atenuar os
+        detalhes de um nível) e voltar à imagem. Níveis int16 (de imagens de 8 bits) são
+        reconstruídos em 8 bits, com os mesmos arredondamentos da construção, o que devolve
+        exatamente a imagem original quando os níveis não foram alterados.
+
+        @param laplacianos: Lista de níveis Laplacianos, como os de laplaciano(0), laplaciano(1), ...
+        @return Imagem reconstruída (uint8 para níveis int16; float32 nos demais casos).
+        """
+        oito_bits = laplacianos[-1].dtype == np.int16
+        imagem = laplacianos[-1]
+        if oito_bits:
+            imagem = np.clip(imagem, 0, 255).astype(np.uint8)
+
+        for detalhe in reversed(laplacianos[:-1]):
+            altura, largura = detalhe.shape[:2]
+            ampliado = cv2.pyrUp(imagem, dstsize=(largura, altura))
+            if oito_bits:
+                imagem = np.clip(cv2.add(ampliado, detalhe, dtype=cv2.CV_16S), 0, 255).astype(np.uint8)
+            else:
+                imagem = ampliado + detalhe
+        return imagem
+
+    def escala(self, nivel):
+        """
+        @brief Fator entre o tamanho original e o do nível (2 ** nivel).
+        """
+        return 2 ** nivel
+
+    def para_original(self, regiao, nivel):
+        """
+        @brief Converte uma região (x, y, largura, altura) de um nível para a imagem original.
+        """
+        fator = self.escala(nivel)
+        altura, largura = self.imagem.shape[:2]
+        x, y, largura_regiao, altura_regiao = (int(valor * fator) for valor in regiao)
+        return x, y, min(largura_regiao, largura - x), min(altura_regiao, altura - y)
+
+    def para_nivel(self, regiao, nivel):
+        """
+        @brief Converte uma região (x, y, largura, altura) da imagem original para um nível.
+        """
+        fator = self.escala(nivel)
+        x, y, largura_regiao, altura_regiao = regiao
+        x0, y0 = x // fator, y // fator
+        x1, y1 = -(-(x + largura_regiao) // fator), -(-(y + altura_regiao) // fator)
+        return x0, y0, x1 - x0, y1 - y0
+
+    def aplicar(self, operacao, nivel=2, ampliar=False, interpolacao=cv2.INTER_LINEAR, **parametros):
+        """
+        @brief Aplica uma operação a um nível da pirâmide (prévias e detecção barata).
+
+        @param operacao: Nome de uma operação de src.preprocessing.operacoes ou uma função
+                         que recebe a imagem.
+        @param nivel: Nível em que a operação roda (2 = 1/4 da largura e da altura).
+        @param ampliar: True redimensiona o resultado para o tamanho original.
+        @param interpolacao: Interpolação da ampliação (use cv2.INTER_NEAREST para
+                             resultados binários, como bordas).
+        @param parametros: Parâmetros repassados à operação.
+        @return Resultado da operação no tamanho do nível (ou no original, com ampliar=True).
+        """
+        if isinstance(operacao, str):
+            # Importada aqui: operacoes usa src.preprocessing.bordas, que usa esta pirâmide
+            from src.preprocessing.operacoes import obter_operacao
+            operacao = obter_operacao(operacao)
+        resultado = operacao(self.nivel(nivel), **parametros)
+
+        if ampliar and nivel > 0:
+            altura, largura = self.imagem.shape[:2]
+            resultado = cv2.resize(resultado, (largura, altura), interpolation=interpolacao)
+        return resultado
+
+    def grosso_para_fino(self, detectar, refinar, nivel=2, margem=0):
+        """
+        @brief Detecta regiões em um nível grosso e processa só essas regiões na resolução original.
+
+        @param detectar: Função que recebe a imagem do nível e devolve regiões
+                         (x, y, largura, altura) nas coordenadas desse nível.
+        @param refinar: Função que recebe o recorte da imagem original de cada região.
+        @param nivel: Nível usado na detecção.
+        @param margem: Pixels (na resolução original) acrescentados em volta de cada região.
+        @return Lista de tuplas (regiao_original, resultado), uma por região detectada.
+        """
+        altura, largura = self.imagem.shape[:2]
+        resultados = []
+        for regiao in detectar(self.nivel(nivel)):
+            x, y, largura_regiao, altura_regiao = self.para_original(regiao, nivel)
+            x0, y0 = max(x - margem, 0), max(y - margem, 0)
+            x1 = min(x + largura_regiao + margem, largura)
+            y1 = min(y + altura_regiao + margem, altura)
+
+            regiao_original = (x0, y0, x1 - x0, y1 - y0)
+            resultados.append((regiao_original, refinar(self.imagem[y0:y1, x0:x1])))
+        return resultados
+
+
+def piramide(imagem, niveis=None):
+    """
+    @brief Pirâmide da imagem cujos níveis são guardados e reaproveitados entre chamadas.
+
+    @details
+    Os níveis ficam nas representações derivadas da imagem (src.utils.cache_de_imagem) e
+    são descartados junto com ela. Como nos demais caches por imagem, só imagens somente
+    leitura são guardadas entre chamadas; para as demais, os níveis são reaproveitados
+    apenas dentro da instância devolvida.
+
+    @param imagem: Imagem de entrada.
+    @param niveis: Número máximo de níveis (None = até 1 pixel).
+    @return Instância de Piramide.
+    """
+    tabela = derivadas(imagem)
+    if "piramide" not in tabela:
+        tabela["piramide"] = {"gaussianos": [], "laplacianos": {}}
+    return Piramide(imagem, niveis, tabela["piramide"])
@@ -0,0 +1,285 @@
+"""
+@brief Suavização com kernels grandes a custo constante por pixel.
+
+@details
+cv2.GaussianBlur é separável, mas ainda custa O(tamanho) por pixel: um kernel 101x101
+é dezenas de vezes mais lento que o 5x5 de chapter_six. Já a média em caixa pode ser
+calculada com somas acumuladas (imagem integral), com custo que não depende do tamanho.
+
+Este módulo oferece:
+    - ImagemIntegral: soma de qualquer janela retangular com 4 consultas por pixel.
+    - gaussiano_por_caixas: Gaussiano aproximado por `passes` filtros de caixa empilhados.
+    - filtro_guiado: suavização que preserva bordas feita só de médias em caixa, cujo
+      custo não cresce com o raio, ao contrário de cv2.bilateralFilter.
+    - medir_desvio: PSNR, SSIM e tempo de um modo aproximado em relação ao exato.
+
+Os modos são escolhidos pelas operações de src.preprocessing.operacoes, que continuam
+chamando exatamente o OpenCV no modo padrão ("exato"):
+
+    filtro_de_média(imagem, 101, modo="integral")
+    filtro_gaussiano(imagem, 101, modo="rapido")
+    filtro_bilateral(imagem, modo="guiado")
+"""
+import time
+
+import cv2
+import numpy as np
+
+from src.utils.metricas import psnr, ssim
+
+
+def sigma_padrao(tamanho):
+    """
+    @brief Desvio padrão usado pelo OpenCV quando sigma=0 em cv2.GaussianBlur.
+    """
+    return 0.3 * ((tamanho - 1) * 0.5 - 1) + 0.8
+
+
+def _converter_saida(resultado, dtype, destino=None):
+    # Arredonda (meio para cima) e satura ao voltar para tipos inteiros, como o OpenCV;
+    # `resultado` é um temporário em ponto flutuante e é alterado no lugar
+    if np.issubdtype(dtype, np.integer):
+        limites = np.iinfo(dtype)
+        resultado += 0.5
+        np.floor(resultado, out=resultado)
+        np.clip(resultado, limites.min, limites.max, out=resultado)
+    if destino is None:
+        return resultado.astype(dtype)
+    np.copyto(destino, resultado, casting="unsafe")
+    return destino
+
+
+class ImagemIntegral:
+    """
+    @brief Imagem integral (tabela de somas acumuladas) para somas de janelas em O(1).
+
+    @details
+    A imagem é estendida por `margem` pixels com a mesma reflexão de borda do OpenCV
+    (BORDER_REFLECT_101), para que as médias perto das bordas coincidam com cv2.blur.
+    Depois de calculada, a tabela atende qualquer tamanho de janela até 2 * margem + 1,
+    o que permite obter médias em várias escalas a partir de um único cálculo.
+
+    @param imagem: Imagem em tons de cinza ou colorida.
+    @param margem: Maior raio de janela que será consultado.
+    """
+
+    def __init__(self, imagem, margem):
+        self.forma  = imagem.shape
+        self.dtype  = imagem.dtype
+        self.margem = margem
+
+        estendida = cv2.copyMakeBorder(imagem, margem, margem, margem, margem, cv2.BORDER_REFLECT_101)
+        # float64 evita estouro em imagens grandes (cv2.integral devolve (H+1, W+1[, C]))
+        self.somas = cv2.integral(estendida, sdepth=cv2.CV_64F)
+
+    def somar(self, tamanho):
+        """
+        @brief Soma dos pixels de uma janela tamanho x tamanho centrada em cada pixel.
+
+        @param tamanho: Lado da janela (tupla (largura, altura) ou inteiro).
+        @return Array float64 com a forma da imagem original.
+        """
+        if np.isscalar(tamanho):
+            tamanho = (tamanho, tamanho)
+        largura, altura = tamanho
+
+        # Mesma âncora do OpenCV: o centro da janela fica em tamanho // 2
+        esquerda, topo = largura // 2, altura // 2
+        if max(esquerda, largura - esquerda - 1, topo, altura - topo - 1) > self.margem:
+            raise ValueError(f"Janela {tamanho} maior que a margem da imagem integral ({self.margem}).")
+
+        linhas, colunas = self.forma[:2]
+        y0 = self.margem - topo
+        x0 = self.margem - esquerda
+        y1, x1 = y0 + altura, x0 + largura
+
+        s = self.somas
+        return (s[y1:y1 + linhas, x1:x1 + colunas] - s[y0:y0 + linhas, x1:x1 + colunas]
+                - s[y1:y1 + linhas, x0:x0 + colunas] + s[y0:y0 + linhas, x0:x0 + colunas])
+
+    def media(self, tamanho, destino=None):
+        """
+        @brief Média em caixa (equivalente a cv2.blur) no tipo da imagem original.
+
+        @details
+        Para janelas de lado ímpar o resultado é idêntico ao de cv2.blur. Com lado par o
+        OpenCV usa aritmética de ponto fixo em imagens de 8 bits e alguns pixels podem
+        diferir em 1 nível pelo arredondamento.
+
+        @param tamanho: Lado da janela (tupla (largura, altura) ou inteiro).
+        @param destino: Array de saída pré-alocado (opcional).
+        """
+        if np.isscalar(tamanho):
+            tamanho = (tamanho, tamanho)
+        somas = self.somar(tamanho)
+        somas /= tamanho[0] * tamanho[1]
+        return _converter_saida(somas, self.dtype, destino)
+
+
+def larguras_das_caixas(sigma, passes=3):
+    """
+    @brief Larguras ímpares de `passes` filtros de caixa cuja sequência aproxima um Gaussiano.
+
+    @details
+    Aplicar n filtros de caixa seguidos equivale a convoluir com uma curva que tende ao
+    Gaussiano (teorema central do limite). As larguras são escolhidas para que a variância
+    total, soma de (w² - 1) / 12 de cada caixa, seja a mais próxima possível de sigma²,
+    usando caixas de duas larguras ímpares consecutivas (método de Wells/Kovesi).
+
+    @param sigma: Desvio padrão do Gaussiano desejado.
+    @param passes: Número de caixas.
+    @return Lista com as larguras.
+    """
+    ideal = np.sqrt(12 * sigma ** 2 / passes + 1)
+    menor = int(np.floor(ideal))
+    if menor % 2 == 0:
+        menor -= 1
+    menor = max(menor, 1)
+    maior = menor + 2
+
+    # Quantas caixas usam a largura menor para acertar a variância
+    quantidade = round((12 * sigma ** 2 - passes * menor ** 2 - 4 * passes * menor - 3 * passes)
+                       / (-4 * menor - 4))
+    quantidade = min(max(quantidade, 0), passes)
+    return [menor] * quantidade + [maior] * (passes - quantidade)
+
+
+def gaussiano_por_caixas(imagem, tamanho=5, sigma=0, passes=3, destino=None):
+    """
+    @brief Gaussiano aproximado por `passes` filtros de caixa empilhados.
+
+    @details
+    A imagem passa por `passes` filtros de caixa (cv2.boxFilter em float32, sem
+    arredondar entre os passes), cada um com custo independente do tamanho. Nas imagens
+    de data/raw, com 3 passes, o erro médio em relação a cv2.GaussianBlur fica entre 0,05
+    e 0,5 nível de cinza e cresce com o kernel (cerca de 0,5 em 101x101), com máximo de 2
+    a 8 níveis. Como as caixas têm larguras ímpares, a variância só é aproximada, e mais
+    passes nem sempre reduzem o erro; 6 passes ficam abaixo de 0,3 nível até 101x101.
+    O modo só compensa para kernels grandes: em 1080p ele empata com o exato perto de
+    31x31 e é cerca de 3x mais rápido em 101x101.
+
+    @param imagem: Imagem de entrada.
+    @param tamanho: Lado do kernel Gaussiano equivalente, usado para derivar sigma.
+    @param sigma: Desvio padrão; 0 o deriva do tamanho, como no OpenCV.
+    @param passes: Número de caixas (controle de precisão x velocidade).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem suavizada, no tipo da entrada.
+    """
+    if sigma <= 0:
+        sigma = sigma_padrao(tamanho)
+
+    resultado = imagem
+    for largura in larguras_das_caixas(sigma, passes):
+        resultado = cv2.boxFilter(resultado, cv2.CV_32F, (largura, largura))
+    if resultado is imagem:
+        resultado = imagem.astype(np.float32)
+    return _converter_saida(resultado, imagem.dtype, destino)
+
+
+def filtro_guiado(imagem, raio=4, eps=100.0, guia=None, reducao=1, destino=None):
+    """
+    @brief Filtro guiado (He et al., 2010): suavização que preserva bordas em tempo O(1) por pixel.
+
+    @details
+    Em cada janela de raio `raio`, a saída é modelada como uma função linear da guia,
+    q = a * guia + b. Em regiões planas (variância local bem menor que `eps`) a ≈ 0 e a
+    saída é a média local; perto de bordas (variância maior que `eps`) a ≈ 1 e a borda é
+    mantida. Todas as etapas são médias em caixa (cv2.boxFilter), cujo custo não depende
+    do raio, ao contrário de cv2.bilateralFilter.
+
+    Com `reducao` > 1 os coeficientes a e b são calculados em uma versão reduzida da
+    imagem e ampliados depois (fast guided filter), o que divide o custo por cerca de
+    reducao² com pouca perda de qualidade.
+
+    @param imagem: Imagem a filtrar (cinza ou colorida; canais são filtrados separadamente).
+    @param raio: Raio da janela em pixels.
+    @param eps: Regularização, na escala de intensidade² (ex.: 10² para "diferenças de ~10 níveis").
+    @param guia: Imagem guia com a mesma forma; None usa a própria imagem.
+    @param reducao: Fator de subamostragem dos coeficientes (1 = sem redução).
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem filtrada, no tipo da entrada.
+    """
+    p = imagem.astype(np.float32)
+    g = p if guia is None else guia.astype(np.float32)
+    altura, largura = imagem.shape[:2]
+
+    if reducao > 1:
+        tamanho_reduzido = (max(1, largura // reducao), max(1, altura // reducao))
+        p_reduzida = cv2.resize(p, tamanho_reduzido, interpolation=cv2.INTER_AREA)
+        g_reduzida = p_reduzida if guia is None else cv2.resize(g, tamanho_reduzido, interpolation=cv2.INTER_AREA)
+        raio_reduzido = max(1, round(raio / reducao))
+    else:
+        p_reduzida, g_reduzida, raio_reduzido = p, g, raio
+
+    janela = (2 * raio_reduzido + 1, 2 * raio_reduzido + 1)
+
+    def media(valores):
+        return cv2.boxFilter(valores, cv2.CV_32F, janela)
+
+    media_g  = media(g_reduzida)
+    media_p  = media(p_reduzida)
+    var_g    = media(g_reduzida * g_reduzida) - media_g * media_g
+    cov_gp   = media(g_reduzida * p_reduzida) - media_g * media_p
+
+    a = cov_gp / (var_g + eps)
+    b = media_p - a * media_g
+
+    media_a = media(a)
+    media_b = media(b)
+    if reducao > 1:
+        media_a = cv2.resize(media_a, (largura, altura), interpolation=cv2.INTER_LINEAR)
+        media_b = cv2.resize(media_b, (largura, altura), interpolation=cv2.INTER_LINEAR)
+
+    media_a *= g
+    media_a += media_b
+    return _converter_saida(media_a, imagem.dtype, destino)
+
+
+def parametros_guiados(diametro=8, sigma_cor=10, sigma_espaco=10):
+    """
+    @brief Raio e eps do filtro guiado equivalentes aos parâmetros de cv2.bilateralFilter.
+
+    @details
+    O raio é metade do diâmetro (ou 1,5 * sigma_espaco quando diametro <= 0, como no
+    OpenCV) e eps = sigma_cor², de modo que diferenças de intensidade maiores que
+    sigma_cor sejam tratadas como bordas. O resultado não é idêntico ao bilateral;
+    use medir_desvio() para quantificar a diferença em suas imagens.
+
+    @return Par (raio, eps).
+    """
+    raio = diametro // 2 if diametro > 0 else int(round(sigma_espaco * 1.5))
+    return max(raio, 1), float(sigma_cor) ** 2
+
+
+def medir_desvio(imagem, funcao_exata, funcao_rapida):
+    """
+    @brief Compara um modo rápido com o exato: PSNR, SSIM e tempo de cada um.
+
+    @details
+    Exemplo, para o bilateral de chapter_six:
+
+        medir_desvio(imagem,
+                     lambda i: filtro_bilateral(i),
+                     lambda i: filtro_bilateral(i, modo="guiado"))
+
+    (filtro_bilateral de src.preprocessing.operacoes).
+
+    @param imagem: Imagem de teste.
+    @param funcao_exata: Função que produz o resultado de referência.
+    @param funcao_rapida: Função aproximada.
+    @return Dicionário com "psnr", "ssim", "tempo_exato_ms" e "tempo_rapido_ms".
+    """
+    inicio = time.perf_counter()
+    exato = funcao_exata(imagem)
+    tempo_exato = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    rapido = funcao_rapida(imagem)
+    tempo_rapido = time.perf_counter() - inicio
+
+    return {
+        "psnr":            psnr(exato, rapido),
+        "ssim":            ssim(exato, rapido),
+        "tempo_exato_ms":  tempo_exato * 1000,
+        "tempo_rapido_ms": tempo_rapido * 1000,
+    }
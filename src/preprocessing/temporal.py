@@ -0,0 +1,352 @@
+"""
+@brief Filtros temporais de vídeo: modelo de fundo, diferença de quadros, mediana temporal e máscaras de movimento.
+
+@details
+chapter_three.reproduzir_video trata cada quadro isoladamente. Aqui cada filtro guarda um
+estado de tamanho fixo, atualizado quadro a quadro com um custo que não depende do
+tamanho da janela de tempo:
+
+    - FundoMedio:          média móvel exponencial (cv2.accumulateWeighted) em float32;
+    - DiferencaDeQuadros:  apenas o quadro anterior;
+    - MedianaTemporal:     anel com os últimos `janela` quadros e a mediana atual de cada
+                           pixel, que anda no máximo uma posição por quadro (não é
+                           recalculada sobre a janela);
+    - ProcessadorPorMovimento: aplica uma operação cara só quando (e onde) algo mudou,
+                           repetindo o resultado anterior nos quadros parados.
+
+Os filtros recebem os quadros um a um e combinam com as fontes de src.datasets.fontes:
+
+    fundo = FundoMedio(alfa=0.02)
+    for quadro in abrir_fonte("data/raw/first_video.mp4"):
+        mascara = fundo.atualizar(quadro)           # 255 onde há movimento
+
+    for saida in processar_com_movimento(abrir_fonte(0), "filtro_bilateral", margem=8):
+        ...
+"""
+import cv2
+import numpy as np
+
+from src.preprocessing.morfologia import dilatar, erodir
+from src.preprocessing.operacoes import obter_operacao
+
+
+def diferenca_de_quadros(anterior, atual, limiar=25, destino=None):
+    """
+    @brief Máscara dos pixels que mudaram mais que `limiar` entre dois quadros.
+
+    @details
+    Em quadros coloridos vale a maior diferença entre os canais.
+
+    @param anterior: Quadro de referência (uint8).
+    @param atual: Quadro atual, de mesma forma e tipo.
+    @param limiar: Diferença mínima, em níveis de cinza, para um pixel contar como alterado.
+    @param destino: Array (altura, largura) uint8 que recebe a máscara (opcional).
+    @return Máscara uint8 com 255 nos pixels alterados e 0 nos demais.
+    """
+    diferenca = cv2.absdiff(anterior, atual)
+    if diferenca.ndim == 3:
+        diferenca = np.max(diferenca, axis=2, out=destino)
+    return cv2.threshold(diferenca, limiar, 255, cv2.THRESH_BINARY, dst=destino)[1]
+
+
+def mascara_de_movimento(atual, referencia, limiar=25, abertura=3, destino=None):
+    """
+    @brief Diferença limiarizada seguida de abertura morfológica, que apaga pixels isolados de ruído.
+
+    @param atual: Quadro atual (uint8).
+    @param referencia: Fundo ou quadro anterior, de mesma forma e tipo.
+    @param limiar: Diferença mínima para um pixel contar como movimento.
+    @param abertura: Lado do elemento quadrado da abertura (1 ou 0 = sem abertura).
+    @param destino: Array (altura, largura) uint8 que recebe a máscara (opcional).
+    @return Máscara uint8 (255 = movimento).
+    """
+    mascara = diferenca_de_quadros(referencia, atual, limiar, destino)
+    if abertura > 1:
+        erodida = erodir(mascara, abertura, "retangulo")
+        dilatar(erodida, abertura, "retangulo", destino=mascara)
+    return mascara
+
+
+class FundoMedio:
+    """
+    @brief Modelo de fundo por média móvel: fundo = (1 - alfa) · fundo + alfa · quadro.
+
+    @details
+    O estado é o fundo acumulado em float32 (cv2.accumulateWeighted) e a sua versão de
+    8 bits usada na comparação; cada quadro custa uma passada, qualquer que seja o tempo
+    de memória do modelo (cerca de 1 / alfa quadros).
+
+    @param alfa: Taxa de aprendizado (maior = o fundo absorve mudanças mais rápido).
+    @param limiar: Diferença mínima em relação ao fundo para um pixel ser primeiro plano.
+    @param abertura: Lado da abertura morfológica aplicada à máscara.
+    @param seletivo: Se True, o fundo só é atualizado nos pixels sem movimento (objetos
+                     que param nunca são absorvidos).
+    """
+
+    def __init__(self, alfa=0.05, limiar=25, abertura=3, seletivo=False):
+        self.alfa = alfa
+        self.limiar = limiar
+        self.abertura = abertura
+        self.seletivo = seletivo
+        self._acumulado = None
+        self._fundo = None
+        self._parado = None
+
+    @property
+    def fundo(self):
+        """
+        @brief Fundo atual em 8 bits (None antes do primeiro quadro).
+        """
+        return self._fundo
+
+    def atualizar(self, quadro, destino=None):
+        """
+        @brief Compara o quadro com o fundo e incorpora o quadro ao fundo.
+
+        @param quadro: Quadro uint8 (cinza ou BGR).
+        @param destino: Array (altura, largura) uint8 que recebe a máscara (opcional).
+        @return Máscara de primeiro plano (255 = movimento); vazia no primeiro quadro.
+        """
+        if self._acumulado is None:
+            self._acumulado = quadro.astype(np.float32)
+            self._fundo = quadro.copy()
+            self._parado = np.empty(quadro.shape[:2], dtype=np.uint8)
+            if destino is None:
+                return np.zeros(quadro.shape[:2], dtype=np.uint8)
+            destino[...] = 0
+            return destino
+
+        mascara = mascara_de_movimento(quadro, self._fundo, self.limiar, self.abertura, destino)
+        if self.seletivo:
+            cv2.accumulateWeighted(quadro, self._acumulado, self.alfa,
+                                   mask=cv2.bitwise_not(mascara, dst=self._parado))
+        else:
+            cv2.accumulateWeighted(quadro, self._acumulado, self.alfa)
+        cv2.convertScaleAbs(self._acumulado, dst=self._fundo)
+        return mascara
+
+
+class DiferencaDeQuadros:
+    """
+    @brief Máscara do que mudou desde o quadro anterior; o estado é só esse quadro.
+
+    @param limiar: Diferença mínima para um pixel contar como alterado.
+    @param abertura: Lado da abertura morfológica aplicada à máscara.
+    """
+
+    def __init__(self, limiar=25, abertura=1):
+        self.limiar = limiar
+        self.abertura = abertura
+        self._anterior = None
+
+    def atualizar(self, quadro, destino=None):
+        """
+        @brief Compara o quadro com o anterior e passa a guardá-lo no lugar dele.
+
+        @param quadro: Quadro uint8 (cinza ou BGR).
+        @param destino: Array (altura, largura) uint8 que recebe a máscara (opcional).
+        @return Máscara (255 = alterado); vazia no primeiro quadro.
+        """
+        if self._anterior is None:
+            self._anterior = quadro.copy()
+            mascara = np.zeros(quadro.shape[:2], dtype=np.uint8) if destino is None else destino
+            mascara[...] = 0
+            return mascara
+
+        mascara = mascara_de_movimento(quadro, self._anterior, self.limiar, self.abertura, destino)
+        np.copyto(self._anterior, quadro)
+        return mascara
+
+
+class MedianaTemporal:
+    """
+    @brief Mediana de cada pixel nos últimos `janela` quadros, atualizada incrementalmente.
+
+    @details
+    Além do anel com os quadros da janela, cada pixel guarda a mediana atual `m` e
+    quantos valores da janela são menores que `m` e iguais a `m`. Quando um quadro entra
+    e o mais antigo sai, essas contagens mudam em no máximo 1, e a mediana anda no máximo
+    uma posição na ordem dos valores: só os pixels em que ela muda consultam a janela, e
+    apenas para achar o próximo valor acima ou abaixo. Em cenas paradas quase nenhum
+    pixel muda, e o custo por quadro fica em algumas comparações por pixel, em vez de
+    ordenar a janela inteira.
+
+    Com janela par, a mediana é o menor dos dois valores centrais. A janela começa
+    preenchida com o primeiro quadro.
+
+    @param janela: Número de quadros da janela (até 32767).
+    """
+
+    def __init__(self, janela=9):
+        if not 1 <= janela <= np.iinfo(np.int16).max:
+            raise ValueError(f"Janela inválida: {janela}.")
+        self.janela = janela
+        # Posição da mediana na janela ordenada
+        self._ordem = (janela - 1) // 2
+        self._anel = None
+
+    @property
+    def mediana(self):
+        """
+        @brief Mediana atual (visão somente leitura do estado; None antes do primeiro quadro).
+        """
+        if self._anel is None:
+            return None
+        mediana = self._mediana.reshape(self._forma).view()
+        mediana.flags.writeable = False
+        return mediana
+
+    def atualizar(self, quadro, destino=None):
+        """
+        @brief Inclui um quadro na janela (descartando o mais antigo) e devolve a mediana.
+
+        @param quadro: Quadro uint8 (cinza ou com canais; cada canal é tratado à parte).
+        @param destino: Array com a forma do quadro que recebe uma cópia da mediana (opcional).
+        @return Mediana da janela (visão somente leitura do estado se `destino` for None).
+        """
+        valores = np.ascontiguousarray(quadro, dtype=np.uint8).reshape(-1)
+        if self._anel is None:
+            self._iniciar(quadro.shape, valores)
+        else:
+            self._incluir(valores)
+
+        if destino is None:
+            return self.mediana
+        np.copyto(destino, self._mediana.reshape(self._forma))
+        return destino
+
+    def _iniciar(self, forma, valores):
+        self._forma = forma
+        self._anel = np.tile(valores, (self.janela, 1))
+        self._posicao = 0
+        self._mediana = valores.copy()
+        self._abaixo = np.zeros(valores.size, dtype=np.int16)
+        self._iguais = np.full(valores.size, self.janela, dtype=np.int16)
+
+    def _incluir(self, valores):
+        mediana, abaixo, iguais = self._mediana, self._abaixo, self._iguais
+        saindo = self._anel[self._posicao]
+
+        abaixo += valores < mediana
+        abaixo -= saindo < mediana
+        iguais += valores == mediana
+        iguais -= saindo == mediana
+        saindo[...] = valores
+        self._posicao = (self._posicao + 1) % self.janela
+
+        # Mediana acima da posição: desce para o maior valor da janela abaixo dela
+        pixels = np.flatnonzero(abaixo > self._ordem)
+        if pixels.size:
+            janela = self._anel[:, pixels]
+            nova = np.where(janela < mediana[pixels], janela, 0).max(axis=0)
+            iguais[pixels] = (janela == nova).sum(axis=0)
+            abaixo[pixels] -= iguais[pixels]
+            mediana[pixels] = nova
+
+        # Mediana abaixo da posição: sobe para o menor valor da janela acima dela
+        pixels = np.flatnonzero(abaixo + iguais <= self._ordem)
+        if pixels.size:
+            janela = self._anel[:, pixels]
+            nova = np.where(janela > mediana[pixels], janela, 255).min(axis=0)
+            abaixo[pixels] += iguais[pixels]
+            iguais[pixels] = (janela == nova).sum(axis=0)
+            mediana[pixels] = nova
+
+
+class ProcessadorPorMovimento:
+    """
+    @brief Aplica uma operação só aos quadros (e às regiões) que mudaram.
+
+    @details
+    O processador guarda o último resultado e o quadro de referência que o produziu. A
+    cada quadro, compara o quadro com a referência (mascara_de_movimento); se menos de
+    `fracao_minima` dos pixels mudou, devolve o resultado anterior sem chamar a operação.
+
+    Com `margem` (o raio de vizinhança da operação, ex.: metade do kernel), só o retângulo
+    que envolve as mudanças é reprocessado: a operação roda no retângulo ampliado em
+    2 · margem e o resultado é copiado no retângulo ampliado em margem. Sem `margem`, o
+    quadro inteiro é reprocessado. Em ambos os casos a referência é atualizada só onde
+    houve processamento, de modo que mudanças lentas acabam sendo processadas quando
+    passam do limiar.
+
+    O resultado devolvido é reaproveitado nos quadros seguintes: copie-o para guardá-lo.
+
+    @param operacao: Função ou nome de uma operação de src.preprocessing.operacoes.
+    @param parametros: Dicionário de parâmetros repassados à operação.
+    @param limiar: Diferença mínima para um pixel contar como alterado.
+    @param fracao_minima: Fração dos pixels alterados abaixo da qual o quadro é pulado.
+    @param margem: Raio de vizinhança da operação, ou None para reprocessar o quadro inteiro.
+    @param abertura: Lado da abertura morfológica aplicada à máscara de movimento.
+    """
+
+    def __init__(self, operacao, parametros=None, limiar=25, fracao_minima=0.0005, margem=None, abertura=3):
+        self.operacao = obter_operacao(operacao) if isinstance(operacao, str) else operacao
+        self.parametros = parametros or {}
+        self.limiar = limiar
+        self.fracao_minima = fracao_minima
+        self.margem = margem
+        self.abertura = abertura
+        self.processados = 0
+        self.parciais = 0
+        self.pulados = 0
+        self._referencia = None
+        self._resultado = None
+        self._mascara = None
+
+    def _processar_tudo(self, quadro):
+        resultado = self.operacao(quadro, **self.parametros)
+        # O resultado é alterado no lugar no modo por regiões: não pode ser o próprio quadro
+        self._resultado = resultado.copy() if np.shares_memory(resultado, quadro) else resultado
+        np.copyto(self._referencia, quadro)
+        self.processados += 1
+        return self._resultado
+
+    def processar(self, quadro):
+        """
+        @brief Resultado da operação para o quadro (reaproveitado se nada mudou).
+        """
+        if self._referencia is None or self._referencia.shape != quadro.shape:
+            self._referencia = quadro.copy()
+            self._mascara = np.empty(quadro.shape[:2], dtype=np.uint8)
+            return self._processar_tudo(quadro)
+
+        mascara = mascara_de_movimento(quadro, self._referencia, self.limiar, self.abertura, self._mascara)
+        if cv2.countNonZero(mascara) <= self.fracao_minima * mascara.size:
+            self.pulados += 1
+            return self._resultado
+
+        # Resultados de outro tamanho (ex.: escalonar) não podem ser colados por regiões
+        if self.margem is None or self._resultado.shape[:2] != quadro.shape[:2]:
+            return self._processar_tudo(quadro)
+
+        altura, largura = mascara.shape
+        x, y, w, h = cv2.boundingRect(mascara)
+
+        def ampliar(distancia):
+            return (max(0, y - distancia), min(altura, y + h + distancia),
+                    max(0, x - distancia), min(largura, x + w + distancia))
+
+        y0, y1, x0, x1 = ampliar(2 * self.margem)
+        c0, c1, l0, l1 = ampliar(self.margem)
+        parcial = self.operacao(quadro[y0:y1, x0:x1], **self.parametros)
+        self._resultado[c0:c1, l0:l1] = parcial[c0 - y0:c1 - y0, l0 - x0:l1 - x0]
+        self._referencia[c0:c1, l0:l1] = quadro[c0:c1, l0:l1]
+        self.parciais += 1
+        return self._resultado
+
+    def __call__(self, quadro):
+        return self.processar(quadro)
+
+
+def processar_com_movimento(quadros, operacao, **opcoes):
+    """
+    @brief Gera os resultados de ProcessadorPorMovimento para uma sequência de quadros.
+
+    @param quadros: Fonte (src.datasets.fontes) ou qualquer iterável de quadros.
+    @param operacao: Função ou nome de uma operação de src.preprocessing.operacoes.
+    @param opcoes: Parâmetros de ProcessadorPorMovimento (parametros, limiar, margem, ...).
+    @return Gerador de quadros tratados.
+    """
+    processador = ProcessadorPorMovimento(operacao, **opcoes)
+    for quadro in quadros:
+        yield processador.processar(quadro)
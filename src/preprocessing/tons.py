@@ -0,0 +1,258 @@
+"""
+@brief Ajustes de tom (brilho, contraste, gama, equalização, normalização) compilados em uma única LUT.
+
+@details
+Em imagens de 8 bits, brilho (cv2.add), contraste (multiplicação), gama, equalização e
+normalização são funções de cada valor de pixel: o resultado depende só do valor, não
+dos vizinhos. Uma cadeia desses passos é, portanto, uma tabela de 256 entradas (uma por
+canal em imagens coloridas), e a imagem inteira é ajustada com uma única passada de
+cv2.LUT, em vez de uma passada completa por passo.
+
+Cada passo é calculado sobre os 256 valores possíveis com os mesmos arredondamentos e
+saturações das funções do OpenCV, de modo que a tabela composta reproduz exatamente a
+aplicação sequencial dos passos. Passos que dependem da imagem (equalização e
+normalização) usam o histograma guardado da imagem (src.preprocessing.histograma),
+levado através dos passos anteriores, sem reler os pixels.
+
+As tabelas são guardadas: cadeias sem passos dependentes da imagem por parâmetros (LRU),
+e as demais nas representações derivadas de cada imagem (src.utils.cache_de_imagem).
+Essas só persistem em imagens somente leitura; um buffer gravável reutilizado entre
+quadros tem a tabela recalculada a cada chamada e nunca recebe a de um quadro anterior.
+
+Exemplo:
+
+    ajuste = AjusteDeTons().brilho(40).contraste(1.2).gama(0.8).equalizar()
+    saida  = ajuste.aplicar(imagem)          # uma única passada de cv2.LUT
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from src.preprocessing.histograma import Histograma, histograma
+from src.utils.cache_de_imagem import derivadas
+
+# Todos os valores de 8 bits, no formato de imagem (1 x 256) aceito pelas funções do OpenCV
+_VALORES = np.arange(256, dtype=np.uint8).reshape(1, 256)
+
+# Passos cuja tabela depende do histograma da imagem
+_DEPENDENTES = ("equalizar", "normalizar")
+
+
+@lru_cache(maxsize=256)
+def _tabela_fixa(nome, parametros):
+    """
+    @brief Tabela (256 valores uint8) de um passo que não depende da imagem.
+    """
+    if nome == "brilho":
+        (valor,) = parametros
+        return cv2.add(_VALORES, valor).ravel()
+    if nome == "ganho":
+        # Arredondamento ao par mais próximo e saturação, como Mat.convertTo do OpenCV
+        alfa, beta = parametros
+        return np.clip(np.rint(np.arange(256) * alfa + beta), 0, 255).astype(np.uint8)
+    if nome == "gama":
+        (gama,) = parametros
+        return np.rint(255 * (np.arange(256) / 255) ** gama).astype(np.uint8)
+    if nome == "inverter":
+        return cv2.bitwise_not(_VALORES).ravel()
+    if nome == "tabela":
+        (valores,) = parametros
+        return np.asarray(valores, dtype=np.uint8)
+    raise ValueError(f"Passo desconhecido: {nome}")
+
+
+def _tabela_dependente(nome, parametros, contagens):
+    """
+    @brief Tabela de equalização ou normalização a partir do histograma atual de um canal.
+    """
+    if nome == "equalizar":
+        atual = Histograma(canais=1)
+        atual.contagens[0] = contagens
+        return atual.lut_equalizacao()[0]
+
+    # Normalização NORM_MINMAX de cv2.normalize: [mínimo, máximo] da imagem -> [alfa, beta]
+    alfa, beta = parametros
+    ocupadas = np.flatnonzero(contagens)
+    if ocupadas.size == 0:
+        return np.arange(256, dtype=np.uint8)
+    minimo, maximo = int(ocupadas[0]), int(ocupadas[-1])
+    escala = (beta - alfa) / (maximo - minimo) if maximo > minimo else 0.0
+    deslocamento = alfa - minimo * escala
+    return np.clip(np.rint(np.arange(256) * escala + deslocamento), 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=256)
+def _compilar_fixa(passos, canais):
+    tabela = np.tile(np.arange(256, dtype=np.uint8), (canais, 1))
+    for nome, parametros, canal in passos:
+        passo = _tabela_fixa(nome, parametros)
+        linhas = range(canais) if canal is None else [canal]
+        for linha in linhas:
+            tabela[linha] = passo[tabela[linha]]
+    tabela.flags.writeable = False
+    return tabela
+
+
+class AjusteDeTons:
+    """
+    @brief Cadeia de ajustes de tom compilada em uma tabela de consulta (LUT).
+
+    @details
+    Cada método acrescenta um passo e devolve uma nova cadeia (a original não muda), o
+    que permite montar variações a partir de uma base comum. Todo passo aceita `canal`
+    para agir apenas em um canal (ex.: canal=2 ajusta só o V de uma imagem HSV); sem ele
+    o passo age em todos os canais.
+
+    @param passos: Tupla de passos (nome, parâmetros, canal); normalmente vazia.
+    """
+
+    def __init__(self, passos=()):
+        self.passos = tuple(passos)
+
+    def _com(self, nome, parametros=(), canal=None):
+        return AjusteDeTons(self.passos + ((nome, tuple(parametros), canal),))
+
+    def brilho(self, valor, canal=None):
+        """
+        @brief Soma `valor` a cada pixel, com saturação (como cv2.add em chapter_five.mudar_contraste).
+        """
+        return self._com("brilho", (valor,), canal)
+
+    def ganho(self, alfa, beta=0, canal=None):
+        """
+        @brief alfa · pixel + beta, arredondado e saturado em 0–255.
+        """
+        return self._com("ganho", (alfa, beta), canal)
+
+    def contraste(self, fator, centro=128, canal=None):
+        """
+        @brief Aumenta (fator > 1) ou reduz o contraste em torno de `centro`.
+        """
+        return self.ganho(fator, centro * (1 - fator), canal)
+
+    def gama(self, gama, canal=None):
+        """
+        @brief Correção gama: 255 · (pixel / 255) ^ gama (gama < 1 clareia os tons escuros).
+        """
+        return self._com("gama", (gama,), canal)
+
+    def inverter(self, canal=None):
+        """
+        @brief Negativo da imagem (255 - pixel).
+        """
+        return self._com("inverter", (), canal)
+
+    def equalizar(self, canal=None):
+        """
+        @brief Equalização de histograma (mesmo resultado de cv2.equalizeHist).
+        """
+        return self._com("equalizar", (), canal)
+
+    def normalizar(self, alfa=0, beta=255, canal=None):
+        """
+        @brief Estica os valores para [alfa, beta] (cv2.normalize com NORM_MINMAX).
+        """
+        return self._com("normalizar", (alfa, beta), canal)
+
+    def tabela_propria(self, valores, canal=None):
+        """
+        @brief Passo com uma tabela qualquer de 256 valores.
+        """
+        return self._com("tabela", (tuple(int(valor) for valor in valores),), canal)
+
+    @property
+    def depende_da_imagem(self):
+        return any(nome in _DEPENDENTES for nome, _, _ in self.passos)
+
+    def compilar(self, imagem=None, canais=None):
+        """
+        @brief Tabela que aplica todos os passos da cadeia.
+
+        @param imagem: Imagem a ajustar; obrigatória se a cadeia tiver equalização ou
+                       normalização (usa o histograma guardado da imagem).
+        @param canais: Número de canais, quando `imagem` não é informada (padrão 1).
+        @return Array uint8 (canais, 256), somente leitura.
+        """
+        if imagem is not None:
+            canais = 1 if imagem.ndim == 2 else imagem.shape[2]
+        canais = canais or 1
+
+        if not self.depende_da_imagem:
+            return _compilar_fixa(self.passos, canais)
+        if imagem is None:
+            raise ValueError("Equalização e normalização precisam da imagem para compilar a tabela.")
+
+        tabela_da_imagem = derivadas(imagem)
+        chave = "tons:" + repr(self.passos)
+        if chave not in tabela_da_imagem:
+            tabela_da_imagem[chave] = self._compilar_dependente(histograma(imagem).contagens)
+        return tabela_da_imagem[chave]
+
+    def _compilar_dependente(self, contagens):
+        canais = len(contagens)
+        tabela = np.tile(np.arange(256, dtype=np.uint8), (canais, 1))
+        for nome, parametros, canal in self.passos:
+            for linha in (range(canais) if canal is None else [canal]):
+                if nome in _DEPENDENTES:
+                    # Histograma do canal depois dos passos anteriores: cada valor v
+                    # original passa a valer tabela[v]
+                    atuais = np.bincount(tabela[linha], weights=contagens[linha], minlength=256)
+                    passo = _tabela_dependente(nome, parametros, atuais.astype(np.int64))
+                else:
+                    passo = _tabela_fixa(nome, parametros)
+                tabela[linha] = passo[tabela[linha]]
+        tabela.flags.writeable = False
+        return tabela
+
+    def aplicar(self, imagem, destino=None):
+        """
+        @brief Aplica a cadeia com uma única passada de cv2.LUT.
+
+        @param imagem: Imagem de 8 bits em tons de cinza ou com vários canais.
+        @param destino: Array opcional (mesmo tamanho e tipo) que recebe o resultado.
+        @return Imagem ajustada.
+        """
+        if imagem.dtype != np.uint8:
+            raise ValueError(f"Tipo não suportado: {imagem.dtype}. As tabelas são de 8 bits.")
+        tabela = self.compilar(imagem)
+        if imagem.ndim == 2:
+            return cv2.LUT(imagem, tabela[0], dst=destino)
+        # Tabela (1, 256, canais): cada canal consulta a sua coluna
+        return cv2.LUT(imagem, np.ascontiguousarray(tabela.T).reshape(1, 256, -1), dst=destino)
+
+    def __call__(self, imagem):
+        return self.aplicar(imagem)
+
+    def __repr__(self):
+        return f"AjusteDeTons({list(self.passos)})"
+
+
+def ajustar_tons(imagem, brilho=0, contraste=1, gama=1, equalizar=False, normalizar=None, destino=None):
+    """
+    @brief Aplica brilho, contraste, gama, equalização e normalização com uma única LUT.
+
+    @details
+    Os passos são aplicados nessa ordem; os que estão nos valores padrão são omitidos.
+
+    @param imagem: Imagem de 8 bits (cinza ou BGR).
+    @param brilho: Valor somado a cada pixel (ex.: 40 ou -40, como em chapter_five).
+    @param contraste: Fator de contraste em torno de 128.
+    @param gama: Expoente da correção gama.
+    @param equalizar: True equaliza o histograma de cada canal.
+    @param normalizar: Par (alfa, beta) para esticar os valores a [alfa, beta], ou None.
+    @param destino: Array de saída pré-alocado (opcional).
+    @return Imagem ajustada.
+    """
+    ajuste = AjusteDeTons()
+    if brilho:
+        ajuste = ajuste.brilho(brilho)
+    if contraste != 1:
+        ajuste = ajuste.contraste(contraste)
+    if gama != 1:
+        ajuste = ajuste.gama(gama)
+    if equalizar:
+        ajuste = ajuste.equalizar()
+    if normalizar is not None:
+        ajuste = ajuste.normalizar(*normalizar)
+    return ajuste.aplicar(imagem, destino)
@@ -0,0 +1,265 @@
+"""
+@brief Pipeline de vídeo com decodificação, filtragem e escrita sobrepostas em threads.
+
+@details
+chapter_three.reproduzir_video lê, trata e exibe um quadro por vez, de modo que o
+decodificador, o filtro e o codificador esperam uns pelos outros. Aqui cada etapa roda
+em sua própria thread (a filtragem em várias), ligadas por filas limitadas, e os quadros
+e resultados podem vir de um PoolDeBuffers para que o pipeline não aloque memória em
+regime.
+
+Exemplo:
+
+    fps = processar_video("data/raw/first_video.mp4", "canny", "data/processed/first_video-canny.mp4")
+    print(fps)   # {"decodificacao": ..., "processamento": ..., "escrita": ...}
+"""
+import inspect
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from src.datasets.fontes import FonteDeQuadros, abrir_fonte
+from src.preprocessing.operacoes import obter_operacao
+from src.utils.buffers import PoolDeBuffers
+
+# Marca o fim do fluxo de quadros entre as etapas
+_FIM = object()
+
+
+class ContadorFPS:
+    """
+    @brief Conta os quadros que passam por uma etapa e calcula sua taxa (quadros/s).
+
+    @details
+    O contador é seguro para uso por várias threads ao mesmo tempo. O relógio começa
+    no primeiro quadro registrado, para não contar o tempo de inicialização da etapa.
+    """
+
+    def __init__(self, nome):
+        self.nome    = nome
+        self.quadros = 0
+        self._inicio = None
+        self._fim    = None
+        self._trava  = threading.Lock()
+
+    def registrar(self):
+        with self._trava:
+            agora = time.perf_counter()
+            if self._inicio is None:
+                self._inicio = agora
+            self._fim = agora
+            self.quadros += 1
+
+    @property
+    def fps(self):
+        with self._trava:
+            if self.quadros < 2:
+                return 0.0
+            return (self.quadros - 1) / (self._fim - self._inicio)
+
+
+def _colocar(fila, item, parar):
+    # put() bloqueante que desiste se o pipeline for interrompido
+    while not parar.is_set():
+        try:
+            fila.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _retirar(fila, parar):
+    # get() bloqueante que devolve _FIM se o pipeline for interrompido
+    while not parar.is_set():
+        try:
+            return fila.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _FIM
+
+
+def _aceita_destino(operacao):
+    try:
+        return "destino" in inspect.signature(operacao).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def processar_video(caminho_entrada, operacao, caminho_saida=None, parametros=None,
+                    trabalhadores=None, capacidade=32, codec="mp4v", reutilizar_buffers=True):
+    """
+    @brief Processa um vídeo em pipeline: decodificação, filtragem em paralelo e escrita ordenada.
+
+    @details
+    Diferente de chapter_three.reproduzir_video, que lê e exibe um quadro por vez, esta
+    função sobrepõe as etapas usando threads ligadas por filas limitadas:
+
+    1. Uma thread lê os quadros da fonte (src.datasets.fontes; um vídeo usa cv2.VideoCapture).
+    2. `trabalhadores` threads aplicam a operação (o OpenCV libera o GIL durante os filtros).
+    3. A thread chamadora reordena os resultados e os grava com cv2.VideoWriter.
+
+    No máximo `capacidade` quadros ficam em trânsito ao mesmo tempo: se a escrita ou a
+    filtragem ficar para trás, a decodificação espera (contrapressão), e a memória usada
+    permanece limitada independentemente do tamanho do vídeo.
+
+    Com `reutilizar_buffers`, os quadros decodificados e os resultados vêm de um
+    PoolDeBuffers (src.utils.buffers) e voltam a ele depois de usados: a decodificação lê
+    direto em um buffer livre e, se a operação aceitar `destino`, o resultado também é
+    escrito em um. Depois dos primeiros quadros, o pipeline não aloca mais memória.
+
+    @param caminho_entrada: Caminho do vídeo, índice da webcam ou qualquer entrada aceita por
+                            src.datasets.fontes.abrir_fonte (sequência de imagens, pilha .npy,
+                            FonteDeQuadros já configurada com passo, início etc.).
+    @param operacao: Função que recebe um quadro e devolve o quadro tratado, ou o nome
+                     de uma operação de src.preprocessing.operacoes (ex.: "canny").
+    @param caminho_saida: Vídeo de saída; None processa sem gravar (útil para medir FPS).
+    @param parametros: Dicionário de parâmetros extras repassados à operação.
+    @param trabalhadores: Número de threads de filtragem; None usa a quantidade de núcleos.
+    @param capacidade: Máximo de quadros em trânsito entre as etapas.
+    @param codec: FourCC do vídeo de saída.
+    @param reutilizar_buffers: Reaproveita os arrays dos quadros e dos resultados.
+    @return Dicionário {etapa: quadros por segundo} para "decodificacao", "processamento" e "escrita".
+    @exception FileNotFoundError Se o vídeo (ou a sequência) não puder ser aberto.
+    """
+    if isinstance(operacao, str):
+        operacao = obter_operacao(operacao)
+    parametros = parametros or {}
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+
+    # Fontes criadas aqui são fechadas no fim; as recebidas prontas ficam com quem as criou
+    propria = not isinstance(caminho_entrada, FonteDeQuadros)
+    fonte = abrir_fonte(caminho_entrada)
+    quadros_por_segundo = fonte.fps
+
+    # Buffers em uso ao mesmo tempo: os quadros em trânsito e os de cada trabalhador
+    pool = PoolDeBuffers(capacidade + trabalhadores + 2) if reutilizar_buffers else None
+    usar_destino = pool is not None and _aceita_destino(operacao) and "destino" not in parametros
+    formas = {}
+
+    fila_quadros    = queue.Queue(maxsize=capacidade)
+    fila_resultados = queue.Queue(maxsize=capacidade)
+    em_transito     = threading.Semaphore(capacidade)
+    parar           = threading.Event()
+    erros           = []
+
+    contadores = {
+        "decodificacao": ContadorFPS("decodificacao"),
+        "processamento": ContadorFPS("processamento"),
+        "escrita":       ContadorFPS("escrita"),
+    }
+
+    def decodificar():
+        try:
+            def vaga():
+                # O pool descarta as representações derivadas guardadas para o buffer
+                # antes de entregá-lo, e o quadro decodificado nele nunca herda as do anterior
+                return pool.obter(*formas["quadro"]) if pool is not None and "quadro" in formas else None
+
+            pares = fonte.percorrer(vaga)
+            # Os índices de saída são consecutivos mesmo com passo na fonte
+            indice = 0
+            while not parar.is_set():
+                # Espera até haver espaço no pipeline (contrapressão)
+                if not em_transito.acquire(timeout=0.1):
+                    continue
+                par = next(pares, None)
+                if par is None:
+                    break
+                quadro = par[1]
+                formas.setdefault("quadro", (quadro.shape, quadro.dtype))
+                contadores["decodificacao"].registrar()
+                if not _colocar(fila_quadros, (indice, quadro), parar):
+                    break
+                indice += 1
+            pares.close()
+        except Exception as erro:
+            erros.append(erro)
+            parar.set()
+        finally:
+            # Um marcador de fim para cada trabalhador
+            for _ in range(trabalhadores):
+                _colocar(fila_quadros, _FIM, parar)
+
+    def filtrar():
+        try:
+            while True:
+                item = _retirar(fila_quadros, parar)
+                if item is _FIM:
+                    break
+                indice, quadro = item
+                if usar_destino and "resultado" in formas:
+                    resultado = operacao(quadro, destino=pool.obter(*formas["resultado"]), **parametros)
+                else:
+                    resultado = operacao(quadro, **parametros)
+                if pool is not None:
+                    formas.setdefault("resultado", (resultado.shape, resultado.dtype))
+                    # O resultado pode ser o próprio quadro ou uma visão dele (recorte,
+                    # canal, reshape); nesses casos o buffer só pode voltar ao pool depois
+                    # da escrita, e não volta, pois devolver ignora visões
+                    if not np.shares_memory(resultado, quadro):
+                        pool.devolver(quadro)
+                contadores["processamento"].registrar()
+                if not _colocar(fila_resultados, (indice, resultado), parar):
+                    break
+        except Exception as erro:
+            erros.append(erro)
+            parar.set()
+        finally:
+            _colocar(fila_resultados, _FIM, parar)
+
+    threads = [threading.Thread(target=decodificar, daemon=True)]
+    threads += [threading.Thread(target=filtrar, daemon=True) for _ in range(trabalhadores)]
+    for thread in threads:
+        thread.start()
+
+    escritor   = None
+    pendentes  = {}
+    proximo    = 0
+    terminados = 0
+
+    try:
+        while terminados < trabalhadores:
+            item = _retirar(fila_resultados, parar)
+            if item is _FIM:
+                if parar.is_set():
+                    break
+                terminados += 1
+                continue
+
+            indice, resultado = item
+            pendentes[indice] = resultado
+
+            # Grava em ordem todos os quadros consecutivos já disponíveis
+            while proximo in pendentes:
+                quadro = pendentes.pop(proximo)
+                if caminho_saida is not None:
+                    if escritor is None:
+                        altura, largura = quadro.shape[:2]
+                        escritor = cv2.VideoWriter(
+                            caminho_saida, cv2.VideoWriter_fourcc(*codec),
+                            quadros_por_segundo, (largura, altura), quadro.ndim == 3
+                        )
+                    escritor.write(quadro)
+                if pool is not None:
+                    pool.devolver(quadro)
+                contadores["escrita"].registrar()
+                em_transito.release()
+                proximo += 1
+    finally:
+        parar.set()
+        for thread in threads:
+            thread.join()
+        if propria:
+            fonte.fechar()
+        if escritor is not None:
+            escritor.release()
+
+    if erros:
+        raise erros[0]
+
+    return {nome: contador.fps for nome, contador in contadores.items()}
@@ -0,0 +1,3 @@
+"""
+@brief Funções auxiliares reutilizáveis.
+"""
@@ -0,0 +1,268 @@
+"""
+@brief Mede o tempo das operações dos capítulos em várias resoluções e salva os resultados em JSON.
+
+@details
+Cada operação é executada algumas vezes sem medição (aquecimento, para carregar caches e
+inicializar o OpenCV) e depois repetida `repeticoes` vezes; o relatório traz mínimo,
+média, desvio padrão e percentis de cada caso. O JSON gerado pode ser comparado com uma
+execução anterior para detectar regressões:
+
+    python -m src.utils.benchmark --resolucoes 480p 1080p --saida experiments/base.json
+    python -m src.utils.benchmark --resolucoes 480p 1080p --comparar experiments/base.json
+"""
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.estatisticas import contar_pixels
+from src.preprocessing.operacoes import OPERACOES
+
+# Resoluções (largura, altura) disponíveis
+RESOLUCOES = {
+    "480p":  (640, 480),
+    "1080p": (1920, 1080),
+    "4k":    (3840, 2160),
+}
+
+# Imagem de data/raw usada quando a fonte é "raw"
+IMAGEM_RAW = "data/raw/third_image.jpeg"
+
+# Tipo de entrada esperado por cada operação: "cor", "cinza" ou "binaria".
+# plotar_manualmente é medida pela sua versão vetorizada (contar_pixels).
+CASOS = {
+    **{nome: (operacao, "cor") for nome, operacao in OPERACOES.items()},
+    "operador_sobel":       (OPERACOES["operador_sobel"], "cinza"),
+    "operador_laplaciano":  (OPERACOES["operador_laplaciano"], "cinza"),
+    "aguçamento_de_borda":  (OPERACOES["aguçamento_de_borda"], "cinza"),
+    "desaguçamento":        (OPERACOES["desaguçamento"], "cinza"),
+    "canny":                (OPERACOES["canny"], "cinza"),
+    "equalizar_histograma": (OPERACOES["equalizar_histograma"], "cinza"),
+    "erosão":               (OPERACOES["erosão"], "binaria"),
+    "plotar_manualmente":   (contar_pixels, "binaria"),
+}
+
+
+def gerar_imagem_sintetica(largura, altura, semente=0):
+    """
+    @brief Cria uma imagem BGR sintética com gradientes, formas e ruído.
+
+    @details
+    Uma imagem apenas de ruído favoreceria ou prejudicaria algumas operações (ex.: Canny
+    encontraria bordas em todo lugar), por isso a imagem combina regiões suaves, bordas
+    nítidas e ruído, como uma fotografia.
+
+    @param largura: Largura em pixels.
+    @param altura: Altura em pixels.
+    @param semente: Semente do gerador de números aleatórios (resultados reproduzíveis).
+    @return Imagem BGR uint8.
+    """
+    gerador = np.random.default_rng(semente)
+
+    # Gradientes horizontais e verticais em canais diferentes
+    x = np.linspace(0, 255, largura, dtype=np.float32)
+    y = np.linspace(0, 255, altura, dtype=np.float32)[:, None]
+    imagem = np.empty((altura, largura, 3), dtype=np.float32)
+    imagem[:, :, 0] = x
+    imagem[:, :, 1] = y
+    imagem[:, :, 2] = (x + y) / 2
+
+    # Algumas formas com bordas nítidas
+    for _ in range(20):
+        centro = (int(gerador.integers(largura)), int(gerador.integers(altura)))
+        raio = int(gerador.integers(min(largura, altura) // 20, min(largura, altura) // 5))
+        cor = [float(c) for c in gerador.integers(0, 256, 3)]
+        cv2.circle(imagem, centro, raio, cor, -1)
+
+    imagem += gerador.normal(0, 10, imagem.shape).astype(np.float32)
+    return np.clip(imagem, 0, 255).astype(np.uint8)
+
+
+def preparar_entrada(imagem_bgr, tipo):
+    """
+    @brief Converte a imagem base para o tipo de entrada de uma operação.
+
+    @param imagem_bgr: Imagem BGR.
+    @param tipo: "cor", "cinza" ou "binaria" (limiar fixo 127, como em chapter_five).
+    @return Imagem pronta para a operação.
+    """
+    if tipo == "cor":
+        return imagem_bgr
+    imagem_cinza = cv2.cvtColor(imagem_bgr, cv2.COLOR_BGR2GRAY)
+    if tipo == "cinza":
+        return imagem_cinza
+    _, imagem_binaria = cv2.threshold(imagem_cinza, 127, 255, cv2.THRESH_BINARY)
+    return imagem_binaria
+
+
+def medir(funcao, imagem, repeticoes=10, aquecimento=2):
+    """
+    @brief Mede o tempo de uma função sobre uma imagem.
+
+    @param funcao: Função que recebe a imagem.
+    @param imagem: Entrada da função.
+    @param repeticoes: Número de execuções medidas.
+    @param aquecimento: Número de execuções descartadas antes da medição.
+    @return Dicionário com os tempos em milissegundos: "min", "media", "desvio",
+            "p50", "p90", "p99" e "max".
+    """
+    for _ in range(aquecimento):
+        funcao(imagem)
+
+    tempos = np.empty(repeticoes)
+    for indice in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(imagem)
+        tempos[indice] = (time.perf_counter() - inicio) * 1000
+
+    p50, p90, p99 = np.percentile(tempos, [50, 90, 99])
+    return {
+        "min":    float(tempos.min()),
+        "media":  float(tempos.mean()),
+        "desvio": float(tempos.std()),
+        "p50":    float(p50),
+        "p90":    float(p90),
+        "p99":    float(p99),
+        "max":    float(tempos.max()),
+    }
+
+
+def executar(operacoes=None, resolucoes=("480p", "1080p", "4k"), fontes=("sintetica", "raw"),
+             repeticoes=10, aquecimento=2):
+    """
+    @brief Executa o benchmark de todas as combinações de operação, fonte e resolução.
+
+    @param operacoes: Nomes das operações (chaves de CASOS); None mede todas.
+    @param resolucoes: Nomes das resoluções (chaves de RESOLUCOES).
+    @param fontes: "sintetica" (gerar_imagem_sintetica) e/ou "raw" (IMAGEM_RAW redimensionada).
+    @param repeticoes: Número de execuções medidas por caso.
+    @param aquecimento: Número de execuções descartadas por caso.
+    @return Dicionário pronto para ser salvo em JSON, com "metadados" e "resultados".
+    """
+    operacoes = list(operacoes or CASOS)
+    resultados = []
+
+    for fonte in fontes:
+        for nome_resolucao in resolucoes:
+            largura, altura = RESOLUCOES[nome_resolucao]
+
+            if fonte == "sintetica":
+                imagem_base = gerar_imagem_sintetica(largura, altura)
+            else:
+                imagem_raw = ler_imagem(IMAGEM_RAW)
+                if imagem_raw is None:
+                    raise FileNotFoundError(f"Imagem de entrada não encontrada: {IMAGEM_RAW}")
+                imagem_base = cv2.resize(imagem_raw, (largura, altura), interpolation=cv2.INTER_AREA)
+
+            for nome in operacoes:
+                funcao, tipo = CASOS[nome]
+                tempos = medir(funcao, preparar_entrada(imagem_base, tipo), repeticoes, aquecimento)
+                resultados.append({
+                    "operacao":   nome,
+                    "fonte":      fonte,
+                    "resolucao":  nome_resolucao,
+                    "largura":    largura,
+                    "altura":     altura,
+                    "repeticoes": repeticoes,
+                    "tempos_ms":  tempos,
+                })
+                print(f"{nome:22s} {fonte:10s} {nome_resolucao:6s} "
+                      f"p50={tempos['p50']:9.2f} ms  p90={tempos['p90']:9.2f} ms")
+
+    return {
+        "metadados": {
+            "data":       datetime.now().isoformat(timespec="seconds"),
+            "python":     platform.python_version(),
+            "opencv":     cv2.__version__,
+            "numpy":      np.__version__,
+            "plataforma": platform.platform(),
+            "nucleos":    os.cpu_count(),
+            "threads_opencv": cv2.getNumThreads(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(base, atual, tolerancia=0.10):
+    """
+    @brief Compara duas execuções pela mediana (p50) de cada caso em comum.
+
+    @param base: Resultado de referência (dicionário de executar() ou JSON carregado).
+    @param atual: Resultado novo.
+    @param tolerancia: Aumento relativo a partir do qual um caso é marcado como regressão.
+    @return Lista de dicionários com "operacao", "fonte", "resolucao", "base_ms",
+            "atual_ms", "razao" e "regressao".
+    """
+    def chave(resultado):
+        return resultado["operacao"], resultado["fonte"], resultado["resolucao"]
+
+    referencias = {chave(r): r["tempos_ms"]["p50"] for r in base["resultados"]}
+
+    comparacoes = []
+    for resultado in atual["resultados"]:
+        if chave(resultado) not in referencias:
+            continue
+        base_ms = referencias[chave(resultado)]
+        atual_ms = resultado["tempos_ms"]["p50"]
+        razao = atual_ms / base_ms if base_ms else float("inf")
+        comparacoes.append({
+            "operacao":  resultado["operacao"],
+            "fonte":     resultado["fonte"],
+            "resolucao": resultado["resolucao"],
+            "base_ms":   base_ms,
+            "atual_ms":  atual_ms,
+            "razao":     razao,
+            "regressao": razao > 1 + tolerancia,
+        })
+    return comparacoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das operações dos capítulos.")
+    parser.add_argument("--operacoes", nargs="+", choices=list(CASOS), default=None,
+                        help="Operações a medir (padrão: todas).")
+    parser.add_argument("--resolucoes", nargs="+", choices=list(RESOLUCOES), default=list(RESOLUCOES))
+    parser.add_argument("--fontes", nargs="+", choices=["sintetica", "raw"], default=["sintetica", "raw"])
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--aquecimento", type=int, default=2)
+    parser.add_argument("--saida", default=None,
+                        help="Arquivo JSON de saída (padrão: experiments/benchmark-<data>.json).")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Aumento relativo da mediana considerado regressão (padrão 0.10).")
+    argumentos = parser.parse_args()
+
+    resultado = executar(argumentos.operacoes, argumentos.resolucoes, argumentos.fontes,
+                         argumentos.repeticoes, argumentos.aquecimento)
+
+    saida = argumentos.saida or os.path.join(
+        "experiments", f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print("Resultados salvos em", saida)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+
+        comparacoes = comparar(base, resultado, argumentos.tolerancia)
+        for item in comparacoes:
+            marca = "REGRESSÃO" if item["regressao"] else ""
+            print(f"{item['operacao']:22s} {item['fonte']:10s} {item['resolucao']:6s} "
+                  f"{item['base_ms']:9.2f} -> {item['atual_ms']:9.2f} ms ({item['razao']:.2f}x) {marca}")
+
+        # Código de saída diferente de zero para uso em scripts de integração contínua
+        if any(item["regressao"] for item in comparacoes):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
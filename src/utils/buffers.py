@@ -0,0 +1,127 @@
+"""
+@brief Pool de buffers reutilizáveis, indexados por forma e tipo.
+
+@details
+Em vídeo e lotes cada etapa produz, a cada quadro, um array do mesmo tamanho que o do
+quadro anterior. Alocar um array novo por etapa e por quadro (25 MB em 4K BGR) custa
+falhas de página e fragmenta a memória de processos longos. O pool guarda os arrays
+devolvidos e os entrega de novo quando alguém pede a mesma forma e o mesmo tipo, de modo
+que, em regime, o processamento não aloca nada.
+
+As operações de src.preprocessing.operacoes aceitam `destino`, um array onde o
+resultado é escrito; o pool fornece esses destinos:
+
+    pool = PoolDeBuffers()
+    destino = pool.obter(quadro.shape, quadro.dtype)
+    filtro_gaussiano(quadro, destino=destino)
+    ...
+    pool.devolver(destino)            # quando o resultado não for mais usado
+
+    with pool.emprestar(quadro.shape[:2], np.uint8) as temporario:
+        ...                           # devolvido automaticamente ao sair do bloco
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+from src.utils.cache_de_imagem import invalidar
+
+
+class PoolDeBuffers:
+    """
+    @brief Conjunto de arrays livres, separados por (forma, tipo), seguro para várias threads.
+
+    @details
+    Um array reutilizado tem o mesmo endereço, a mesma forma e o mesmo tipo com pixels
+    novos. As representações derivadas guardadas para ele (src.utils.cache_de_imagem, que
+    usa o endereço como chave) são descartadas quando ele volta ao pool e quando é entregue
+    de novo, para que nenhum histograma ou tabela de um quadro anterior seja servido.
+
+    @param maximo_por_chave: Máximo de arrays livres guardados para cada forma e tipo; os
+                             devolvidos além disso são descartados (None = sem limite).
+    """
+
+    def __init__(self, maximo_por_chave=8):
+        self.maximo_por_chave = maximo_por_chave
+        self._livres = defaultdict(list)
+        self._trava = threading.Lock()
+        self.alocacoes = 0
+        self.reutilizacoes = 0
+
+    @staticmethod
+    def _chave(forma, dtype):
+        return tuple(int(lado) for lado in forma), np.dtype(dtype).str
+
+    def obter(self, forma, dtype=np.uint8):
+        """
+        @brief Array com a forma e o tipo pedidos (conteúdo indefinido, como np.empty).
+        """
+        chave = self._chave(forma, dtype)
+        with self._trava:
+            livres = self._livres.get(chave)
+            array = livres.pop() if livres else None
+            if array is None:
+                self.alocacoes += 1
+            else:
+                self.reutilizacoes += 1
+        if array is None:
+            return np.empty(chave[0], dtype=dtype)
+        invalidar(array)
+        return array
+
+    def obter_como(self, modelo):
+        """
+        @brief Array com a forma e o tipo de `modelo` (como np.empty_like).
+        """
+        return self.obter(modelo.shape, modelo.dtype)
+
+    def devolver(self, array):
+        """
+        @brief Devolve um array ao pool; quem o devolve não deve mais usá-lo.
+
+        @details
+        Apenas arrays que são donos da própria memória e contínuos são guardados (visões
+        de outros arrays, como fatias, são ignoradas).
+        """
+        if array is None or array.base is not None or not array.flags.c_contiguous or not array.flags.writeable:
+            return
+        invalidar(array)
+        chave = self._chave(array.shape, array.dtype)
+        with self._trava:
+            livres = self._livres[chave]
+            if self.maximo_por_chave is not None and len(livres) >= self.maximo_por_chave:
+                return
+            if not any(livre is array for livre in livres):
+                livres.append(array)
+
+    @contextmanager
+    def emprestar(self, forma, dtype=np.uint8):
+        """
+        @brief Array temporário devolvido ao pool ao sair do bloco `with`.
+        """
+        array = self.obter(forma, dtype)
+        try:
+            yield array
+        finally:
+            self.devolver(array)
+
+    @property
+    def livres(self):
+        """
+        @brief Número de arrays guardados no momento.
+        """
+        with self._trava:
+            return sum(len(livres) for livres in self._livres.values())
+
+    def limpar(self):
+        """
+        @brief Descarta todos os arrays guardados (a memória é liberada).
+        """
+        with self._trava:
+            self._livres.clear()
+
+
+# Pool compartilhado pelas operações que precisam de arrays intermediários
+pool_padrao = PoolDeBuffers()
@@ -0,0 +1,69 @@
+import weakref
+
+import numpy as np
+
+# Representações derivadas de cada imagem, indexadas pela chave de _chave()
+_derivadas = {}
+
+
+def _chave(imagem):
+    # Identifica a região de memória vista pelo array: duas visões iguais da mesma
+    # imagem (ex.: as devolvidas por ler_imagem) compartilham a mesma chave
+    return (imagem.__array_interface__["data"][0], imagem.shape, imagem.strides, imagem.dtype.str)
+
+
+def _dono(imagem):
+    # Array que de fato mantém a memória viva (o último ndarray da cadeia de .base)
+    while isinstance(imagem.base, np.ndarray):
+        imagem = imagem.base
+    return imagem
+
+
+def _imutavel(imagem):
+    # Só é seguro guardar resultados de arrays cuja memória não pode ser escrita: a chave é
+    # o endereço, e um buffer reutilizado (pool, VideoCapture.read(buffer), destino=...)
+    # mantém o endereço com pixels novos
+    return not imagem.flags.writeable and not _dono(imagem).flags.writeable
+
+
+def derivadas(imagem):
+    """
+    @brief Dicionário de representações derivadas (HSV, cinza, histograma, ...) de uma imagem.
+
+    @details
+    Módulos que calculam algo a partir de uma imagem guardam o resultado neste dicionário
+    sob um nome próprio, de modo que cada conversão seja feita no máximo uma vez por imagem.
+    O dicionário é criado na primeira chamada e descartado automaticamente quando a memória
+    da imagem é liberada.
+
+    Só são guardadas representações de imagens somente leitura (flags.writeable False na
+    imagem e no array dono da memória), como as devolvidas por ler_imagem. A chave é o
+    endereço dos pixels, e um array gravável pode ser reescrito no lugar sem que o cache
+    perceba (buffers de PoolDeBuffers, quadros lidos com VideoCapture.read(buffer),
+    arrays passados como `destino`). Para imagens graváveis é devolvido um dicionário
+    novo e vazio a cada chamada: os resultados são calculados de novo, mas nunca ficam
+    desatualizados. Para aproveitar o cache com uma imagem própria, marque-a como somente
+    leitura (imagem.flags.writeable = False) depois de preenchê-la.
+
+    @param imagem: Imagem (np.ndarray).
+    @return Dicionário mutável {nome: valor} associado à imagem.
+    """
+    if not _imutavel(imagem):
+        return {}
+    chave = _chave(imagem)
+    tabela = _derivadas.get(chave)
+    if tabela is None:
+        tabela = _derivadas[chave] = {}
+        weakref.finalize(_dono(imagem), _derivadas.pop, chave, None)
+    return tabela
+
+
+def invalidar(imagem):
+    """
+    @brief Descarta todas as representações derivadas de uma imagem.
+
+    @details
+    Necessário apenas se uma imagem somente leitura voltar a ser gravável e for
+    modificada no lugar.
+    """
+    _derivadas.pop(_chave(imagem), None)
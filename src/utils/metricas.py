@@ -0,0 +1,56 @@
+import cv2
+import numpy as np
+
+
+def psnr(referencia, imagem, maximo=255.0):
+    """
+    @brief Relação sinal-ruído de pico (PSNR) entre duas imagens, em decibéis.
+
+    @details
+    Quanto maior, mais parecidas as imagens; imagens idênticas resultam em infinito.
+    Acima de ~40 dB as diferenças costumam ser imperceptíveis.
+
+    @param referencia: Imagem de referência (ex.: resultado exato).
+    @param imagem: Imagem comparada (ex.: resultado aproximado).
+    @param maximo: Maior valor possível de um pixel (255 para 8 bits).
+    @return PSNR em dB.
+    """
+    erro = np.mean((referencia.astype(np.float64) - imagem.astype(np.float64)) ** 2)
+    if erro == 0:
+        return float("inf")
+    return float(10 * np.log10(maximo ** 2 / erro))
+
+
+def ssim(referencia, imagem, maximo=255.0):
+    """
+    @brief Índice de similaridade estrutural (SSIM) médio entre duas imagens.
+
+    @details
+    Implementação de Wang et al. (2004) com janela Gaussiana 11x11 e sigma 1,5. O índice
+    compara luminância, contraste e estrutura em cada vizinhança e vai de -1 a 1 (1 para
+    imagens idênticas). Em imagens coloridas é a média dos canais.
+
+    @param referencia: Imagem de referência.
+    @param imagem: Imagem comparada.
+    @param maximo: Maior valor possível de um pixel (255 para 8 bits).
+    @return SSIM médio.
+    """
+    c1 = (0.01 * maximo) ** 2
+    c2 = (0.03 * maximo) ** 2
+
+    x = referencia.astype(np.float32)
+    y = imagem.astype(np.float32)
+
+    def media_local(valores):
+        return cv2.GaussianBlur(valores, (11, 11), 1.5)
+
+    media_x = media_local(x)
+    media_y = media_local(y)
+    variancia_x = media_local(x * x) - media_x ** 2
+    variancia_y = media_local(y * y) - media_y ** 2
+    covariancia = media_local(x * y) - media_x * media_y
+
+    mapa = ((2 * media_x * media_y + c1) * (2 * covariancia + c2)) / (
+        (media_x ** 2 + media_y ** 2 + c1) * (variancia_x + variancia_y + c2)
+    )
+    return float(mapa.mean())
@@ -1,9 +1,5 @@
 import numpy as np
 import cv2
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-
-imagem_rgb = cv2.imread("data/raw/first_image.jpg")
 
 def exibir_estrutura_bgr(imagem):
     """
@@ -20,6 +16,10 @@ def exibir_estrutura_bgr(imagem):
 
     """
 
+    # Importado aqui para que importar o módulo não carregue o matplotlib
+    # (a projeção '3d' já é registrada pelo próprio matplotlib)
+    import matplotlib.pyplot as plt
+
     altura, largura, canais = imagem.shape
 
     fig = plt.figure(figsize=(10, 7))
@@ -45,4 +45,9 @@ def exibir_estrutura_bgr(imagem):
 
     plt.show()
 
-exibir_estrutura_bgr(imagem_rgb)
\ No newline at end of file
+def main():
+    imagem_rgb = cv2.imread("data/raw/first_image.jpg")
+    exibir_estrutura_bgr(imagem_rgb)
+
+if __name__ == "__main__":
+    main()
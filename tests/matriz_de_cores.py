@@ -1,32 +1,48 @@
 import cv2
-import numpy as np
 
-# Carrega a imagem no formato BGR
-imagem_bgr = cv2.imread("data/raw/second_image.jpg")
 
-# Verifica se a imagem foi carregada corretamente
-if imagem_bgr is None:
-    print("Erro ao carregar a imagem.")
-    exit()
+def imprimir_matrizes(imagem_bgr):
+    """
+    @brief Imprime as matrizes dos canais R, G e B e da versão em tons de cinza de uma imagem.
 
-# Converte para RGB (para facilitar leitura humana)
-imagem_rgb = cv2.cvtColor(imagem_bgr, cv2.COLOR_BGR2RGB)
+    @param imagem_bgr: Imagem colorida no formato BGR (como lida com cv2.imread()).
+    @return Nenhum valor é retornado; as matrizes são exibidas no terminal.
+    """
 
-# Separa os canais (R, G, B)
-R, G, B = cv2.split(imagem_rgb)
+    # Converte para RGB (para facilitar leitura humana)
+    imagem_rgb = cv2.cvtColor(imagem_bgr, cv2.COLOR_BGR2RGB)
 
-# Converte para escala de cinza
-imagem_cinza = cv2.cvtColor(imagem_rgb, cv2.COLOR_RGB2GRAY)
+    # Separa os canais (R, G, B)
+    R, G, B = cv2.split(imagem_rgb)
 
-# Exibe as matrizes no terminal
-print("=== Matriz do Canal Vermelho (R) ===")
-print(R)
+    # Converte para escala de cinza
+    imagem_cinza = cv2.cvtColor(imagem_rgb, cv2.COLOR_RGB2GRAY)
 
-print("\n=== Matriz do Canal Verde (G) ===")
-print(G)
+    # Exibe as matrizes no terminal
+    print("=== Matriz do Canal Vermelho (R) ===")
+    print(R)
 
-print("\n=== Matriz do Canal Azul (B) ===")
-print(B)
+    print("\n=== Matriz do Canal Verde (G) ===")
+    print(G)
 
-print("\n=== Matriz da Imagem em Escala de Cinza ===")
-print(imagem_cinza)
+    print("\n=== Matriz do Canal Azul (B) ===")
+    print(B)
+
+    print("\n=== Matriz da Imagem em Escala de Cinza ===")
+    print(imagem_cinza)
+
+
+def main():
+    # Carrega a imagem no formato BGR
+    imagem_bgr = cv2.imread("data/raw/second_image.jpg")
+
+    # Verifica se a imagem foi carregada corretamente
+    if imagem_bgr is None:
+        print("Erro ao carregar a imagem.")
+        return
+
+    imprimir_matrizes(imagem_bgr)
+
+
+if __name__ == "__main__":
+    main()
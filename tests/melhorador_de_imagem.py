@@ -1,6 +1,6 @@
 import cv2
-import numpy as np
-import matplotlib.pyplot as plt
+
+from src.preprocessing.colorizacao import colorir_pb_antiga
 
 def processar_imagem_pb_antiga(caminho_entrada, caminho_saida):
     """
@@ -12,24 +12,18 @@ def processar_imagem_pb_antiga(caminho_entrada, caminho_saida):
 
     # 1. Carrega a imagem em escala de cinza
     imagem_pb = cv2.imread(caminho_entrada, 0)
-    imagem_pb = cv2.resize(imagem_pb, (0, 0), fx=0.6, fy=0.6)
     if imagem_pb is None:
         print("❌ Erro ao carregar a imagem.")
         return
+    imagem_pb = cv2.resize(imagem_pb, (0, 0), fx=0.6, fy=0.6)
 
-    # 2. Equaliza o histograma (melhora contraste)
+    # 2. Equaliza o histograma (melhora contraste), apenas para exibição
     imagem_eq = cv2.equalizeHist(imagem_pb)
 
-    # 3. Converte para HSV artificial
-    # Explicação: canal H define a cor, vamos "pintar" esse canal
-    h = np.full_like(imagem_eq, 15)  # tom de laranja (H varia de 0 a 179)
-    s = cv2.normalize(imagem_eq, None, alpha=100, beta=255, norm_type=cv2.NORM_MINMAX)
-    v = imagem_eq.copy()
-
-    imagem_hsv = cv2.merge((h, s, v))
-
-    # 4. Converte para BGR (para visualização/salvamento no OpenCV)
-    imagem_colorida = cv2.cvtColor(imagem_hsv, cv2.COLOR_HSV2BGR)
+    # 3 e 4. Equalização, "pintura" HSV (H = 15, laranja; S normalizada entre 100 e 255;
+    # V = equalizada) e conversão para BGR, compiladas em uma paleta de 256 cores e
+    # aplicadas com uma única consulta por pixel (ver src.preprocessing.colorizacao)
+    imagem_colorida = colorir_pb_antiga(imagem_pb, matiz=15, saturacao=(100, 255))
 
     # 5. Exibe os resultados
     cv2.imshow("Original PB", imagem_pb)
@@ -42,9 +36,14 @@ def processar_imagem_pb_antiga(caminho_entrada, caminho_saida):
     cv2.waitKey(0)
     cv2.destroyAllWindows()
 
-# 🔧 Caminhos
-entrada = "data/raw/third_image.jpeg"
-saida = "data/processed/foto_colorizada.jpeg"
+def main():
+    # 🔧 Caminhos
+    entrada = "data/raw/third_image.jpeg"
+    saida = "data/processed/foto_colorizada.jpeg"
+
+    # 🚀 Executa
+    processar_imagem_pb_antiga(entrada, saida)
+
+if __name__ == "__main__":
+    main()
 
-# 🚀 Executa
-processar_imagem_pb_antiga(entrada, saida)
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.blocos import abrir_entrada, criar_saida, gerar_blocos, processar_em_blocos, raio_do_filtro
+from src.preprocessing.operacoes import obter_operacao
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    return np.ascontiguousarray(ler_imagem("data/raw/nineth_image.png")[:300, :400])
+
+
+def _em_blocos(imagem, nome, parametros, tamanho_bloco=64):
+    saida = np.empty_like(imagem)
+    return processar_em_blocos(imagem, saida, nome, parametros, tamanho_bloco=tamanho_bloco)
+
+
+@pytest.mark.parametrize("parametros", [{}, {"diametro": 15}, {"diametro": 0, "sigma_espaco": 4},
+                                        {"modo": "guiado"}, {"modo": "guiado", "diametro": 15}])
+def test_bilateral_em_blocos_igual_a_imagem_inteira(imagem, parametros):
+    esperado = obter_operacao("filtro_bilateral")(imagem, **parametros)
+    assert np.array_equal(_em_blocos(imagem, "filtro_bilateral", parametros), esperado)
+
+
+def test_guiado_com_reducao_nao_vai_para_blocos(imagem):
+    with pytest.raises(ValueError, match="reducao"):
+        raio_do_filtro("filtro_bilateral", {"modo": "guiado", "reducao": 4})
+    with pytest.raises(ValueError, match="reducao"):
+        _em_blocos(imagem, "filtro_bilateral", {"modo": "guiado", "reducao": 4})
+
+
+@pytest.mark.parametrize("nome, parametros", [
+    ("filtro_de_média", {}),
+    ("filtro_de_média", {"tamanho": 15, "modo": "integral"}),
+    ("filtro_gaussiano", {"tamanho": 15}),
+    ("filtro_gaussiano", {"tamanho": 0, "sigma": 3}),
+    ("filtro_gaussiano", {"tamanho": 31, "modo": "rapido"}),
+    ("filtro_gaussiano", {"tamanho": 5, "sigma": 4, "modo": "rapido", "passes": 6}),
+    ("filtro_de_mediana", {"tamanho": 5}),
+    ("filtro_de_mediana", {"tamanho": 9, "percentil": 90}),
+    ("filtro_de_mediana", {"tamanho": 7, "peso_central": 3}),
+])
+def test_filtros_em_blocos_iguais_a_imagem_inteira(imagem, nome, parametros):
+    esperado = obter_operacao(nome)(imagem, **parametros)
+    assert np.array_equal(_em_blocos(imagem, nome, parametros), esperado)
+
+
+def test_mediana_16_bits_em_blocos():
+    imagem = np.random.default_rng(0).integers(0, 65536, (150, 170), dtype=np.uint16)
+    esperado = obter_operacao("filtro_de_mediana")(imagem, tamanho=11)
+    assert np.array_equal(_em_blocos(imagem, "filtro_de_mediana", {"tamanho": 11}, tamanho_bloco=48), esperado)
+
+
+def test_ida_e_volta_por_npy(imagem, tmp_path):
+    caminho = str(tmp_path / "entrada.npy")
+    np.save(caminho, imagem)
+    entrada = abrir_entrada(caminho)
+    assert isinstance(entrada, np.memmap) and not entrada.flags.writeable
+
+    saida = criar_saida(str(tmp_path / "saida.npy"), entrada.shape, entrada.dtype)
+    processar_em_blocos(entrada, saida, "filtro_gaussiano", {"tamanho": 9}, tamanho_bloco=100, trabalhadores=3)
+    del saida
+    assert np.array_equal(np.load(str(tmp_path / "saida.npy")), cv2.GaussianBlur(imagem, (9, 9), 0))
+
+
+def test_bruto_exige_forma(tmp_path):
+    caminho = str(tmp_path / "imagem.raw")
+    np.arange(12, dtype=np.uint16).tofile(caminho)
+    with pytest.raises(ValueError):
+        abrir_entrada(caminho)
+    assert np.array_equal(abrir_entrada(caminho, (3, 4), np.uint16), np.arange(12).reshape(3, 4))
+
+
+def test_gerar_blocos_cobre_a_imagem_sem_sobreposicao():
+    cobertura = np.zeros((130, 200), dtype=np.int32)
+    for y0, y1, x0, x1 in gerar_blocos(130, 200, 64):
+        cobertura[y0:y1, x0:x1] += 1
+    assert np.all(cobertura == 1)
+
+
+def test_funcao_propria_exige_raio(imagem):
+    with pytest.raises(ValueError):
+        processar_em_blocos(imagem, np.empty_like(imagem), lambda bloco: bloco)
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.bordas import Gradientes, canny_multiescala, gradientes
+from src.preprocessing.operacoes import canny, operador_sobel
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    return ler_imagem("data/raw/fifth_image.jpg")
+
+
+@pytest.fixture(scope="module")
+def cinza(imagem):
+    return cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
+
+
+@pytest.mark.parametrize("tamanho", [3, 5, 7])
+@pytest.mark.parametrize("l2", [False, True])
+def test_canny_igual_ao_opencv(cinza, imagem, tamanho, l2):
+    for entrada in (cinza, imagem):
+        grad = Gradientes(entrada, tamanho, l2)
+        for inferior, superior in [(50, 100), (100, 200), (300, 600)]:
+            esperado = cv2.Canny(entrada, inferior, superior, apertureSize=tamanho, L2gradient=l2)
+            assert np.array_equal(grad.canny(inferior, superior), esperado)
+
+
+def test_operacao_canny_com_limiares_automaticos(cinza):
+    inferior, superior = Gradientes(cinza).limiares("otsu")
+    destino = np.empty_like(cinza)
+    assert canny(cinza, limiar="otsu", destino=destino) is destino
+    assert np.array_equal(destino, cv2.Canny(cinza, inferior, superior))
+    assert np.array_equal(canny(cinza), cv2.Canny(cinza, 100, 200))
+    assert np.array_equal(canny(cinza, 50, 150, tamanho=5, l2=True), cv2.Canny(cinza, 50, 150, apertureSize=5,
+                                                                                 L2gradient=True))
+
+
+def test_gradientes_guardados_por_imagem(cinza):
+    somente_leitura = cinza.copy()
+    somente_leitura.flags.writeable = False
+    assert gradientes(somente_leitura) is gradientes(somente_leitura)
+    assert gradientes(somente_leitura) is not gradientes(somente_leitura, tamanho=5)
+
+
+@pytest.mark.parametrize("dx, dy, tamanho", [(1, 0, 3), (0, 1, 3), (1, 0, 5), (1, 1, 3)])
+def test_sobel_mantem_as_derivadas_negativas(cinza, dx, dy, tamanho):
+    esperado = np.clip(np.abs(cv2.Sobel(cinza, cv2.CV_32F, dx, dy, ksize=tamanho)), 0, 255).astype(np.uint8)
+    resultado = operador_sobel(cinza, dx, dy, tamanho)
+    assert np.array_equal(resultado, esperado)
+    # A saída CV_8U direta cortava metade das bordas
+    assert np.count_nonzero(resultado) > np.count_nonzero(cv2.Sobel(cinza, cv2.CV_8U, dx, dy, ksize=tamanho))
+
+
+def test_canny_multiescala(cinza):
+    niveis = canny_multiescala(cinza, niveis=3)
+    assert [nivel.shape for nivel in niveis] == [cinza.shape, cv2.pyrDown(cinza).shape,
+                                                 cv2.pyrDown(cv2.pyrDown(cinza)).shape]
+    combinada = canny_multiescala(cinza, niveis=3, combinar=True)
+    assert combinada.shape == cinza.shape
+    assert np.all(combinada[niveis[0] > 0] == 255)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.cores import converter
+from src.preprocessing.histograma import histograma
+from src.utils.cache_de_imagem import derivadas
+
+
+def test_imagem_somente_leitura_reaproveita_resultados():
+    imagem = ler_imagem("data/raw/first_image.jpg")
+    assert derivadas(imagem) is derivadas(imagem.view())
+    assert histograma(imagem) is histograma(imagem)
+    # As conversões também são somente leitura, então também ficam guardadas
+    assert histograma(converter(imagem, "cinza")) is histograma(converter(imagem, "cinza"))
+
+
+def test_buffer_reescrito_no_lugar_nao_usa_resultado_antigo():
+    buffer = np.zeros((16, 16), dtype=np.uint8)
+    assert histograma(buffer).contagens[0, 0] == 256
+
+    buffer[...] = 200
+    assert histograma(buffer).contagens[0, 200] == 256
+    assert derivadas(buffer) is not derivadas(buffer)
+
+
+def test_visao_somente_leitura_de_array_gravavel_nao_e_guardada():
+    dono = np.zeros((8, 8), dtype=np.uint8)
+    visao = dono.view()
+    visao.flags.writeable = False
+    histograma(visao)
+
+    dono[...] = 7
+    assert histograma(visao).contagens[0, 7] == 64
@@ -0,0 +1,93 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import CacheDeImagens
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    gerador = np.random.default_rng(5)
+    caminhos = []
+    for indice in range(3):
+        caminho = str(tmp_path / f"imagem_{indice}.png")
+        cv2.imwrite(caminho, gerador.integers(0, 256, (20, 30, 3), dtype=np.uint8))
+        caminhos.append(caminho)
+    return caminhos
+
+
+def test_leituras_repetidas_usam_a_mesma_imagem(arquivos):
+    cache = CacheDeImagens()
+    primeira = cache.ler(arquivos[0])
+    segunda = cache.ler(arquivos[0])
+
+    assert np.shares_memory(primeira, segunda)
+    assert not primeira.flags.writeable
+    assert np.array_equal(primeira, cv2.imread(arquivos[0]))
+
+    # Modos diferentes são entradas diferentes
+    cinza = cache.ler(arquivos[0], cv2.IMREAD_GRAYSCALE)
+    assert cinza.ndim == 2
+    assert len(cache) == 2
+    assert cache.bytes_ocupados == primeira.nbytes + cinza.nbytes
+
+
+def test_remove_as_menos_usadas_ao_passar_do_limite_de_bytes(arquivos):
+    bytes_imagem = 20 * 30 * 3
+    cache = CacheDeImagens(limite_bytes=2 * bytes_imagem)
+
+    a = cache.ler(arquivos[0])
+    cache.ler(arquivos[1])
+    cache.ler(arquivos[0])  # arquivos[0] passa a ser o mais recente
+    cache.ler(arquivos[2])
+
+    assert len(cache) == 2
+    assert cache.bytes_ocupados == 2 * bytes_imagem
+    assert np.shares_memory(cache.ler(arquivos[0]), a)
+    assert np.shares_memory(cache.ler(arquivos[2]), cache.ler(arquivos[2]))
+
+    # arquivos[1] foi removido: ao ser lido de novo é decodificado outra vez
+    # e, por sua vez, remove o menos usado (arquivos[0])
+    cache.ler(arquivos[1])
+    assert cache.bytes_ocupados == 2 * bytes_imagem
+    assert not np.shares_memory(cache.ler(arquivos[0]), a)
+
+
+def test_imagem_maior_que_o_limite_nao_e_guardada(arquivos):
+    cache = CacheDeImagens(limite_bytes=100)
+    imagem = cache.ler(arquivos[0])
+    assert imagem.shape == (20, 30, 3)
+    assert len(cache) == 0
+    assert cache.bytes_ocupados == 0
+
+
+def test_arquivo_alterado_e_lido_de_novo(arquivos, tmp_path):
+    cache = CacheDeImagens()
+    # BMP tem tamanho fixo: só a data de modificação denuncia a alteração
+    caminho = str(tmp_path / "imagem.bmp")
+    cv2.imwrite(caminho, cv2.imread(arquivos[0]))
+    antiga = cache.ler(caminho)
+    estado = os.stat(caminho)
+
+    nova = 255 - antiga
+    cv2.imwrite(caminho, nova)
+    assert os.stat(caminho).st_size == estado.st_size
+    os.utime(caminho, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10 ** 9))
+
+    relida = cache.ler(caminho)
+    assert not np.shares_memory(relida, antiga)
+    assert np.array_equal(relida, nova)
+    assert len(cache) == 1
+    assert cache.bytes_ocupados == relida.nbytes
+
+
+def test_arquivo_inexistente_e_limpar(arquivos, tmp_path):
+    cache = CacheDeImagens()
+    assert cache.ler(str(tmp_path / "nao_existe.png")) is None
+
+    cache.ler(arquivos[0])
+    cache.limpar()
+    assert len(cache) == 0
+    assert cache.bytes_ocupados == 0
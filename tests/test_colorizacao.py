@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.colorizacao import Paleta, colorir_lote_pb_antiga, colorir_pb_antiga
+from src.preprocessing.operacoes import obter_operacao
+
+
+@pytest.fixture(scope="module")
+def quadros():
+    gerador = np.random.default_rng(0)
+    return cv2.blur(gerador.integers(0, 256, (4, 30, 40), dtype=np.uint8).reshape(120, 40), (5, 5)).reshape(4, 30, 40)
+
+
+def _pb_antiga_com_opencv(cinza):
+    # A receita original de processar_imagem_pb_antiga, com as conversões da imagem inteira
+    equalizada = cv2.equalizeHist(cinza)
+    saturacao = cv2.normalize(equalizada, None, 100, 255, cv2.NORM_MINMAX)
+    hsv = cv2.merge([np.full_like(cinza, 15), saturacao, equalizada])
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def test_paleta_e_uma_consulta_por_tom(quadros):
+    paleta = Paleta.gradiente((0, 0, 0), (40, 90, 160), (255, 255, 255))
+    destino = np.empty(quadros[0].shape + (3,), dtype=np.uint8)
+    assert paleta.aplicar(quadros[0], destino=destino) is destino
+    assert np.array_equal(destino, paleta.cores[quadros[0]])
+
+
+def test_aplicar_lote_com_e_sem_contiguidade(quadros):
+    paleta = Paleta.de_hsv(matiz=100, saturacao=(50, 255))
+    esperado = paleta.cores[quadros]
+
+    assert np.array_equal(paleta.aplicar_lote(quadros), esperado)
+    # Quadros fatiados e destino não contíguo: o resultado tem de chegar ao destino
+    grande = np.zeros(quadros.shape[:1] + (30, 50, 3), dtype=np.uint8)
+    destino = grande[:, :, :40]
+    assert paleta.aplicar_lote(quadros[:, :, :], destino=destino) is destino
+    assert np.array_equal(destino, esperado)
+    assert np.array_equal(paleta.aplicar_lote(quadros[::2]), esperado[::2])
+    assert np.array_equal(paleta.aplicar_lote(list(quadros)), esperado)
+
+
+def test_pb_antiga_proxima_da_receita_com_opencv(quadros):
+    for cinza in quadros:
+        diferenca = cv2.absdiff(colorir_pb_antiga(cinza), _pb_antiga_com_opencv(cinza))
+        assert diferenca.max() <= 1
+
+
+def test_pb_antiga_registrada_e_aceita_bgr(quadros):
+    operacao = obter_operacao("colorir_pb_antiga")
+    bgr = cv2.cvtColor(quadros[0], cv2.COLOR_GRAY2BGR)
+    destino = np.empty_like(bgr)
+    assert operacao(bgr, destino=destino) is destino
+    assert np.array_equal(destino, colorir_pb_antiga(quadros[0]))
+
+
+def test_lote_pb_antiga_tem_uma_paleta_por_quadro(quadros):
+    destino = np.empty(quadros.shape + (3,), dtype=np.uint8)
+    colorir_lote_pb_antiga(quadros, destino=destino)
+    for cinza, colorido in zip(quadros, destino):
+        assert np.array_equal(colorido, colorir_pb_antiga(cinza))
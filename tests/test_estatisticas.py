@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.preprocessing.estatisticas import contar_pixels, ocupacao_por_bloco
+
+
+@pytest.fixture
+def binarias():
+    gerador = np.random.default_rng(4)
+    return np.where(gerador.random((3, 37, 53)) < 0.4, 255, 0).astype(np.uint8)
+
+
+def test_contar_pixels_igual_a_contagem_direta(binarias):
+    contagem = contar_pixels(binarias, roi=(5, 3, 20, 11))
+    recorte = binarias[:, 3:14, 5:25]
+    assert np.array_equal(contagem["brancos"], (recorte == 255).sum(axis=(1, 2)))
+    assert contagem["total"] == 20 * 11
+
+
+def test_ocupacao_por_bloco_igual_a_laco(binarias):
+    ocupacao = ocupacao_por_bloco(binarias[0], (8, 10))
+    for linha in range(ocupacao.shape[0]):
+        for coluna in range(ocupacao.shape[1]):
+            bloco = binarias[0, linha * 8:(linha + 1) * 8, coluna * 10:(coluna + 1) * 10]
+            assert ocupacao[linha, coluna] == pytest.approx((bloco == 255).mean())
+
+
+def test_ocupacao_por_bloco_com_roi_vazio(binarias):
+    assert ocupacao_por_bloco(binarias, 8, roi=(10, 10, 0, 5)).shape == (3, 1, 0)
+    assert ocupacao_por_bloco(binarias[0], 8, roi=(60, 0, 5, 5)).size == 0
+
+
+def test_ocupacao_por_bloco_rejeita_bloco_vazio(binarias):
+    with pytest.raises(ValueError):
+        ocupacao_por_bloco(binarias, 0)
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.fontes import FonteSintetica, abrir_fonte, encadear, listar_sequencia
+
+
+@pytest.fixture(scope="module")
+def quadros():
+    return np.stack([FonteSintetica(12, 24, 32, ruido=5.0).ler(indice) for indice in range(12)])
+
+
+@pytest.fixture(scope="module")
+def sequencia(tmp_path_factory, quadros):
+    pasta = tmp_path_factory.mktemp("sequencia")
+    # Numeração sem zeros à esquerda: a ordem natural põe quadro_10 depois de quadro_9
+    for indice, quadro in enumerate(quadros):
+        cv2.imwrite(str(pasta / f"quadro_{indice}.png"), quadro)
+    return str(pasta)
+
+
+def test_sintetica_depende_so_do_indice(quadros):
+    fonte = FonteSintetica(12, 24, 32, ruido=5.0)
+    assert np.array_equal(np.stack(list(fonte)), quadros)
+    assert np.array_equal(fonte.ler(7), quadros[7])
+
+
+@pytest.mark.parametrize("entrada", ["pilha", "sequencia"])
+def test_inicio_fim_passo_e_posicionar(request, tmp_path, quadros, entrada):
+    if entrada == "pilha":
+        caminho = str(tmp_path / "quadros.npy")
+        np.save(caminho, quadros)
+    else:
+        caminho = request.getfixturevalue("sequencia")
+
+    fonte = abrir_fonte(caminho, inicio=1, fim=11, passo=3)
+    assert len(fonte) == 4
+    assert [indice for indice, _ in fonte.percorrer()] == [1, 4, 7, 10]
+
+    fonte.posicionar(7)
+    indices, lidos = zip(*fonte.percorrer())
+    assert indices == (7, 10)
+    assert np.array_equal(np.stack(lidos), quadros[[7, 10]])
+
+
+def test_listar_sequencia_em_ordem_natural(sequencia):
+    nomes = [caminho.rsplit("_", 1)[1] for caminho in listar_sequencia(sequencia)]
+    assert nomes == [f"{indice}.png" for indice in range(12)]
+
+
+@pytest.mark.parametrize("antecipar", [0, 3])
+def test_lotes_reutilizam_o_mesmo_array(quadros, antecipar):
+    fonte = abrir_fonte(quadros, antecipar=antecipar)
+    lotes = [(lote, lote.copy()) for lote in fonte.lotes(5)]
+    assert [len(copia) for _, copia in lotes] == [5, 5, 2]
+    assert np.array_equal(np.concatenate([copia for _, copia in lotes]), quadros)
+    assert lotes[0][0] is lotes[1][0]
+
+
+def test_encadear_operacoes_registradas(quadros):
+    canny = ("canny", {"limiar_inferior": 50, "limiar_superior": 150})
+    for bordas, quadro in zip(encadear(abrir_fonte(quadros), "filtro_gaussiano", canny), quadros):
+        assert np.array_equal(bordas, cv2.Canny(cv2.GaussianBlur(quadro, (5, 5), 0), 50, 150))
@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.geometria import Transformacao
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    return np.ascontiguousarray(ler_imagem("data/raw/nineth_image.png")[:120, :160])
+
+
+def _3x3(matriz):
+    return np.vstack([matriz, [0, 0, 1]])
+
+
+def test_composicao_afim_igual_a_warp_affine(imagem):
+    centro = (80, 60)
+    transformacao = Transformacao().rotacionar(30, centro).escalonar(1.5, 0.75, centro).transladar(7, -4)
+
+    # Cada operação é aplicada depois da anterior: a matriz final é T · S · R
+    rotacao = _3x3(cv2.getRotationMatrix2D(centro, 30, 1.0))
+    escala = np.array([[1.5, 0, 80 - 1.5 * 80], [0, 0.75, 60 - 0.75 * 60], [0, 0, 1]])
+    translacao = np.array([[1, 0, 7], [0, 1, -4], [0, 0, 1]])
+    esperada = translacao @ escala @ rotacao
+
+    assert transformacao.afim
+    assert np.allclose(transformacao.matriz, esperada)
+    assert np.array_equal(transformacao.aplicar(imagem), cv2.warpAffine(imagem, esperada[:2], (160, 120)))
+    assert np.array_equal(
+        transformacao.aplicar(imagem, (200, 100), cv2.INTER_CUBIC, cv2.BORDER_REFLECT),
+        cv2.warpAffine(imagem, esperada[:2], (200, 100), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REFLECT),
+    )
+
+
+def test_composicao_com_perspectiva_igual_a_warp_perspective(imagem):
+    iniciais = [[0, 0], [159, 0], [159, 119], [0, 119]]
+    finais = [[10, 5], [150, 0], [159, 119], [0, 110]]
+    transformacao = Transformacao().transladar(3, 2).perspectiva(iniciais, finais)
+
+    homografia = cv2.getPerspectiveTransform(np.float32(iniciais), np.float32(finais))
+    esperada = homografia @ np.array([[1, 0, 3], [0, 1, 2], [0, 0, 1]])
+
+    assert not transformacao.afim
+    assert np.allclose(transformacao.matriz, esperada)
+    assert np.array_equal(transformacao.aplicar(imagem), cv2.warpPerspective(imagem, esperada, (160, 120)))
+
+
+def test_translacoes_inteiras_compostas_igual_a_aplicar_em_sequencia(imagem):
+    uma = Transformacao().transladar(5, 3).aplicar(imagem, interpolacao=cv2.INTER_NEAREST)
+    duas = Transformacao().transladar(-2, 4).aplicar(uma, interpolacao=cv2.INTER_NEAREST)
+    composta = Transformacao().transladar(5, 3).transladar(-2, 4).aplicar(imagem, interpolacao=cv2.INTER_NEAREST)
+
+    assert np.array_equal(composta, Transformacao().transladar(3, 7).aplicar(imagem, interpolacao=cv2.INTER_NEAREST))
+    # Em sequência, as colunas que saíram da imagem no primeiro passo se perdem
+    assert np.array_equal(composta[:, :158], duas[:, :158])
+    assert not duas[:, 158:].any() and composta[7:, 158:].any()
+
+
+def test_inversa_desfaz_a_transformacao():
+    transformacao = Transformacao().rotacionar(20, (10, 10)).escalonar(2).transladar(1, 1)
+    assert np.allclose(transformacao.inversa().matriz @ transformacao.matriz, np.eye(3))
+
+
+def test_aplicar_lote(imagem):
+    transformacao = Transformacao().rotacionar(15, (80, 60))
+    quadros = np.stack([imagem, imagem[::-1].copy(), 255 - imagem])
+
+    esperado = np.stack([transformacao.aplicar(quadro) for quadro in quadros])
+    assert np.array_equal(transformacao.aplicar_lote(quadros), esperado)
+    assert np.array_equal(transformacao.aplicar_lote(list(quadros)), esperado)
+
+    destino = np.empty_like(quadros)
+    assert transformacao.aplicar_lote(quadros, destino=destino) is destino
+    assert np.array_equal(destino, esperado)
+
+
+def test_aplicar_lote_vazio(imagem):
+    transformacao = Transformacao().transladar(1, 1)
+
+    vazio = transformacao.aplicar_lote(np.empty((0, 120, 160, 3), np.uint8))
+    assert vazio.shape == (0, 120, 160, 3) and vazio.dtype == np.uint8
+    assert transformacao.aplicar_lote(np.empty((0, 120, 160), np.uint8), (40, 30)).shape == (0, 30, 40)
+
+    destino = np.empty((0, 120, 160), np.uint8)
+    assert transformacao.aplicar_lote([], destino=destino) is destino
+    with pytest.raises(ValueError, match="Lote vazio"):
+        transformacao.aplicar_lote([])
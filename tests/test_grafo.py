@@ -0,0 +1,109 @@
+import sys
+import weakref
+
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.grafo import Grafo
+
+
+class Valor:
+    # Objeto simples que aceita referências fracas, para acompanhar quando é liberado
+    def __init__(self, numero):
+        self.numero = numero
+
+
+def test_ordem_de_avaliacao_e_etapas_compartilhadas():
+    chamadas = []
+
+    def passo(nome):
+        def funcao(*valores):
+            chamadas.append(nome)
+            return nome + "(" + ",".join(valores) + ")"
+        funcao.__name__ = nome
+        return funcao
+
+    grafo = Grafo()
+    entrada = grafo.entrada("x")
+    a = grafo.etapa(passo("a"), entrada)
+    b = grafo.etapa(passo("b"), a)
+    c = grafo.etapa(passo("c"), a, b)
+    grafo.etapa(passo("nao_pedida"), c)
+
+    resultado = grafo.executar({"x": "x"}, c)
+    assert resultado == "c(a(x),b(a(x)))"
+    # Cada etapa roda uma única vez, depois das suas dependências, e etapas não pedidas não rodam
+    assert chamadas == ["a", "b", "c"]
+    assert Grafo._ordenar([c]) == [entrada, a, b, c]
+
+
+def test_varias_saidas_e_parametros_nomeados():
+    imagem = np.random.default_rng(0).integers(0, 256, (40, 50), dtype=np.uint8)
+
+    grafo = Grafo()
+    entrada = grafo.entrada("imagem")
+    suavizada = grafo.etapa(cv2.GaussianBlur, entrada, (5, 5), sigmaX=1.5)
+    detalhes = grafo.etapa(cv2.subtract, entrada, suavizada)
+    bordas = grafo.etapa(cv2.Canny, suavizada, 50, 150)
+
+    obtidos = grafo.executar({"imagem": imagem}, [detalhes, bordas, suavizada])
+    esperada = cv2.GaussianBlur(imagem, (5, 5), sigmaX=1.5)
+    assert np.array_equal(obtidos[2], esperada)
+    assert np.array_equal(obtidos[0], cv2.subtract(imagem, esperada))
+    assert np.array_equal(obtidos[1], cv2.Canny(esperada, 50, 150))
+
+
+def test_intermediarios_liberados_apos_o_ultimo_consumidor():
+    referencias = {}
+    vivos = []
+
+    def criar(nome):
+        def funcao(*anteriores):
+            # Registra quais intermediários ainda existem quando a etapa roda
+            vivos.append((nome, sorted(chave for chave, ref in referencias.items() if ref() is not None)))
+            valor = Valor(sum(anterior.numero for anterior in anteriores) + 1)
+            referencias[nome] = weakref.ref(valor)
+            return valor
+        return funcao
+
+    grafo = Grafo()
+    a = grafo.etapa(criar("a"))
+    b = grafo.etapa(criar("b"), a)
+    c = grafo.etapa(criar("c"), a, b)
+    d = grafo.etapa(criar("d"), c)
+    e = grafo.etapa(criar("e"), d)
+
+    resultado = grafo.executar({}, e)
+    assert resultado.numero == 6
+    assert vivos == [
+        ("a", []),
+        ("b", ["a"]),
+        ("c", ["a", "b"]),
+        ("d", ["c"]),
+        ("e", ["d"]),
+    ]
+    assert all(referencias[nome]() is None for nome in "abcd")
+
+
+def test_saidas_pedidas_nao_sao_liberadas():
+    grafo = Grafo()
+    a = grafo.etapa(Valor, 1)
+    b = grafo.etapa(lambda valor: Valor(valor.numero + 1), a)
+    obtido_a, obtido_b = grafo.executar({}, [a, b])
+    assert (obtido_a.numero, obtido_b.numero) == (1, 2)
+
+
+def test_cadeia_longa_sem_recursao():
+    grafo = Grafo()
+    etapa = grafo.entrada("x")
+    for _ in range(sys.getrecursionlimit() * 3):
+        etapa = grafo.etapa(lambda valor: valor + 1, etapa)
+    assert grafo.executar({"x": 0}, etapa) == sys.getrecursionlimit() * 3
+
+
+def test_entrada_ausente():
+    grafo = Grafo()
+    saida = grafo.etapa(abs, grafo.entrada("x"))
+    with pytest.raises(KeyError, match="x"):
+        grafo.executar({}, saida)
@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.histograma import Histograma
+
+
+def _imagens_aleatorias(quantidade, semente=0):
+    # Imagens de tamanhos e faixas de tons variados, incluindo tons únicos
+    gerador = np.random.default_rng(semente)
+    for _ in range(quantidade):
+        minimo, maximo = sorted(gerador.integers(0, 256, 2))
+        forma = tuple(int(lado) for lado in gerador.integers(1, 60, 2))
+        yield gerador.integers(minimo, maximo + 1, forma, dtype=np.uint8)
+
+
+def test_lut_equalizacao_igual_a_equalize_hist():
+    for imagem in _imagens_aleatorias(2000):
+        tabela = Histograma(imagem).lut_equalizacao()[0]
+        assert np.array_equal(cv2.LUT(imagem, tabela), cv2.equalizeHist(imagem))
+
+
+def test_lut_equalizacao_por_canal():
+    imagem = cv2.merge(list(_imagens_aleatorias(1, semente=3)) * 3)
+    tabelas = Histograma(imagem).lut_equalizacao()
+    for canal in range(3):
+        assert np.array_equal(cv2.LUT(imagem[..., canal], tabelas[canal]), cv2.equalizeHist(imagem[..., canal]))
+
+
+def test_contagens_iguais_a_bincount():
+    imagem = next(_imagens_aleatorias(1, semente=7))
+    assert np.array_equal(Histograma(imagem).contagens[0], np.bincount(imagem.ravel(), minlength=256))
+
+
+def test_atualizar_e_remover_mantem_janela():
+    primeiro, segundo = _imagens_aleatorias(2, semente=9)
+    janela = Histograma(primeiro)
+    janela.atualizar(segundo).remover(primeiro)
+    assert np.array_equal(janela.contagens, Histograma(segundo).contagens)
+
+
+def test_cdf_normalizada_termina_em_um():
+    imagem = next(_imagens_aleatorias(1, semente=11))
+    assert Histograma(imagem).cdf()[0, -1] == pytest.approx(1.0)
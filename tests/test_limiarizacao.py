@@ -0,0 +1,123 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.limiarizacao import (LimiarDeVideo, binarizar, limiar_adaptativo, limiar_global, limiar_otsu,
+                                            limiar_triangulo, limiares_multi_otsu, multi_limiarizar)
+
+
+def _imagens(quantidade=40):
+    # Misturas de duas gaussianas com proporções variadas: histogramas bimodais e de pico único
+    gerador = np.random.default_rng(0)
+    for _ in range(quantidade):
+        fundo = gerador.normal(gerador.uniform(30, 120), gerador.uniform(5, 30), (60, 80))
+        objeto = gerador.normal(gerador.uniform(130, 230), gerador.uniform(5, 30), (60, 80))
+        mascara = gerador.random((60, 80)) < gerador.uniform(0.02, 0.6)
+        yield np.clip(np.where(mascara, objeto, fundo), 0, 255).astype(np.uint8)
+
+
+def _contagens(imagem):
+    return np.bincount(imagem.ravel(), minlength=256)
+
+
+@pytest.mark.parametrize("metodo, funcao, flag", [("otsu", limiar_otsu, cv2.THRESH_OTSU),
+                                                  ("triangulo", limiar_triangulo, cv2.THRESH_TRIANGLE)])
+def test_limiar_global_igual_ao_opencv(metodo, funcao, flag):
+    for imagem in _imagens():
+        esperado, binaria = cv2.threshold(imagem, 0, 255, cv2.THRESH_BINARY | flag)
+        assert funcao(_contagens(imagem)) == esperado
+        assert limiar_global(imagem, metodo) == esperado
+        assert np.array_equal(binarizar(imagem, metodo), binaria)
+
+
+def test_contagens_invalidas_tem_erro_claro():
+    imagem = next(_imagens(1))
+    for funcao in (limiar_otsu, limiar_triangulo, limiares_multi_otsu):
+        with pytest.raises(ValueError, match="histograma 1D"):
+            funcao(imagem)
+
+
+def test_multi_otsu_com_duas_classes_e_otsu():
+    for imagem in _imagens(10):
+        assert limiares_multi_otsu(_contagens(imagem), 2) == [limiar_otsu(_contagens(imagem))]
+
+
+def test_multi_otsu_igual_a_busca_exaustiva():
+    # Histograma pequeno: todas as divisões em 3 classes podem ser testadas
+    contagens = np.random.default_rng(1).integers(0, 50, 24)
+    valores = np.arange(contagens.size)
+
+    def merito(i, j):
+        peso = contagens[i:j + 1].sum()
+        return (contagens[i:j + 1] * valores[i:j + 1]).sum() ** 2 / peso if peso else 0.0
+
+    melhor = max(((a, b) for a in range(contagens.size) for b in range(a + 1, contagens.size - 1)),
+                 key=lambda par: merito(0, par[0]) + merito(par[0] + 1, par[1]) + merito(par[1] + 1, contagens.size - 1))
+    assert limiares_multi_otsu(contagens, 3) == list(melhor)
+
+
+def test_multi_limiarizar_tem_uma_saida_por_classe():
+    imagem = next(_imagens(1))
+    assert set(np.unique(multi_limiarizar(imagem, 3))) <= {0, 128, 255}
+
+
+def test_binarizar_colorida_e_destino():
+    imagem = next(_imagens(1))
+    colorida = cv2.cvtColor(imagem, cv2.COLOR_GRAY2BGR)
+    destino = np.empty_like(imagem)
+    assert binarizar(colorida, 100, invertido=True, destino=destino) is destino
+    assert np.array_equal(destino, cv2.threshold(imagem, 100, 255, cv2.THRESH_BINARY_INV)[1])
+
+
+@pytest.mark.parametrize("tamanho", [3, 31, 101])
+def test_adaptativo_media_igual_ao_opencv(tamanho):
+    imagem = next(_imagens(1))
+    esperado = cv2.adaptiveThreshold(imagem, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, tamanho, 5)
+    assert np.array_equal(limiar_adaptativo(imagem, tamanho, 5), esperado)
+
+
+@pytest.mark.parametrize("metodo", ["sauvola", "niblack"])
+def test_adaptativo_por_faixas_igual_a_janela_direta(metodo):
+    imagem = next(_imagens(1))
+    tamanho, k, c = 15, 0.2, 5
+    raio = tamanho // 2
+    estendida = cv2.copyMakeBorder(imagem, raio, raio, raio, raio, cv2.BORDER_REPLICATE).astype(np.float64)
+    janelas = np.lib.stride_tricks.sliding_window_view(estendida, (tamanho, tamanho))
+    media = janelas.mean(axis=(2, 3))
+    desvio = janelas.std(axis=(2, 3))
+    if metodo == "sauvola":
+        limiar = media * (1 + k * (desvio / 128 - 1))
+    else:
+        limiar = media + k * desvio - c
+    esperado = np.where(imagem > limiar, 255, 0)
+
+    resultado = limiar_adaptativo(imagem, tamanho, c, metodo, k, linhas_por_faixa=16)
+    # Diferenças apenas onde o pixel cai a um arredondamento do limiar
+    diferentes = resultado != esperado
+    assert np.all(np.abs(imagem[diferentes] - limiar[diferentes]) < 1e-6)
+
+
+def _degeneradas():
+    # Imagens uniformes, com dois valores e com um único pixel diferente, nas duas pontas
+    for valor in (0, 1, 128, 254, 255):
+        yield np.full((20, 30), valor, dtype=np.uint8)
+    for fundo, ponto in ((0, 255), (255, 0), (0, 1), (254, 255), (100, 101)):
+        imagem = np.full((20, 30), fundo, dtype=np.uint8)
+        imagem[3, 4] = ponto
+        yield imagem
+    yield np.where(np.arange(600).reshape(20, 30) % 2, 255, 0).astype(np.uint8)
+
+
+@pytest.mark.parametrize("metodo, flag", [("otsu", cv2.THRESH_OTSU), ("triangulo", cv2.THRESH_TRIANGLE)])
+def test_histogramas_degenerados_iguais_ao_opencv(metodo, flag):
+    for imagem in _degeneradas():
+        esperado, binaria = cv2.threshold(imagem, 0, 255, cv2.THRESH_BINARY | flag)
+        assert limiar_global(imagem, metodo) == esperado, np.unique(imagem)
+        assert np.array_equal(binarizar(imagem, metodo), binaria)
+
+
+def test_limiar_de_video_com_quadro_preto():
+    filtro = LimiarDeVideo("otsu", janela=3)
+    preto = np.zeros((20, 30, 3), dtype=np.uint8)
+    assert not filtro(preto).any()
+    assert filtro.limiar == 0
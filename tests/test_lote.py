@@ -0,0 +1,59 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.lote import listar_entradas, processar_lote
+from src.preprocessing.operacoes import obter_operacao
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    gerador = np.random.default_rng(3)
+    diretorio = tmp_path / "entrada"
+    diretorio.mkdir()
+    for indice in range(5):
+        imagem = gerador.integers(0, 256, (48 + indice, 64, 3), dtype=np.uint8)
+        cv2.imwrite(str(diretorio / f"quadro_{indice}.png"), imagem)
+    # Arquivo com extensão de imagem que não pode ser decodificado
+    (diretorio / "quebrado.png").write_bytes(b"nao e uma imagem")
+    (diretorio / "notas.txt").write_text("ignorado")
+    return diretorio
+
+
+def test_listar_entradas(entrada):
+    nomes = [os.path.basename(caminho) for caminho in listar_entradas(str(entrada))]
+    assert nomes == ["quadro_0.png", "quadro_1.png", "quadro_2.png", "quadro_3.png",
+                     "quadro_4.png", "quebrado.png"]
+    assert len(listar_entradas(str(entrada / "quadro_*.png"))) == 5
+    assert listar_entradas(str(entrada / "quadro_1.png")) == [str(entrada / "quadro_1.png")]
+
+
+@pytest.mark.parametrize("cinza", [False, True])
+def test_lote_em_processos_igual_ao_processamento_direto(entrada, tmp_path, cinza):
+    destino = tmp_path / "saida"
+    parametros = {"tamanho": 5}
+    resultados = processar_lote(str(entrada), "filtro_gaussiano", str(destino), parametros,
+                                trabalhadores=2, cinza=cinza)
+
+    assert [os.path.basename(caminho) for caminho, _ in resultados] == \
+        [os.path.basename(caminho) for caminho in listar_entradas(str(entrada))]
+
+    operacao = obter_operacao("filtro_gaussiano")
+    modo = cv2.IMREAD_GRAYSCALE if cinza else cv2.IMREAD_COLOR
+    for caminho_entrada, caminho_saida in resultados:
+        if caminho_entrada.endswith("quebrado.png"):
+            assert caminho_saida is None
+            continue
+        nome = os.path.splitext(os.path.basename(caminho_entrada))[0]
+        assert caminho_saida == os.path.join(str(destino), f"{nome}-filtro_gaussiano.png")
+
+        esperado = operacao(cv2.imread(caminho_entrada, modo), **parametros)
+        assert np.array_equal(cv2.imread(caminho_saida, cv2.IMREAD_UNCHANGED), esperado)
+
+
+def test_operacao_desconhecida_falha_antes_dos_processos(entrada, tmp_path):
+    with pytest.raises(KeyError):
+        processar_lote(str(entrada), "nao_existe", str(tmp_path / "saida"))
+    assert not (tmp_path / "saida").exists()
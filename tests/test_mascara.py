@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.mascara import MascaraBinaria, ler_lote, salvar_lote
+from src.preprocessing.morfologia import FORMAS
+
+
+@pytest.fixture(scope="module")
+def imagens():
+    # Larguras que não são múltiplas de 8 nem de 64, para exercitar os bits de sobra
+    gerador = np.random.default_rng(0)
+    ruido = gerador.integers(0, 256, (2, 83, 141), dtype=np.uint8)
+    return [cv2.GaussianBlur(imagem, (7, 7), 0) for imagem in ruido]
+
+
+def _binaria(imagem):
+    return cv2.threshold(imagem, 127, 255, cv2.THRESH_BINARY)[1]
+
+
+def test_ida_e_volta_e_contagem(imagens):
+    mascara = MascaraBinaria.de_imagem(imagens[0])
+    binaria = _binaria(imagens[0])
+    assert np.array_equal(mascara.para_imagem(), binaria)
+    assert mascara.contar() == cv2.countNonZero(binaria)
+    assert np.array_equal(mascara.contar_por_linha(), np.count_nonzero(binaria, axis=1))
+
+
+def test_operacoes_logicas_iguais_ao_opencv(imagens):
+    a, b = (MascaraBinaria.de_imagem(imagem) for imagem in imagens)
+    x, y = (_binaria(imagem) for imagem in imagens)
+    assert np.array_equal((a & b).para_imagem(), cv2.bitwise_and(x, y))
+    assert np.array_equal((a | b).para_imagem(), cv2.bitwise_or(x, y))
+    assert np.array_equal((a ^ b).para_imagem(), cv2.bitwise_xor(x, y))
+    assert np.array_equal((~a).para_imagem(), cv2.bitwise_not(x))
+    assert np.array_equal(a.subtrair(b).para_imagem(), cv2.bitwise_and(x, cv2.bitwise_not(y)))
+    assert (~a).contar() == x.size - a.contar()
+
+
+@pytest.mark.parametrize("forma", sorted(FORMAS))
+@pytest.mark.parametrize("tamanho, iteracoes", [(3, 1), (5, 3), (9, 2)])
+def test_morfologia_igual_ao_opencv(imagens, forma, tamanho, iteracoes):
+    mascara = MascaraBinaria.de_imagem(imagens[0])
+    binaria = _binaria(imagens[0])
+    elemento = cv2.getStructuringElement(FORMAS[forma], (tamanho, tamanho))
+    assert np.array_equal(mascara.erodir(tamanho, forma, iteracoes).para_imagem(),
+                          cv2.erode(binaria, elemento, iterations=iteracoes))
+    assert np.array_equal(mascara.dilatar(tamanho, forma, iteracoes).para_imagem(),
+                          cv2.dilate(binaria, elemento, iterations=iteracoes))
+    assert np.array_equal(mascara.abrir(tamanho, forma, iteracoes).para_imagem(),
+                          cv2.morphologyEx(binaria, cv2.MORPH_OPEN, elemento, iterations=iteracoes))
+
+
+@pytest.mark.parametrize("extensao", [".pbm", ".png"])
+def test_salvar_e_ler(imagens, tmp_path, extensao):
+    mascara = MascaraBinaria.de_imagem(imagens[0])
+    caminho = str(tmp_path / f"mascara{extensao}")
+    mascara.salvar(caminho)
+    assert MascaraBinaria.ler(caminho) == mascara
+    # O PBM é lido pelo OpenCV com os objetos em branco, como a BMP de 8 bits
+    assert np.array_equal(cv2.imread(caminho, cv2.IMREAD_GRAYSCALE), mascara.para_imagem())
+
+
+def test_lote(imagens, tmp_path):
+    mascaras = [MascaraBinaria.de_imagem(imagem) for imagem in imagens]
+    caminho = str(tmp_path / "lote.npz")
+    salvar_lote(caminho, mascaras)
+    assert ler_lote(caminho) == mascaras
+
+    with pytest.raises(ValueError):
+        salvar_lote(caminho, [])
+    with pytest.raises(ValueError):
+        salvar_lote(caminho, [mascaras[0], MascaraBinaria.vazia(10, 141)])
@@ -0,0 +1,63 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.mediana import filtro_de_percentil, mediana_16bits
+from src.preprocessing.operacoes import filtro_de_mediana, obter_operacao
+
+
+def _forca_bruta(imagem, tamanho, percentil=50, peso_central=1):
+    # Ordena todos os valores de cada janela (borda replicada, como cv2.medianBlur)
+    raio = tamanho // 2
+    estendida = np.pad(imagem, ((raio, raio), (raio, raio)), mode="edge")
+    janelas = np.lib.stride_tricks.sliding_window_view(estendida, (tamanho, tamanho))
+    janelas = janelas.reshape(imagem.shape + (-1,))
+    if peso_central > 1:
+        janelas = np.concatenate([janelas] + [imagem[..., None]] * (peso_central - 1), axis=-1)
+    posto = int(round(percentil / 100 * (janelas.shape[-1] - 1)))
+    return np.sort(janelas, axis=-1)[..., posto]
+
+
+@pytest.fixture(scope="module", params=[np.uint8, np.uint16])
+def imagem(request):
+    gerador = np.random.default_rng(0)
+    maximo = np.iinfo(request.param).max
+    # Valores concentrados em poucas faixas de 8 bits, com empates e vizinhos correlacionados
+    base = gerador.integers(0, maximo, (37, 53), dtype=np.int64)
+    return cv2.blur(base.astype(np.float32), (3, 3)).astype(request.param)
+
+
+@pytest.mark.parametrize("tamanho", [3, 7, 15])
+@pytest.mark.parametrize("percentil", [0, 10, 50, 90, 100])
+def test_percentil_igual_a_forca_bruta(imagem, tamanho, percentil):
+    assert np.array_equal(filtro_de_percentil(imagem, tamanho, percentil), _forca_bruta(imagem, tamanho, percentil))
+
+
+@pytest.mark.parametrize("peso_central", [2, 5])
+def test_peso_central_igual_a_forca_bruta(imagem, peso_central):
+    esperado = _forca_bruta(imagem, 5, 50, peso_central)
+    assert np.array_equal(filtro_de_mediana(imagem, 5, peso_central=peso_central), esperado)
+
+
+@pytest.mark.parametrize("tamanho", [7, 15, 31])
+def test_mediana_16bits_igual_a_forca_bruta(tamanho):
+    gerador = np.random.default_rng(1)
+    imagem = gerador.integers(0, 65536, (40, 70, 2), dtype=np.uint16)
+    destino = np.empty_like(imagem)
+    assert mediana_16bits(imagem, tamanho, destino) is destino
+    for canal in range(2):
+        assert np.array_equal(destino[:, :, canal], _forca_bruta(imagem[:, :, canal], tamanho))
+
+
+def test_operacao_registrada_aceita_16_bits_em_janelas_grandes():
+    imagem = np.random.default_rng(2).integers(0, 65536, (30, 40), dtype=np.uint16)
+    operacao = obter_operacao("filtro_de_mediana")
+    assert np.array_equal(operacao(imagem, tamanho=15), _forca_bruta(imagem, 15))
+    assert np.array_equal(operacao(imagem, tamanho=15, percentil=90), _forca_bruta(imagem, 15, 90))
+
+
+def test_mediana_8_bits_continua_no_opencv():
+    imagem = np.random.default_rng(3).integers(0, 256, (30, 40, 3), dtype=np.uint8)
+    destino = np.empty_like(imagem)
+    assert filtro_de_mediana(imagem, 9, destino=destino) is destino
+    assert np.array_equal(destino, cv2.medianBlur(imagem, 9))
@@ -0,0 +1,79 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.morfologia import (FORMAS, abrir, compor_iteracoes, decompor_em_retangulos, dilatar,
+                                           elemento_estruturante, erodir, fechar)
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    gerador = np.random.default_rng(0)
+    return gerador.integers(0, 256, (97, 131), dtype=np.uint8)
+
+
+def _elemento(forma, tamanho):
+    return cv2.getStructuringElement(FORMAS[forma], (tamanho, tamanho))
+
+
+@pytest.mark.parametrize("forma", sorted(FORMAS))
+@pytest.mark.parametrize("tamanho", [3, 5, 9])
+@pytest.mark.parametrize("iteracoes", [1, 2, 5])
+def test_erodir_e_dilatar_iguais_ao_opencv(imagem, forma, tamanho, iteracoes):
+    elemento = _elemento(forma, tamanho)
+    assert np.array_equal(erodir(imagem, tamanho, forma, iteracoes),
+                          cv2.erode(imagem, elemento, iterations=iteracoes))
+    assert np.array_equal(dilatar(imagem, tamanho, forma, iteracoes),
+                          cv2.dilate(imagem, elemento, iterations=iteracoes))
+
+
+@pytest.mark.parametrize("forma", sorted(FORMAS))
+def test_abrir_e_fechar_iguais_ao_opencv(imagem, forma):
+    elemento = _elemento(forma, 7)
+    assert np.array_equal(abrir(imagem, 7, forma, 2), cv2.morphologyEx(imagem, cv2.MORPH_OPEN, elemento, iterations=2))
+    assert np.array_equal(fechar(imagem, 7, forma, 2),
+                          cv2.morphologyEx(imagem, cv2.MORPH_CLOSE, elemento, iterations=2))
+
+
+def test_elemento_irregular_e_destino(imagem):
+    elemento = np.array([[0, 1, 0, 0],
+                         [1, 1, 1, 0],
+                         [0, 1, 1, 1]], dtype=np.uint8)
+    destino = np.empty_like(imagem)
+    resultado = erodir(imagem, elemento=elemento, iteracoes=3, destino=destino)
+    assert resultado is destino
+    assert np.array_equal(destino, cv2.erode(imagem, elemento, iterations=3))
+
+
+def test_imagem_colorida(imagem):
+    colorida = np.dstack([imagem, imagem[::-1], imagem[:, ::-1]])
+    assert np.array_equal(dilatar(colorida, 5, "cruz", 3), cv2.dilate(colorida, _elemento("cruz", 5), iterations=3))
+
+
+@pytest.mark.parametrize("forma", sorted(FORMAS))
+@pytest.mark.parametrize("iteracoes", [1, 2, 4])
+def test_compor_iteracoes_equivale_a_repetir(forma, iteracoes):
+    elemento = _elemento(forma, 5)
+    composto, ancora = compor_iteracoes(elemento, iteracoes)
+
+    # Um ponto isolado dilatado pelo elemento composto é o próprio elemento (refletido)
+    ponto = np.zeros((41, 41), dtype=np.uint8)
+    ponto[20, 20] = 255
+    esperado = cv2.dilate(ponto, elemento, iterations=iteracoes)
+    assert np.array_equal(cv2.dilate(ponto, composto, anchor=ancora), esperado)
+
+
+def test_decompor_em_retangulos_cobre_o_elemento():
+    for forma in FORMAS:
+        elemento = elemento_estruturante(forma, 9)
+        coberto = np.zeros_like(elemento)
+        for x0, y0, x1, y1 in decompor_em_retangulos(elemento):
+            assert elemento[y0:y1 + 1, x0:x1 + 1].all()
+            coberto[y0:y1 + 1, x0:x1 + 1] = 1
+        assert np.array_equal(coberto != 0, elemento != 0)
+
+
+def test_passadas_longas_van_herk(imagem):
+    # 300 iterações de uma elipse 9x9 compõem um elemento com mais de 1024 pixels de lado
+    elemento = _elemento("elipse", 9)
+    assert np.array_equal(erodir(imagem, 9, "elipse", 300), cv2.erode(imagem, elemento, iterations=300))
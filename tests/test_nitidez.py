@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.nitidez import laplaciano, mascara_de_nitidez, nitidez_laplaciana
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    return np.ascontiguousarray(ler_imagem("data/raw/nineth_image.png")[:150, :200])
+
+
+def _saturar(valores, dtype=np.uint8):
+    limites = np.iinfo(dtype)
+    return np.clip(np.rint(valores), limites.min, limites.max).astype(dtype)
+
+
+def _mascara_esperada(imagem, raio, quantidade, limiar):
+    original = imagem.astype(np.float64)
+    detalhes = original - cv2.GaussianBlur(imagem, (0, 0), raio)
+    esperado = _saturar(original + quantidade * detalhes)
+    if limiar > 0:
+        esperado = np.where(np.abs(detalhes) < limiar, imagem, esperado)
+    return esperado
+
+
+@pytest.mark.parametrize("raio, quantidade, limiar", [(1, 1.0, 0), (3, 1.5, 0), (2, 0.75, 4), (3, 2.0, 10)])
+def test_mascara_de_nitidez_igual_a_formula(imagem, raio, quantidade, limiar):
+    esperado = _mascara_esperada(imagem, raio, quantidade, limiar)
+    assert np.array_equal(mascara_de_nitidez(imagem, raio, quantidade, limiar), esperado)
+
+
+@pytest.mark.parametrize("limiar", [0, 4])
+def test_mascara_de_nitidez_no_lugar(imagem, limiar):
+    esperado = mascara_de_nitidez(imagem, 2, 1.5, limiar)
+
+    copia = imagem.copy()
+    assert mascara_de_nitidez(copia, 2, 1.5, limiar, destino=copia) is copia
+    assert np.array_equal(copia, esperado)
+
+    destino = np.empty_like(imagem)
+    assert mascara_de_nitidez(imagem, 2, 1.5, limiar, destino=destino) is destino
+    assert np.array_equal(destino, esperado)
+
+
+def test_mascara_de_nitidez_preserva_detalhes_negativos():
+    # Degrau escuro/claro: o lado escuro da borda deve ficar mais escuro, não cortado em 0
+    degrau = np.full((20, 20), 100, np.uint8)
+    degrau[:, 10:] = 150
+    nitida = mascara_de_nitidez(degrau, raio=2, quantidade=1.0)
+    assert nitida[:, 9].max() < 100 and nitida[:, 10].min() > 150
+
+
+@pytest.mark.parametrize("tamanho", [1, 3, 5])
+@pytest.mark.parametrize("quantidade", [1.0, 0.5])
+def test_nitidez_laplaciana_igual_a_imagem_menos_laplaciano(imagem, tamanho, quantidade):
+    resposta = cv2.Laplacian(imagem, cv2.CV_64F, ksize=tamanho)
+    esperado = _saturar(imagem.astype(np.float64) - quantidade * resposta)
+    assert np.array_equal(nitidez_laplaciana(imagem, quantidade, tamanho), esperado)
+
+
+def test_laplaciano_com_sinal(imagem):
+    cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
+    resposta = laplaciano(cinza)
+    assert resposta.dtype == np.int16 and resposta.min() < 0
+    assert np.array_equal(resposta, cv2.Laplacian(cinza, cv2.CV_64F).astype(np.int16))
+    assert laplaciano(cinza.astype(np.float32)).dtype == np.float32
@@ -0,0 +1,101 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing import piramide as modulo_piramide
+from src.preprocessing.piramide import Piramide, piramide
+
+
+@pytest.fixture(scope="module")
+def colorida():
+    return np.ascontiguousarray(ler_imagem("data/raw/nineth_image.png")[:203, :317])
+
+
+@pytest.fixture(scope="module")
+def cinza(colorida):
+    return cv2.cvtColor(colorida, cv2.COLOR_BGR2GRAY)
+
+
+def _somente_leitura(imagem):
+    copia = imagem.copy()
+    copia.flags.writeable = False
+    return copia
+
+
+@pytest.mark.parametrize("nome", ["cinza", "colorida"])
+def test_reconstruir_devolve_a_imagem_original(request, nome):
+    imagem = request.getfixturevalue(nome)
+    pir = Piramide(imagem, niveis=5)
+    laplacianos = [pir.laplaciano(nivel) for nivel in range(len(pir))]
+
+    assert laplacianos[0].dtype == np.int16
+    reconstruida = Piramide.reconstruir(laplacianos)
+    assert reconstruida.dtype == np.uint8
+    assert np.array_equal(reconstruida, imagem)
+
+
+def test_reconstruir_em_ponto_flutuante(cinza):
+    imagem = cinza.astype(np.float32) / 255
+    pir = Piramide(imagem, niveis=4)
+    reconstruida = Piramide.reconstruir([pir.laplaciano(nivel) for nivel in range(len(pir))])
+    assert np.allclose(reconstruida, imagem, atol=1e-5)
+
+
+def test_niveis_seguem_pyrdown(cinza):
+    pir = Piramide(cinza)
+    assert len(pir) == int(np.log2(min(cinza.shape))) + 1
+    assert pir[0] is cinza
+
+    esperado = cinza
+    for nivel in range(1, 4):
+        esperado = cv2.pyrDown(esperado)
+        assert np.array_equal(pir[nivel], esperado)
+        assert not pir[nivel].flags.writeable
+
+    with pytest.raises(IndexError):
+        pir.nivel(len(pir))
+
+
+def test_conversao_de_regioes(cinza):
+    pir = Piramide(cinza)
+    altura, largura = cinza.shape
+
+    assert pir.escala(3) == 8
+    assert pir.para_original((2, 3, 5, 7), 2) == (8, 12, 20, 28)
+    # Recortada na borda da imagem original
+    assert pir.para_original((70, 45, 10, 10), 2) == (280, 180, largura - 280, altura - 180)
+
+    # Para o nível, a região cresce para cobrir todos os pixels originais
+    assert pir.para_nivel((8, 12, 20, 28), 2) == (2, 3, 5, 7)
+    assert pir.para_nivel((9, 13, 6, 2), 2) == (2, 3, 2, 1)
+    assert pir.para_nivel((0, 0, 1, 1), 3) == (0, 0, 1, 1)
+
+
+def test_piramide_reaproveita_niveis_da_mesma_imagem(cinza, monkeypatch):
+    imagem = _somente_leitura(cinza)
+    chamadas = []
+    pyr_down = cv2.pyrDown
+
+    def contar(*argumentos, **opcoes):
+        chamadas.append(argumentos[0].shape)
+        return pyr_down(*argumentos, **opcoes)
+
+    monkeypatch.setattr(modulo_piramide.cv2, "pyrDown", contar)
+
+    nivel_2 = piramide(imagem).nivel(2)
+    assert len(chamadas) == 2
+    assert piramide(imagem).nivel(1) is piramide(imagem).nivel(1)
+    assert piramide(imagem).nivel(2) is nivel_2
+    assert len(chamadas) == 2
+
+    piramide(imagem).nivel(3)
+    assert len(chamadas) == 3
+
+    # Laplacianos também são guardados
+    assert piramide(imagem).laplaciano(1) is piramide(imagem).laplaciano(1)
+
+
+def test_piramide_de_imagem_gravavel_nao_guarda_entre_chamadas(cinza):
+    imagem = cinza.copy()
+    assert piramide(imagem).nivel(1) is not piramide(imagem).nivel(1)
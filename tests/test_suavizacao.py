@@ -0,0 +1,115 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.operacoes import filtro_bilateral, filtro_de_média, filtro_gaussiano, obter_operacao
+from src.preprocessing.suavizacao import (ImagemIntegral, filtro_guiado, larguras_das_caixas, medir_desvio,
+                                           parametros_guiados)
+
+
+@pytest.fixture(scope="module")
+def imagem():
+    return ler_imagem("data/raw/nineth_image.png")
+
+
+@pytest.mark.parametrize("tamanho", [3, 5, 31, 101])
+def test_media_integral_igual_a_blur(imagem, tamanho):
+    assert np.array_equal(filtro_de_média(imagem, tamanho, modo="integral"), cv2.blur(imagem, (tamanho, tamanho)))
+
+
+def test_imagem_integral_atende_varios_tamanhos(imagem):
+    integral = ImagemIntegral(imagem, 15)
+    for tamanho in (3, 11, 31):
+        assert np.array_equal(integral.media(tamanho), cv2.blur(imagem, (tamanho, tamanho)))
+    with pytest.raises(ValueError):
+        integral.media(33)
+
+
+def test_larguras_das_caixas_aproximam_a_variancia():
+    for sigma in (1.5, 5.0, 16.7):
+        larguras = np.array(larguras_das_caixas(sigma, 3))
+        assert np.all(larguras % 2 == 1)
+        assert np.sqrt(((larguras ** 2 - 1) / 12).sum()) == pytest.approx(sigma, rel=0.1)
+
+
+@pytest.mark.parametrize("tamanho", [15, 31, 51, 101])
+def test_gaussiano_rapido_proximo_do_exato(imagem, tamanho):
+    desvio = medir_desvio(imagem,
+                          lambda i: filtro_gaussiano(i, tamanho),
+                          lambda i: filtro_gaussiano(i, tamanho, modo="rapido"))
+    assert desvio["psnr"] > 40
+    assert desvio["ssim"] > 0.99
+
+    erro = np.abs(filtro_gaussiano(imagem, tamanho, modo="rapido").astype(int) - filtro_gaussiano(imagem, tamanho))
+    assert erro.mean() < 0.6
+    assert erro.max() <= 8
+
+
+def test_modo_exato_igual_ao_opencv(imagem):
+    assert np.array_equal(filtro_gaussiano(imagem, 7, 2), cv2.GaussianBlur(imagem, (7, 7), 2))
+    assert np.array_equal(filtro_de_média(imagem, 7), cv2.blur(imagem, (7, 7)))
+
+
+@pytest.mark.parametrize("nome, parametros", [
+    ("filtro_de_média", {"tamanho": 31, "modo": "integral"}),
+    ("filtro_gaussiano", {"tamanho": 51, "modo": "rapido"}),
+])
+def test_modos_registrados_aceitam_destino(imagem, nome, parametros):
+    operacao = obter_operacao(nome)
+    esperado = operacao(imagem, **parametros)
+    destino = np.empty_like(esperado)
+    assert operacao(imagem, destino=destino, **parametros) is destino
+    assert np.array_equal(destino, esperado)
+
+
+def test_modo_desconhecido(imagem):
+    with pytest.raises(ValueError):
+        filtro_gaussiano(imagem, modo="outro")
+
+
+def _guiado_de_referencia(imagem, raio, eps):
+    # Fórmulas de He et al. com médias calculadas por laços sobre as janelas (bordas
+    # refletidas como em cv2.boxFilter)
+    p = imagem.astype(np.float64)
+
+    def media(valores):
+        estendida = np.pad(valores, raio, mode="reflect")
+        janela = 2 * raio + 1
+        return np.lib.stride_tricks.sliding_window_view(estendida, (janela, janela)).mean(axis=(-2, -1))
+
+    media_p = media(p)
+    variancia = media(p * p) - media_p ** 2
+    a = variancia / (variancia + eps)
+    b = media_p - a * media_p
+    return np.clip(np.floor(media(a) * p + media(b) + 0.5), 0, 255)
+
+
+def test_filtro_guiado_igual_a_referencia(imagem):
+    cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)[:64, :80]
+    resultado = filtro_guiado(cinza, 4, 100.0)
+    assert np.abs(resultado - _guiado_de_referencia(cinza, 4, 100.0)).max() <= 1
+
+
+def test_bilateral_guiado_usa_o_filtro_guiado(imagem):
+    raio, eps = parametros_guiados(8, 10, 10)
+    assert (raio, eps) == (4, 100.0)
+    assert np.array_equal(filtro_bilateral(imagem, modo="guiado"), filtro_guiado(imagem, raio, eps))
+
+
+@pytest.mark.parametrize("reducao", [1, 2])
+def test_bilateral_guiado_proximo_do_bilateral(imagem, reducao):
+    desvio = medir_desvio(imagem,
+                          lambda i: filtro_bilateral(i),
+                          lambda i: filtro_bilateral(i, modo="guiado", reducao=reducao))
+    assert desvio["psnr"] > 35
+    assert desvio["ssim"] > 0.95
+
+
+def test_bilateral_registrado_com_modo_e_destino(imagem):
+    operacao = obter_operacao("filtro_bilateral")
+    esperado = operacao(imagem, modo="guiado")
+    destino = np.empty_like(esperado)
+    assert operacao(imagem, modo="guiado", destino=destino) is destino
+    assert np.array_equal(destino, esperado)
+    assert np.array_equal(operacao(imagem), cv2.bilateralFilter(imagem, 8, 10, 10))
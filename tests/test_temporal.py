@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.fontes import FonteSintetica
+from src.preprocessing.operacoes import filtro_gaussiano
+from src.preprocessing.temporal import (DiferencaDeQuadros, FundoMedio, MedianaTemporal, ProcessadorPorMovimento,
+                                        mascara_de_movimento)
+
+
+def _quadros(quantidade=30, forma=(24, 32)):
+    # Poucos níveis de cinza: muitos empates, o caso difícil para a mediana incremental
+    gerador = np.random.default_rng(0)
+    return [(gerador.integers(0, 6, forma) * 40).astype(np.uint8) for _ in range(quantidade)]
+
+
+@pytest.mark.parametrize("janela", [1, 4, 9])
+def test_mediana_temporal_igual_a_ordenar_a_janela(janela):
+    quadros = _quadros()
+    filtro = MedianaTemporal(janela)
+    anel = [quadros[0]] * janela
+    for quadro in quadros:
+        anel = anel[1:] + [quadro]
+        esperado = np.sort(np.stack(anel), axis=0)[(janela - 1) // 2]
+        assert np.array_equal(filtro.atualizar(quadro), esperado)
+
+
+def test_mediana_temporal_colorida_e_destino():
+    quadros = _quadros(12, (10, 12, 3))
+    filtro = MedianaTemporal(5)
+    destino = np.empty_like(quadros[0])
+    for quadro in quadros:
+        assert filtro.atualizar(quadro, destino) is destino
+    assert np.array_equal(destino, np.median(np.stack(quadros[-5:]), axis=0).astype(np.uint8))
+    assert not filtro.mediana.flags.writeable
+
+
+def test_fundo_medio_igual_a_accumulate_weighted():
+    quadros = _quadros()
+    fundo = FundoMedio(alfa=0.1, limiar=30, abertura=1)
+    acumulado = quadros[0].astype(np.float32)
+    assert not fundo.atualizar(quadros[0]).any()
+    for quadro in quadros[1:]:
+        anterior = cv2.convertScaleAbs(acumulado)
+        esperado = cv2.threshold(cv2.absdiff(quadro, anterior), 30, 255, cv2.THRESH_BINARY)[1]
+        assert np.array_equal(fundo.atualizar(quadro), esperado)
+        cv2.accumulateWeighted(quadro, acumulado, 0.1)
+        assert np.array_equal(fundo.fundo, cv2.convertScaleAbs(acumulado))
+
+
+def test_mascara_de_movimento_com_abertura():
+    anterior, atual = _quadros(2)
+    elemento = np.ones((3, 3), dtype=np.uint8)
+    diferenca = cv2.threshold(cv2.absdiff(anterior, atual), 25, 255, cv2.THRESH_BINARY)[1]
+    assert np.array_equal(mascara_de_movimento(atual, anterior, 25, 3),
+                          cv2.morphologyEx(diferenca, cv2.MORPH_OPEN, elemento))
+
+
+def test_diferenca_de_quadros_usa_o_quadro_anterior():
+    quadros = _quadros(5, (8, 8, 3))
+    filtro = DiferencaDeQuadros(limiar=10)
+    assert not filtro.atualizar(quadros[0]).any()
+    for anterior, atual in zip(quadros, quadros[1:]):
+        esperado = cv2.threshold(cv2.absdiff(anterior, atual).max(axis=2), 10, 255, cv2.THRESH_BINARY)[1]
+        assert np.array_equal(filtro.atualizar(atual), esperado)
+
+
+@pytest.mark.parametrize("margem", [None, 2])
+def test_processador_por_movimento_igual_a_processar_tudo(margem):
+    # Quadrado que atravessa um fundo fixo: só uma parte do quadro muda de cada vez
+    fonte = FonteSintetica(20, 60, 80)
+    processador = ProcessadorPorMovimento(filtro_gaussiano, {"tamanho": 5}, limiar=0, fracao_minima=0,
+                                          margem=margem, abertura=1)
+    for quadro in list(fonte) + [fonte.ler(19)] * 3:
+        assert np.array_equal(processador(quadro), filtro_gaussiano(quadro, 5))
+    assert processador.pulados == 3
+    if margem is not None:
+        assert processador.parciais > 0
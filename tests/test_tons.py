@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.datasets.carregador import ler_imagem
+from src.preprocessing.tons import AjusteDeTons, ajustar_tons
+
+
+def _quadros(quantidade=20):
+    gerador = np.random.default_rng(0)
+    for _ in range(quantidade):
+        # Faixas de tons diferentes a cada quadro, para que as tabelas mudem
+        minimo = int(gerador.integers(0, 100))
+        yield gerador.integers(minimo, minimo + int(gerador.integers(20, 156)), (48, 64), dtype=np.uint8)
+
+
+def test_equalizar_igual_ao_opencv():
+    for quadro in _quadros():
+        assert np.array_equal(ajustar_tons(quadro, equalizar=True), cv2.equalizeHist(quadro))
+
+
+def test_cadeia_igual_aos_passos_sequenciais():
+    imagem = ler_imagem("data/raw/nineth_image.png")
+    ajuste = AjusteDeTons().brilho(40).contraste(1.3).equalizar().normalizar(10, 240)
+    esperado = cv2.add(imagem, 40)
+    esperado = cv2.addWeighted(esperado, 1.3, esperado, 0, 128 * (1 - 1.3))
+    esperado = cv2.merge([cv2.equalizeHist(canal) for canal in cv2.split(esperado)])
+    esperado = cv2.merge([cv2.normalize(canal, None, 10, 240, cv2.NORM_MINMAX) for canal in cv2.split(esperado)])
+    assert np.array_equal(ajuste.aplicar(imagem), esperado)
+
+
+@pytest.mark.parametrize("ajuste", [AjusteDeTons().equalizar(), AjusteDeTons().gama(0.7).normalizar(0, 255)])
+def test_buffer_reutilizado_nao_usa_tabela_antiga(ajuste):
+    # Mesmo endereço, forma e tipo a cada quadro, como os buffers de PoolDeBuffers
+    buffer = np.empty((48, 64), dtype=np.uint8)
+    saida = np.empty_like(buffer)
+    for quadro in _quadros():
+        np.copyto(buffer, quadro)
+        ajuste.aplicar(buffer, saida)
+        assert np.array_equal(saida, ajuste.aplicar(quadro.copy()))
@@ -0,0 +1,111 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+from src.preprocessing.histograma import histograma
+from src.preprocessing.limiarizacao import binarizar
+from src.preprocessing.tons import ajustar_tons
+from src.preprocessing.video import processar_video
+from src.utils.buffers import PoolDeBuffers
+
+
+def _quadros(quantidade=30, canais=3):
+    # Cada quadro com uma faixa de tons diferente: limiares e tabelas mudam de um quadro a outro
+    gerador = np.random.default_rng(0)
+    for _ in range(quantidade):
+        minimo = int(gerador.integers(0, 120))
+        forma = (48, 64, canais) if canais > 1 else (48, 64)
+        yield cv2.blur(gerador.integers(minimo, minimo + 120, forma, dtype=np.uint8), (5, 5))
+
+
+@pytest.fixture(scope="module")
+def pilha(tmp_path_factory):
+    caminho = tmp_path_factory.mktemp("video") / "quadros.npy"
+    np.save(caminho, np.stack(list(_quadros())))
+    return str(caminho)
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    caminho = str(tmp_path_factory.mktemp("video") / "quadros.avi")
+    escritor = cv2.VideoWriter(caminho, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for quadro in _quadros(40):
+        escritor.write(quadro)
+    escritor.release()
+    return caminho
+
+
+def _binarizar_opencv(quadro):
+    cinza = cv2.cvtColor(quadro, cv2.COLOR_BGR2GRAY)
+    return cv2.threshold(cinza, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+def _equalizar_opencv(quadro):
+    return cv2.merge([cv2.equalizeHist(canal) for canal in cv2.split(quadro)])
+
+
+def _conferida(operacao, referencia, erros):
+    # Compara, dentro do pipeline, cada resultado com o do OpenCV sobre uma cópia do quadro
+    trava = threading.Lock()
+
+    def conferir(quadro, destino=None):
+        esperado = referencia(quadro.copy())
+        resultado = operacao(quadro, destino=destino)
+        with trava:
+            erros.append(not np.array_equal(resultado, esperado))
+        return resultado
+    return conferir
+
+
+@pytest.mark.parametrize("entrada", ["pilha", "video"])
+@pytest.mark.parametrize("reutilizar", [False, True])
+@pytest.mark.parametrize("operacao, referencia", [
+    (binarizar, _binarizar_opencv),
+    (lambda quadro, destino=None: ajustar_tons(quadro, equalizar=True, destino=destino), _equalizar_opencv),
+])
+def test_buffers_reutilizados_nao_servem_resultados_antigos(request, entrada, reutilizar, operacao, referencia):
+    erros = []
+    processar_video(request.getfixturevalue(entrada), _conferida(operacao, referencia, erros),
+                    trabalhadores=2, capacidade=4, reutilizar_buffers=reutilizar)
+    assert erros and not any(erros)
+
+
+def test_pool_descarta_derivadas_do_buffer():
+    pool = PoolDeBuffers()
+    primeiro, segundo = _quadros(2, canais=1)
+
+    buffer = pool.obter(primeiro.shape)
+    np.copyto(buffer, primeiro)
+    buffer.flags.writeable = False
+    histograma(buffer)
+    buffer.flags.writeable = True
+    pool.devolver(buffer)
+
+    reutilizado = pool.obter(primeiro.shape)
+    assert reutilizado is buffer
+    np.copyto(reutilizado, segundo)
+    reutilizado.flags.writeable = False
+    assert np.array_equal(histograma(reutilizado).contagens[0], np.bincount(segundo.ravel(), minlength=256))
+
+
+@pytest.mark.parametrize("visao", [
+    lambda quadro: quadro[8:40, 10:50],
+    lambda quadro: quadro[..., 1],
+    lambda quadro: quadro.reshape(-1, quadro.shape[-1]),
+], ids=["recorte", "canal", "reshape"])
+def test_quadro_nao_volta_ao_pool_quando_o_resultado_e_uma_visao(pilha, visao):
+    # Se o buffer do quadro fosse reaproveitado, a visão passaria a mostrar outro quadro
+    trava = threading.Lock()
+    guardados = []
+
+    def recortar(quadro):
+        resultado = visao(quadro)
+        with trava:
+            guardados.append((resultado, resultado.copy()))
+        return resultado
+
+    processar_video(pilha, recortar, trabalhadores=2, capacidade=2, reutilizar_buffers=True)
+    assert len(guardados) == 30
+    assert all(np.array_equal(resultado, copia) for resultado, copia in guardados)